@@ -6,13 +6,17 @@ from fastapi import APIRouter, Depends, Path, Query
 
 from app.api.dependencies import require_api_available
 
-from app.services.academy import fetch_academy_post, fetch_ratings_all, fetch_ratings_subject
+from app.services.academy import fetch_academy_post_async, fetch_ratings_all_async, fetch_ratings_subject_async
+from app.services.hero_table import academy_hero_table
 from app.schemas.academy import AcademyCollectionResponse, AcademyRatingsResponse
 
 from app.core.errors import _hero_id_or_404
 
 from app.core.enums import LanguageEnum, RankEnum, SortOrderEnum, HeroRoleEnum, HeroLaneEnum
+from app.core.fastjson import passthrough
 from app.utils.client_ip import bind_client_ip
+from app.utils.deadline import bind_deadline
+from app.utils.projection import bind_fields, with_requested_fields
 from app.utils.filters import (
     ROLE_MAP, LANE_MAP, validate_and_map_multi, validate_and_map_rank, validate_and_single
 )
@@ -22,7 +26,9 @@ router = APIRouter(
     tags=["academy"],
     dependencies=[
         Depends(require_api_available),
-        Depends(bind_client_ip)
+        Depends(bind_client_ip),
+        Depends(bind_deadline),
+        Depends(bind_fields),
     ]
 )
 
@@ -90,7 +96,7 @@ router = APIRouter(
         }
     }
 )
-def version(
+async def version(
     size: Annotated[
         int,
         Query(
@@ -146,7 +152,7 @@ def version(
         "type": "form.item.all",
         "object": [2675413],
     }
-    return fetch_academy_post("2718124", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718124", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -242,7 +248,7 @@ def version(
         }
     }
 )
-def heroes_old(
+async def heroes_old(
     size: Annotated[
         int,
         Query(
@@ -275,7 +281,7 @@ def heroes_old(
         "fields": ["head", "head_big", "hero.data.name", "hero.data.roadsort", "hero_id", "painting"],
         "object": [2667538],
     }
-    return fetch_academy_post("2766683", payload, lang)
+    return passthrough(await fetch_academy_post_async("2766683", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -378,7 +384,7 @@ def heroes_old(
         }
     }
 )
-def roles(
+async def roles(
     size: Annotated[
         int,
         Query(
@@ -427,7 +433,7 @@ def roles(
         ],
         "object": [],
     }
-    return fetch_academy_post("2740642", payload, lang)
+    return passthrough(await fetch_academy_post_async("2740642", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -488,7 +494,7 @@ def roles(
         }
     }
 )
-def equipment(
+async def equipment(
     size: Annotated[
         int,
         Query(
@@ -519,7 +525,7 @@ def equipment(
         "filters": [],
         "sorts": []
     }
-    return fetch_academy_post("2775075", payload, lang)
+    return passthrough(await fetch_academy_post_async("2775075", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -599,7 +605,7 @@ def equipment(
         }
     }
 )
-def equipment_expanded(
+async def equipment_expanded(
     size: Annotated[
         int,
         Query(
@@ -630,7 +636,7 @@ def equipment_expanded(
         "filters": [],
         "sorts": []
     }
-    return fetch_academy_post("2713995", payload, lang)
+    return passthrough(await fetch_academy_post_async("2713995", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -705,7 +711,7 @@ def equipment_expanded(
         }
     }
 )
-def spells(
+async def spells(
     size: Annotated[
         int,
         Query(
@@ -736,7 +742,7 @@ def spells(
         "filters": [],
         "sorts": []
     }
-    return fetch_academy_post("2718122", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718122", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -814,7 +820,7 @@ def spells(
         }
     }
 )
-def emblems(
+async def emblems(
     size: Annotated[
         int,
         Query(
@@ -845,7 +851,7 @@ def emblems(
         "filters": [],
         "sorts": []
     }
-    return fetch_academy_post("2718121", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718121", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -924,7 +930,7 @@ def emblems(
         }
     }
 )
-def ranks(
+async def ranks(
     size: Annotated[
         int,
         Query(
@@ -956,7 +962,7 @@ def ranks(
         "sorts": [],
         "object": []
     }
-    return fetch_academy_post("3210596", payload, lang)
+    return passthrough(await fetch_academy_post_async("3210596", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1035,7 +1041,7 @@ def ranks(
         }
     }
 )
-def ranks_details(
+async def ranks_details(
     rank_id: Annotated[
         int,
         Path(
@@ -1071,7 +1077,7 @@ def ranks_details(
         "sorts": [],
         "object": []
     }
-    return fetch_academy_post("3210596", payload, lang)
+    return passthrough(await fetch_academy_post_async("3210596", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1297,7 +1303,7 @@ def ranks_details(
         }
     }
 )
-def recommended(
+async def recommended(
     size: Annotated[
         int,
         Query(
@@ -1390,7 +1396,7 @@ def recommended(
         "type": "form.item.all",
         "object": [2675413],
     }
-    return fetch_academy_post("2718124", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718124", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1603,7 +1609,7 @@ def recommended(
         }
     }
 )
-def recommended_detail(
+async def recommended_detail(
     recommended_id: Annotated[
         int,
         Path(
@@ -1660,7 +1666,7 @@ def recommended_detail(
         "type": "form.item.all",
         "object": [2675413],
     }
-    return fetch_academy_post("2718124", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718124", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1723,7 +1729,7 @@ def recommended_detail(
         }
     }
 )
-def heroes(
+async def heroes(
     role: Annotated[
         list[str],
         Query(
@@ -1813,7 +1819,7 @@ def heroes(
         "fields": ["head", "hero_id", "hero.data.name"],
         "object": [],
     }
-    return fetch_academy_post("2766683", payload, lang)
+    return passthrough(await academy_hero_table.query(with_requested_fields(payload), lang))
 
 
 @router.get(
@@ -1959,7 +1965,7 @@ def heroes(
         }
     }
 )
-def heroes_stats(
+async def heroes_stats(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2000,7 +2006,7 @@ def heroes_stats(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "pageIndex": index,
@@ -2023,7 +2029,7 @@ def heroes_stats(
         ],
         "sorts": [],
     }
-    return fetch_academy_post("2755183", payload, lang)
+    return passthrough(await fetch_academy_post_async("2755183", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2113,7 +2119,7 @@ def heroes_stats(
         }
     }
 )
-def heroes_lane(
+async def heroes_lane(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2147,7 +2153,7 @@ def heroes_lane(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "pageIndex": index,
@@ -2162,7 +2168,7 @@ def heroes_lane(
         "fields": ["hero_id", "hero.data.roadsort"],
         "object": [],
     }
-    return fetch_academy_post("2766683", payload, lang)
+    return passthrough(await fetch_academy_post_async("2766683", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2240,7 +2246,7 @@ def heroes_lane(
         }
     }
 )
-def heroes_time_win_rate(
+async def heroes_time_win_rate(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2289,7 +2295,7 @@ def heroes_time_win_rate(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     lane_value = validate_and_single([lane], LANE_MAP, "lane")
     
     payload = {
@@ -2314,7 +2320,7 @@ def heroes_time_win_rate(
         ],
         "sorts": [],
     }
-    return fetch_academy_post("2777027", payload, lang)
+    return passthrough(await fetch_academy_post_async("2777027", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2429,7 +2435,7 @@ def heroes_time_win_rate(
         }
     }
 )
-def heroes_builds(
+async def heroes_builds(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2477,7 +2483,7 @@ def heroes_builds(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     lane_value = validate_and_single([lane], LANE_MAP, "lane")
     payload = {
         "pageSize": size,
@@ -2501,7 +2507,7 @@ def heroes_builds(
         ],
         "sorts": [],
     }
-    return fetch_academy_post("2776688", payload, lang)
+    return passthrough(await fetch_academy_post_async("2776688", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2579,7 +2585,7 @@ def heroes_builds(
         }
     }
 )
-def heroes_counters(
+async def heroes_counters(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2620,7 +2626,7 @@ def heroes_counters(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "pageIndex": index,
@@ -2643,7 +2649,7 @@ def heroes_counters(
         ],
         "sorts": [],
     }
-    return fetch_academy_post("2777391", payload, lang)
+    return passthrough(await fetch_academy_post_async("2777391", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2721,7 +2727,7 @@ def heroes_counters(
         }
     }
 )
-def heroes_teammates(
+async def heroes_teammates(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2762,7 +2768,7 @@ def heroes_teammates(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "pageIndex": index,
@@ -2785,7 +2791,7 @@ def heroes_teammates(
         ],
         "sorts": [],
     }
-    return fetch_academy_post("2777391", payload, lang)
+    return passthrough(await fetch_academy_post_async("2777391", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -2864,7 +2870,7 @@ def heroes_teammates(
         }
     }
 )
-def heroes_trends(
+async def heroes_trends(
     hero_identifier: Annotated[
         str,
         Path(
@@ -2915,7 +2921,7 @@ def heroes_trends(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     day_map = {
         "7": "2755185",
         "15": "2755186",
@@ -2943,7 +2949,7 @@ def heroes_trends(
         ],
         "sorts": [],
     }
-    return fetch_academy_post(day_map.get(days, "2755185"), payload, lang)
+    return passthrough(await fetch_academy_post_async(day_map.get(days, "2755185"), with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -3116,7 +3122,7 @@ def heroes_trends(
         }
     }
 )
-def heroes_recommended(
+async def heroes_recommended(
     hero_identifier: Annotated[
         str,
         Path(
@@ -3157,7 +3163,7 @@ def heroes_recommended(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "pageIndex": index,
@@ -3204,7 +3210,7 @@ def heroes_recommended(
         "type": "form.item.all",
         "object": [2675413],
     }
-    return fetch_academy_post("2718124", payload, lang)
+    return passthrough(await fetch_academy_post_async("2718124", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -3279,7 +3285,7 @@ def heroes_recommended(
         }
     }
 )
-def heroes_ratings(
+async def heroes_ratings(
     lang: Annotated[
         LanguageEnum,
         Query(
@@ -3288,7 +3294,7 @@ def heroes_ratings(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    return fetch_ratings_all(lang)
+    return passthrough(await fetch_ratings_all_async(lang, raw=True))
 
 
 @router.get(
@@ -3356,7 +3362,7 @@ def heroes_ratings(
         }
     }
 )
-def heroes_ratings_subject(
+async def heroes_ratings_subject(
     subject: Annotated[
         str,
         Path(
@@ -3374,4 +3380,4 @@ def heroes_ratings_subject(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    return fetch_ratings_subject(lang, subject)
+    return passthrough(await fetch_ratings_subject_async(lang, subject, raw=True))
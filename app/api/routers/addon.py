@@ -2,15 +2,16 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 
 from app.core.errors import AppError
-from app.services.addon import fetch_ip_get
+from app.services.addon import fetch_ip_get_async
 from fastapi import Request
 from app.schemas.addon import AddonIpResponse, AddonWinRateResponse
 from app.utils.client_ip import extract_client_ip
+from app.utils.deadline import bind_deadline
 
-router = APIRouter(prefix="/api/addon", tags=["addon"])
+router = APIRouter(prefix="/api/addon", tags=["addon"], dependencies=[Depends(bind_deadline)])
 
 
 @router.get(
@@ -255,4 +256,4 @@ def win_rate(
 )
 async def ip(request: Request):
     client_ip = extract_client_ip(request, public_only=True)
-    return fetch_ip_get("c/ip", client_ip)
+    return await fetch_ip_get_async("c/ip", client_ip)
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+
+from app.api.dependencies import require_api_available
+from app.api.routers import academy, mlbb
+from app.core.config import HERO_BATCH_MAX_IDS
+from app.core.enums import HeroLaneEnum, LanguageEnum, RankEnum
+from app.core.errors import _hero_id_or_404
+from app.core.exceptions import AppError
+from app.core.fastjson import response_value
+from app.schemas.aggregate import AcademyHeroBatchResponse, HeroDossierResponse, MlbbHeroBatchResponse
+from app.services.academy import fetch_academy_post_async
+from app.services.batch import fetch_grouped_by_hero
+from app.services.hero_table import mlbb_hero_table
+from app.services.mlbb import fetch_mlbb_post_async
+from app.utils.client_ip import bind_client_ip
+from app.utils.deadline import bind_deadline
+from app.utils.fanout import fan_out, section_error
+from app.utils.filters import LANE_MAP, validate_and_map_rank
+
+router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_api_available), Depends(bind_client_ip), Depends(bind_deadline)])
+
+DOSSIER_SECTIONS: tuple[str, ...] = (
+    "detail",
+    "stats",
+    "skill-combos",
+    "trends",
+    "relations",
+    "counters",
+    "compatibility",
+    "builds",
+)
+
+_LANE_BY_ID: dict[int, HeroLaneEnum] = {ids[0]: HeroLaneEnum(name) for name, ids in LANE_MAP.items()}
+
+
+def parse_sections(raw: str | None, allowed: tuple[str, ...]) -> tuple[str, ...]:
+    """Parse ``a,b`` into known section names; all sections when omitted."""
+    if raw is None or not raw.strip():
+        return allowed
+    selected = tuple(dict.fromkeys(part.strip().lower() for part in raw.split(",") if part.strip()))
+    invalid = [section for section in selected if section not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid include: {', '.join(invalid)}. Allowed: {', '.join(allowed)}",
+        )
+    return selected
+
+
+def parse_identifiers(raw: str) -> list[str]:
+    """Parse ``ids=1,Yi Sun-shin,3`` into unique hero identifiers."""
+    identifiers = list(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+    if not identifiers:
+        raise HTTPException(status_code=422, detail="No ids provided. Pass comma-separated hero IDs or names.")
+    if len(identifiers) > HERO_BATCH_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"Too many ids: {len(identifiers)}. At most {HERO_BATCH_MAX_IDS} per request.")
+    return identifiers
+
+
+async def hero_batch(
+    identifiers: list[str],
+    lang: str,
+    *,
+    grouped: Callable[[list[int]], Awaitable[dict[int, Any] | None]],
+    single: Callable[[str], Awaitable[Any]],
+) -> dict[str, Any]:
+    """Resolve ``identifiers`` and fetch each hero's result, keyed by hero ID.
+
+    ``grouped`` answers all heroes with one upstream query; ``single`` runs
+    per hero concurrently only when ``grouped`` cannot split its answer per
+    hero. If the grouped query fails, every hero carries that error.
+    Identifiers that do not resolve are keyed as given, with their error.
+    """
+    resolved = await fan_out({identifier: (lambda identifier=identifier: _hero_id_or_404(identifier, lang)) for identifier in identifiers})
+    hero_ids = list(dict.fromkeys(value for value in resolved.values() if isinstance(value, int)))
+
+    results: dict[int, Any] | None = None
+    if hero_ids:
+        try:
+            results = await grouped(hero_ids)
+        except AppError as exc:
+            results = {hero_id: section_error(exc) for hero_id in hero_ids}
+        if results is None:
+            results = await fan_out({hero_id: (lambda hero_id=hero_id: single(str(hero_id))) for hero_id in hero_ids})
+
+    heroes: dict[str, Any] = {}
+    for identifier, value in resolved.items():
+        if isinstance(value, int):
+            heroes[str(value)] = results[value]
+        else:
+            heroes[identifier] = value
+    return {"code": 0, "message": "OK", "data": {"heroes": heroes}}
+
+
+async def _primary_lane(hero_id: int, lang: str) -> HeroLaneEnum:
+    record = await mlbb_hero_table.record(hero_id, lang)
+    hero = (record or {}).get("data", {}).get("hero", {}).get("data", {})
+    for option in hero.get("roadsort") or []:
+        if isinstance(option, dict):
+            lane_id = str(option.get("data", {}).get("road_sort_id", ""))
+            if lane_id.isdigit() and int(lane_id) in _LANE_BY_ID:
+                return _LANE_BY_ID[int(lane_id)]
+    raise AppError(
+        status_code=422,
+        code="VALIDATION_ERROR",
+        message="Validation failed.",
+        details="The hero's lane is unknown; pass `lane` to include builds.",
+    )
+
+
+@router.get(
+    path="/heroes/{hero_identifier}/dossier",
+    name="api.mlbb.hero_dossier",
+    response_model=HeroDossierResponse,
+    summary="Hero Dossier",
+    description=(
+        "Retrieve everything a hero page needs in one call. "
+        "The hero is resolved once and the selected sections are fetched concurrently under one request deadline.\n\n"
+        "Path parameters:\n"
+        "- **hero_identifier**: Hero identifier as numeric hero ID or hero name. Accepts values like `30`, `Yi Sun-shin`, or `yisunshin`.\n\n"
+        "Query parameters:\n"
+        "- **include**: Comma-separated sections. Allowed values: `detail`, `stats`, `skill-combos`, `trends`, "
+        "`relations`, `counters`, `compatibility`, `builds` (default: all).\n"
+        "- **rank**: Rank filter for stats, trends, counters, compatibility and builds. "
+        "Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **days**: Past day window for counters and compatibility. Allowed values: `1`, `3`, `7`, `15`, `30`.\n"
+        "- **past-days**: Past day window for trends. Allowed values: `7`, `15`, `30`.\n"
+        "- **lane**: Lane for builds. Allowed values: `exp`, `mid`, `roam`, `jungle`, `gold` (default: the hero's first lane).\n"
+        "- **lang**: Language code for localized content (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **hero_id**: Resolved hero identifier.\n"
+        "- **sections**: Object keyed by section name. Each value is the response of the matching hero endpoint "
+        "(for example `/api/heroes/{hero_identifier}/counters` or `/api/academy/heroes/{hero_identifier}/builds`), "
+        "or an **error** object with `status`, `code` and `message` if that section failed.\n\n"
+        "This endpoint is useful for:\n"
+        "- Rendering a hero page with a single request.\n"
+        "- Tolerating a slow or failing section without losing the rest."
+    ),
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 0,
+                        "message": "OK",
+                        "data": {
+                            "hero_id": 30,
+                            "sections": {
+                                "stats": {
+                                    "code": 0,
+                                    "message": "OK",
+                                    "data": {"records": [{"data": {"main_heroid": 30, "main_hero_win_rate": 0.51}}], "total": 1},
+                                },
+                                "builds": {
+                                    "error": {
+                                        "status": 504,
+                                        "code": "UPSTREAM_DEADLINE_EXCEEDED",
+                                        "message": "We could not process your request right now due to an upstream service issue. Please contact support.",
+                                    }
+                                },
+                            },
+                        },
+                    }
+                }
+            }
+        }
+    }
+)
+async def hero_dossier(
+    hero_identifier: Annotated[
+        str,
+        Path(
+            title="Hero Identifier",
+            description=(
+                "Hero identifier as numeric hero ID or hero name. Accepts values like `30`, `Yi Sun-shin`, or `yisunshin`."
+            ),
+        )
+    ],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Include",
+            description="Comma-separated sections to include (default: all).",
+        )
+    ] = None,
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    days: Annotated[
+        Literal["1", "3", "7", "15", "30"],
+        Query(
+            title="Past Days",
+            description="Past day window for counters and compatibility.",
+        )
+    ] = "1",
+    past_days: Annotated[
+        Literal["7", "15", "30"],
+        Query(
+            alias="past-days",
+            title="Past Days",
+            description="Past day window for trends.",
+        ),
+    ] = "7",
+    lane: Annotated[
+        HeroLaneEnum | None,
+        Query(
+            title="Lane",
+            description="Lane for builds (default: the hero's first lane).",
+        )
+    ] = None,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code for localized content.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    sections = parse_sections(include, DOSSIER_SECTIONS)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
+    # Sections get the numeric ID, so the name is resolved only once.
+    identifier = str(hero_id)
+
+    async def builds() -> Any:
+        return await academy.heroes_builds(identifier, lane=lane or await _primary_lane(hero_id, lang), rank=rank, lang=lang)
+
+    available: dict[str, Callable[[], Awaitable[Any]]] = {
+        "detail": lambda: mlbb.hero_detail(identifier, lang=lang),
+        "stats": lambda: mlbb.hero_detail_stats(identifier, rank=rank, lang=lang),
+        "skill-combos": lambda: mlbb.hero_skill_combo(identifier, lang=lang),
+        "trends": lambda: mlbb.hero_rate(identifier, rank=rank, past_days=past_days, lang=lang),
+        "relations": lambda: mlbb.hero_relation(identifier, lang=lang),
+        "counters": lambda: mlbb.hero_counter(identifier, days=days, rank=rank, lang=lang),
+        "compatibility": lambda: mlbb.hero_compatibility(identifier, days=days, rank=rank, lang=lang),
+        "builds": builds,
+    }
+
+    async def section(name: str) -> Any:
+        return response_value(await available[name]())
+
+    results = await fan_out({name: (lambda name=name: section(name)) for name in sections})
+    return {"code": 0, "message": "OK", "data": {"hero_id": hero_id, "sections": results}}
+
+
+_BATCH_IDS_DESCRIPTION = "Comma-separated hero IDs or names, for example `1,2,Yi Sun-shin`."
+
+
+@router.get(
+    path="/heroes/stats:batch",
+    name="api.mlbb.hero_detail_stats_batch",
+    response_model=MlbbHeroBatchResponse,
+    summary="Hero Detail Statistics (Batch)",
+    description=(
+        "Retrieve `/api/heroes/{hero_identifier}/stats` for many heroes in one request. "
+        "All heroes are fetched with a single upstream query; only if the upstream does not filter by hero are they fetched concurrently.\n\n"
+        "Query parameters:\n"
+        "- **ids**: Comma-separated hero IDs or names (required).\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **size**: Number of items per hero (minimum: 1).\n"
+        "- **lang**: Language code for localized content (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **heroes**: Object keyed by hero ID. Each value is the hero's stats response, "
+        "or an **error** object with `status`, `code` and `message`. "
+        "Identifiers that cannot be resolved are keyed as given.\n\n"
+        "This endpoint is useful for:\n"
+        "- Refreshing statistics for the whole roster in one call."
+    ),
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 0,
+                        "message": "OK",
+                        "data": {
+                            "heroes": {
+                                "1": {
+                                    "code": 0,
+                                    "message": "OK",
+                                    "data": {"records": [{"data": {"main_heroid": 1, "main_hero_win_rate": 0.49}}], "total": 1},
+                                },
+                                "nobody": {
+                                    "error": {"status": 404, "code": "RESOURCE_NOT_FOUND", "message": "Hero not found"}
+                                },
+                            }
+                        },
+                    }
+                }
+            }
+        }
+    }
+)
+async def hero_detail_stats_batch(
+    ids: Annotated[
+        str,
+        Query(
+            title="Hero Identifiers",
+            description=_BATCH_IDS_DESCRIPTION,
+        )
+    ],
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    size: Annotated[
+        int,
+        Query(
+            title="Page Size",
+            description="Number of items per hero.",
+            ge=1,
+        )
+    ] = 20,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code for localized content.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    filters = [
+        {"field": "bigrank", "operator": "eq", "value": validate_and_map_rank(rank)},
+        {"field": "match_type", "operator": "eq", "value": "1"},
+    ]
+
+    async def single(identifier: str) -> Any:
+        return response_value(await mlbb.hero_detail_stats(identifier, rank=rank, size=size, lang=lang))
+
+    return await hero_batch(
+        parse_identifiers(ids),
+        lang,
+        grouped=lambda hero_ids: fetch_grouped_by_hero(fetch_mlbb_post_async, "2756567", hero_ids, filters, lang, size),
+        single=single,
+    )
+
+
+academy_router = APIRouter(prefix="/api/academy", tags=["academy"], dependencies=[Depends(require_api_available), Depends(bind_client_ip), Depends(bind_deadline)])
+
+
+@academy_router.get(
+    path="/heroes/stats:batch",
+    name="api.academy.heroes_stats_batch",
+    response_model=AcademyHeroBatchResponse,
+    summary="Hero Statistics (Batch)",
+    description=(
+        "Retrieve `/api/academy/heroes/{hero_identifier}/stats` for many heroes in one request. "
+        "All heroes are fetched with a single upstream query; only if the upstream does not filter by hero are they fetched concurrently.\n\n"
+        "Query parameters:\n"
+        "- **ids**: Comma-separated hero IDs or names (required).\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **size**: Number of items per hero (minimum: 1).\n"
+        "- **lang**: Language code for localized content (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **heroes**: Object keyed by hero ID. Each value is the hero's stats response, "
+        "or an **error** object with `status`, `code` and `message`. "
+        "Identifiers that cannot be resolved are keyed as given.\n\n"
+        "This endpoint is useful for:\n"
+        "- Refreshing academy statistics for the whole roster in one call."
+    ),
+)
+async def heroes_stats_batch(
+    ids: Annotated[
+        str,
+        Query(
+            title="Hero Identifiers",
+            description=_BATCH_IDS_DESCRIPTION,
+        )
+    ],
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    size: Annotated[
+        int,
+        Query(
+            title="Page Size",
+            description="Number of items per hero.",
+            ge=1,
+        )
+    ] = 20,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code for localized content.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    filters = [
+        {"field": "bigrank", "operator": "eq", "value": validate_and_map_rank(rank)},
+        {"field": "match_type", "operator": "eq", "value": 1},
+    ]
+
+    async def single(identifier: str) -> Any:
+        return response_value(await academy.heroes_stats(identifier, rank=rank, size=size, lang=lang))
+
+    return await hero_batch(
+        parse_identifiers(ids),
+        lang,
+        grouped=lambda hero_ids: fetch_grouped_by_hero(fetch_academy_post_async, "2755183", hero_ids, filters, lang, size),
+        single=single,
+    )
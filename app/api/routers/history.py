@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+
+from app.api.dependencies import require_api_available
+from app.core.enums import LanguageEnum, RankEnum
+from app.core.errors import _local_hero_id_or_404
+from app.schemas.mlbb import MlbbCollectionResponse
+from app.services.history import history_store
+from app.utils.client_ip import bind_client_ip
+from app.utils.deadline import bind_deadline
+from app.utils.filters import validate_and_map_rank
+
+router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_api_available), Depends(bind_client_ip), Depends(bind_deadline)])
+
+# Range used when ``from`` is omitted.
+DEFAULT_RANGE_DAYS = 30
+
+
+@router.get(
+    path="/heroes/{hero_identifier}/history",
+    name="api.mlbb.hero_history",
+    response_model=MlbbCollectionResponse,
+    summary="Hero Rate History",
+    description=(
+        "Retrieve a hero's daily win, pick and ban rates over any date range. "
+        "Served from the local history store, which snapshots the 1-day rank table once per day; "
+        "it never calls the upstream and only covers days since snapshots started.\n\n"
+        "Path parameters:\n"
+        "- **hero_identifier**: Hero identifier as numeric hero ID or hero name. Accepts values like `30`, `Yi Sun-shin`, or `yisunshin`. "
+        "Names resolve only once the hero list has been loaded by another request; numeric IDs always work.\n\n"
+        "Query parameters:\n"
+        "- **from**: First day, `YYYY-MM-DD` (default: 30 days before `to`).\n"
+        "- **to**: Last day, `YYYY-MM-DD` (default: today, UTC).\n"
+        "- **resolution**: Bucket size. Allowed values: `day`, `week`, `month`.\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **lang**: Language code of the loaded hero list used to resolve hero names (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **records**: One entry per bucket with data, oldest first:\n"
+        "    - **date**: Bucket start (the day, the Monday of the week, or the first of the month).\n"
+        "    - **days**: Number of stored days in the bucket.\n"
+        "    - **win_rate**, **pick_rate**, **ban_rate**: Mean rates over those days.\n\n"
+        "This endpoint is useful for:\n"
+        "- Charting hero trends beyond the upstream's rolling windows."
+    ),
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 0,
+                        "message": "OK",
+                        "data": {
+                            "records": [
+                                {"data": {"date": "2026-09-28", "days": 7, "win_rate": 0.5123, "pick_rate": 0.0071, "ban_rate": 0.0412}}
+                            ],
+                            "total": 1,
+                        },
+                    }
+                }
+            }
+        }
+    },
+)
+async def hero_history(
+    hero_identifier: Annotated[
+        str,
+        Path(
+            title="Hero Identifier",
+            description=(
+                "Hero identifier as numeric hero ID or hero name. Accepts values like `30`, `Yi Sun-shin`, or `yisunshin`."
+            ),
+        )
+    ],
+    start: Annotated[
+        date | None,
+        Query(
+            alias="from",
+            title="From",
+            description="First day of the range, `YYYY-MM-DD`.",
+        )
+    ] = None,
+    end: Annotated[
+        date | None,
+        Query(
+            alias="to",
+            title="To",
+            description="Last day of the range, `YYYY-MM-DD`.",
+        )
+    ] = None,
+    resolution: Annotated[
+        Literal["day", "week", "month"],
+        Query(
+            title="Resolution",
+            description="Bucket size of the series.",
+        )
+    ] = "day",
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code used to resolve hero names.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS)
+    if start > end:
+        raise HTTPException(status_code=422, detail="Invalid range: `from` must not be after `to`.")
+    rank_code = validate_and_map_rank(rank)
+    hero_id = _local_hero_id_or_404(hero_identifier, lang)
+
+    # Segment files are read from disk; keep that off the event loop.
+    entries = await asyncio.to_thread(history_store.series, rank_code, hero_id, start, end, resolution)
+    return {"code": 0, "message": "OK", "data": {"records": [{"data": entry} for entry in entries], "total": len(entries)}}
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Annotated, Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies import require_api_available
+from app.core.config import HERO_BATCH_MAX_IDS
+from app.core.enums import LanguageEnum, RankEnum
+from app.core.errors import resolve_heroes
+from app.schemas.mlbb import MlbbCollectionResponse
+from app.services.matchups import COUNTERS, SYNERGIES, matchup_matrices
+from app.utils.client_ip import bind_client_ip
+from app.utils.deadline import bind_deadline
+from app.utils.filters import validate_and_map_rank
+
+router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_api_available), Depends(bind_client_ip), Depends(bind_deadline)])
+
+# A lineup is at most one team; a draft bans at most five heroes per side.
+MAX_LINEUP = 5
+MAX_BANS = 10
+
+
+def parse_lineup(raw: str | None, name: str, *, required: bool = True, limit: int = MAX_LINEUP) -> list[str]:
+    """Parse ``a,b`` into unique hero identifiers, at most ``limit``."""
+    identifiers = list(dict.fromkeys(part.strip() for part in (raw or "").split(",") if part.strip()))
+    if required and not identifiers:
+        raise HTTPException(status_code=422, detail=f"No {name} provided. Pass comma-separated hero IDs or names.")
+    if len(identifiers) > limit:
+        raise HTTPException(status_code=422, detail=f"Too many {name}: {len(identifiers)}. At most {limit}.")
+    return identifiers
+
+
+def _exclude_identifiers(raw: str | None) -> list[str]:
+    identifiers = list(dict.fromkeys(part.strip() for part in (raw or "").split(",") if part.strip()))
+    if len(identifiers) > HERO_BATCH_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"Too many exclude: {len(identifiers)}. At most {HERO_BATCH_MAX_IDS}.")
+    return identifiers
+
+
+def _ranked(entries: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"code": 0, "message": "OK", "data": {"records": [{"data": entry} for entry in entries], "total": len(entries)}}
+
+
+_DAYS_DESCRIPTION = "Past day window of the underlying statistics."
+_LIMIT_DESCRIPTION = "Number of heroes to return."
+_EXCLUDE_DESCRIPTION = "Comma-separated hero IDs or names that must not be suggested (for example bans)."
+
+_RESPONSE_EXAMPLE = {
+    200: {
+        "description": "Successful Response",
+        "content": {
+            "application/json": {
+                "example": {
+                    "code": 0,
+                    "message": "OK",
+                    "data": {
+                        "records": [{"data": {"heroid": 84, "score": 0.0731, "breakdown": {"30": 0.0412, "1": 0.0319}}}],
+                        "total": 1,
+                    },
+                }
+            }
+        }
+    }
+}
+
+
+@router.get(
+    path="/matchups/counters",
+    name="api.mlbb.matchup_counters",
+    response_model=MlbbCollectionResponse,
+    summary="Best Counters to a Lineup",
+    description=(
+        "Rank heroes by how well they counter an enemy lineup. "
+        "Answered from a precomputed counter matrix per rank and day window, built from the cached rank table.\n\n"
+        "Query parameters:\n"
+        "- **enemies**: Comma-separated enemy hero IDs or names, up to five (required).\n"
+        "- **exclude**: Comma-separated hero IDs or names to leave out, such as bans.\n"
+        "- **days**: Past day window. Allowed values: `1`, `3`, `7`, `15`, `30`.\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **limit**: Number of heroes to return (1-50).\n"
+        "- **lang**: Language code used to resolve hero names (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **heroid**: Suggested hero.\n"
+        "- **score**: Sum of the hero's win rate increase against each enemy.\n"
+        "- **breakdown**: The increase against each enemy, keyed by enemy hero ID.\n\n"
+        "This endpoint is useful for:\n"
+        "- Picking into a known enemy composition."
+    ),
+    responses=_RESPONSE_EXAMPLE,
+)
+async def matchup_counters(
+    enemies: Annotated[
+        str,
+        Query(
+            title="Enemies",
+            description="Comma-separated enemy hero IDs or names, for example `30,Miya`.",
+        )
+    ],
+    exclude: Annotated[
+        str | None,
+        Query(
+            title="Exclude",
+            description=_EXCLUDE_DESCRIPTION,
+        )
+    ] = None,
+    days: Annotated[
+        Literal["1", "3", "7", "15", "30"],
+        Query(
+            title="Past Days",
+            description=_DAYS_DESCRIPTION,
+        )
+    ] = "7",
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    limit: Annotated[
+        int,
+        Query(
+            title="Limit",
+            description=_LIMIT_DESCRIPTION,
+            ge=1,
+            le=50,
+        )
+    ] = 10,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code used to resolve hero names.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    enemy_ids = await resolve_heroes(parse_lineup(enemies, "enemies"), lang)
+    excluded = await resolve_heroes(_exclude_identifiers(exclude), lang)
+    matrix = await matchup_matrices.matrix(COUNTERS, days, validate_and_map_rank(rank))
+    return _ranked(matrix.top(enemy_ids, exclude=excluded, limit=limit))
+
+
+@router.get(
+    path="/matchups/synergies",
+    name="api.mlbb.matchup_synergies",
+    response_model=MlbbCollectionResponse,
+    summary="Top Synergies for a Team",
+    description=(
+        "Rank heroes by how much they raise win rate alongside a team. "
+        "Answered from a precomputed synergy matrix per rank and day window, built from the cached rank table.\n\n"
+        "Query parameters:\n"
+        "- **team**: Comma-separated allied hero IDs or names, up to five (required).\n"
+        "- **exclude**: Comma-separated hero IDs or names to leave out, such as bans.\n"
+        "- **days**: Past day window. Allowed values: `1`, `3`, `7`, `15`, `30`.\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **limit**: Number of heroes to return (1-50).\n"
+        "- **lang**: Language code used to resolve hero names (default: `en`).\n\n"
+        "The response includes:\n"
+        "- **heroid**: Suggested hero.\n"
+        "- **score**: Sum of the hero's win rate increase alongside each teammate.\n"
+        "- **breakdown**: The increase alongside each teammate, keyed by teammate hero ID.\n\n"
+        "This endpoint is useful for:\n"
+        "- Completing a team composition."
+    ),
+    responses=_RESPONSE_EXAMPLE,
+)
+async def matchup_synergies(
+    team: Annotated[
+        str,
+        Query(
+            title="Team",
+            description="Comma-separated allied hero IDs or names, for example `30,Miya`.",
+        )
+    ],
+    exclude: Annotated[
+        str | None,
+        Query(
+            title="Exclude",
+            description=_EXCLUDE_DESCRIPTION,
+        )
+    ] = None,
+    days: Annotated[
+        Literal["1", "3", "7", "15", "30"],
+        Query(
+            title="Past Days",
+            description=_DAYS_DESCRIPTION,
+        )
+    ] = "7",
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    limit: Annotated[
+        int,
+        Query(
+            title="Limit",
+            description=_LIMIT_DESCRIPTION,
+            ge=1,
+            le=50,
+        )
+    ] = 10,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code used to resolve hero names.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    team_ids = await resolve_heroes(parse_lineup(team, "team"), lang)
+    excluded = await resolve_heroes(_exclude_identifiers(exclude), lang)
+    matrix = await matchup_matrices.matrix(SYNERGIES, days, validate_and_map_rank(rank))
+    return _ranked(matrix.top(team_ids, exclude=excluded, limit=limit))
+
+
+@router.get(
+    path="/draft/recommend",
+    name="api.mlbb.draft_recommend",
+    response_model=MlbbCollectionResponse,
+    summary="Draft Pick Recommendations",
+    description=(
+        "Rank every hero still available in a draft. "
+        "Each candidate is scored in one pass from the cached counter and synergy matrices and the heroes' win rates, "
+        "so a full lineup costs no more than an empty one.\n\n"
+        "Query parameters:\n"
+        "- **allies**: Comma-separated allied picks, up to four.\n"
+        "- **enemies**: Comma-separated enemy picks, up to five.\n"
+        "- **bans**: Comma-separated banned heroes, up to ten.\n"
+        "- **days**: Past day window. Allowed values: `1`, `3`, `7`, `15`, `30`.\n"
+        "- **rank**: Rank filter. Allowed values: `all`, `epic`, `legend`, `mythic`, `honor`, `glory`.\n"
+        "- **limit**: Number of heroes to return (1-50).\n"
+        "- **lang**: Language code used to resolve hero names (default: `en`).\n\n"
+        "Heroes accept numeric IDs or names. Picked and banned heroes are never suggested.\n\n"
+        "The response includes:\n"
+        "- **heroid**: Suggested hero.\n"
+        "- **counter**: Sum of the hero's win rate increase against each enemy.\n"
+        "- **synergy**: Sum of the hero's win rate increase alongside each ally.\n"
+        "- **win_rate**: The hero's own win rate.\n"
+        "- **score**: `counter + synergy + (win_rate - 0.5)`.\n\n"
+        "This endpoint is useful for:\n"
+        "- Draft assistants that re-rank the pool after every pick or ban."
+    ),
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 0,
+                        "message": "OK",
+                        "data": {
+                            "records": [
+                                {"data": {"heroid": 84, "score": 0.0912, "counter": 0.0731, "synergy": 0.0104, "win_rate": 0.5077}}
+                            ],
+                            "total": 1,
+                        },
+                    }
+                }
+            }
+        }
+    },
+)
+async def draft_recommend(
+    allies: Annotated[
+        str | None,
+        Query(
+            title="Allies",
+            description="Comma-separated allied hero IDs or names.",
+        )
+    ] = None,
+    enemies: Annotated[
+        str | None,
+        Query(
+            title="Enemies",
+            description="Comma-separated enemy hero IDs or names.",
+        )
+    ] = None,
+    bans: Annotated[
+        str | None,
+        Query(
+            title="Bans",
+            description="Comma-separated banned hero IDs or names.",
+        )
+    ] = None,
+    days: Annotated[
+        Literal["1", "3", "7", "15", "30"],
+        Query(
+            title="Past Days",
+            description=_DAYS_DESCRIPTION,
+        )
+    ] = "7",
+    rank: Annotated[
+        RankEnum,
+        Query(
+            title="Rank",
+            description="Rank filter for hero statistics.",
+        ),
+    ] = RankEnum.ALL,
+    limit: Annotated[
+        int,
+        Query(
+            title="Limit",
+            description=_LIMIT_DESCRIPTION,
+            ge=1,
+            le=50,
+        )
+    ] = 10,
+    lang: Annotated[
+        LanguageEnum,
+        Query(
+            title="Language",
+            description="Language code used to resolve hero names.",
+        )
+    ] = LanguageEnum.ENGLISH
+) -> object:
+    ally_ids, enemy_ids, ban_ids = await asyncio.gather(
+        resolve_heroes(parse_lineup(allies, "allies", required=False, limit=MAX_LINEUP - 1), lang),
+        resolve_heroes(parse_lineup(enemies, "enemies", required=False), lang),
+        resolve_heroes(parse_lineup(bans, "bans", required=False, limit=MAX_BANS), lang),
+    )
+    entries = await matchup_matrices.recommend(
+        allies=ally_ids,
+        enemies=enemy_ids,
+        bans=ban_ids,
+        days=days,
+        rank_code=validate_and_map_rank(rank),
+        limit=limit,
+    )
+    return _ranked(entries)
@@ -6,17 +6,21 @@ from fastapi import APIRouter, Depends, Path, Query
 
 from app.api.dependencies import require_api_available
 
-from app.services.mlbb import fetch_mlbb_post
+from app.services.hero_table import mlbb_hero_table, rank_table
+from app.services.mlbb import fetch_mlbb_post_async
 from app.schemas.mlbb import MlbbCollectionResponse
 
 from app.core.enums import LanguageEnum, RankEnum, SortOrderEnum, HeroRoleEnum, HeroLaneEnum
 from app.core.errors import _hero_id_or_404
+from app.core.fastjson import passthrough
 from app.utils.client_ip import bind_client_ip
+from app.utils.deadline import bind_deadline
+from app.utils.projection import bind_fields, with_requested_fields
 from app.utils.filters import (
     ROLE_MAP, LANE_MAP, validate_and_map_multi, validate_and_map_rank
 )
 
-router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_api_available), Depends(bind_client_ip)])
+router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_api_available), Depends(bind_client_ip), Depends(bind_deadline), Depends(bind_fields)])
 
 
 @router.get(
@@ -95,7 +99,7 @@ router = APIRouter(prefix="/api", tags=["mlbb"], dependencies=[Depends(require_a
         }
     }
 )
-def hero_list(
+async def hero_list(
     size: Annotated[
         int,
         Query(
@@ -147,7 +151,7 @@ def hero_list(
             "hero.data.smallmap"
         ],
     }
-    return fetch_mlbb_post("2756564", payload, lang)
+    return passthrough(await mlbb_hero_table.query(with_requested_fields(payload), lang))
 
 
 @router.get(
@@ -242,7 +246,7 @@ def hero_list(
         }
     }
 )
-def hero_rank(
+async def hero_rank(
     days: Annotated[
         Literal["1", "3", "7", "15", "30"],
         Query(
@@ -348,7 +352,7 @@ def hero_rank(
     }
 
     url_key = url_map.get(days, "2756567")
-    return fetch_mlbb_post(url_key, payload, lang)
+    return passthrough(await rank_table.query(url_key, with_requested_fields(payload), lang))
 
 
 @router.get(
@@ -501,7 +505,7 @@ def hero_rank(
         }
     }
 )
-def hero_position(
+async def hero_position(
     role: Annotated[
         list[str],
         Query(
@@ -597,7 +601,7 @@ def hero_position(
         ],
         "object": [],
     }
-    return fetch_mlbb_post("2756564", payload, lang)
+    return passthrough(await mlbb_hero_table.query(with_requested_fields(payload), lang))
 
 
 @router.get(
@@ -853,7 +857,7 @@ def hero_position(
         }
     }
 )
-def hero_detail(
+async def hero_detail(
     hero_identifier: Annotated[
         str,
         Path(
@@ -887,7 +891,7 @@ def hero_detail(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "filters": [
@@ -901,7 +905,7 @@ def hero_detail(
         "pageIndex": index,
         "object": [],
     }
-    return fetch_mlbb_post("2756564", payload, lang)
+    return passthrough(await fetch_mlbb_post_async("2756564", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1054,7 +1058,7 @@ def hero_detail(
         }
     }
 )
-def hero_detail_stats(
+async def hero_detail_stats(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1095,7 +1099,7 @@ def hero_detail_stats(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "filters": [
@@ -1118,7 +1122,7 @@ def hero_detail_stats(
         "sorts": [],
         "pageIndex": index,
     }
-    return fetch_mlbb_post("2756567", payload, lang)
+    return passthrough(await fetch_mlbb_post_async("2756567", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1209,7 +1213,7 @@ def hero_detail_stats(
         }
     }
 )
-def hero_skill_combo(
+async def hero_skill_combo(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1243,7 +1247,7 @@ def hero_skill_combo(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "filters": [
@@ -1257,7 +1261,7 @@ def hero_skill_combo(
         "pageIndex": index,
         "object": [2684183],
     }
-    return fetch_mlbb_post("2674711", payload, lang)
+    return passthrough(await fetch_mlbb_post_async("2674711", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1336,7 +1340,7 @@ def hero_skill_combo(
         }
     }
 )
-def hero_rate(
+async def hero_rate(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1385,7 +1389,7 @@ def hero_rate(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     url_map = {
         "7": "2674709",
         "15": "2687909",
@@ -1413,7 +1417,7 @@ def hero_rate(
         "sorts": [],
         "pageIndex": index,
     }
-    return fetch_mlbb_post(url_map.get(past_days, "2674709"), payload, lang)
+    return passthrough(await fetch_mlbb_post_async(url_map.get(past_days, "2674709"), with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1490,7 +1494,7 @@ def hero_rate(
         }
     }
 )
-def hero_relation(
+async def hero_relation(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1524,7 +1528,7 @@ def hero_relation(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     payload = {
         "pageSize": size,
         "filters": [
@@ -1539,7 +1543,7 @@ def hero_relation(
         "fields": ["hero.data.name"],
         "object": [],
     }
-    return fetch_mlbb_post("2756564", payload, lang)
+    return passthrough(await fetch_mlbb_post_async("2756564", with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1692,7 +1696,7 @@ def hero_relation(
         }
     }
 )
-def hero_counter(
+async def hero_counter(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1740,7 +1744,7 @@ def hero_counter(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     url_map = {"1": "2756567", "3": "2756568", "7": "2756569", "15": "2756565", "30": "2756570"}
     payload = {
         "pageSize": size,
@@ -1765,7 +1769,7 @@ def hero_counter(
         "pageIndex": index,
     }
     url_key = url_map.get(days, "2756567")
-    return fetch_mlbb_post(url_key, payload, lang)
+    return passthrough(await fetch_mlbb_post_async(url_key, with_requested_fields(payload), lang, raw=True))
 
 
 @router.get(
@@ -1919,7 +1923,7 @@ def hero_counter(
         }
     }
 )
-def hero_compatibility(
+async def hero_compatibility(
     hero_identifier: Annotated[
         str,
         Path(
@@ -1967,7 +1971,7 @@ def hero_compatibility(
         )
     ] = LanguageEnum.ENGLISH
 ) -> object:
-    hero_id = _hero_id_or_404(hero_identifier, lang)
+    hero_id = await _hero_id_or_404(hero_identifier, lang)
     url_map = {"1": "2756567", "3": "2756568", "7": "2756569", "15": "2756565", "30": "2756570"}
     payload = {
         "pageSize": size,
@@ -1992,4 +1996,4 @@ def hero_compatibility(
         "pageIndex": index,
     }
     url_key = url_map.get(days, "2756567")
-    return fetch_mlbb_post(url_key, payload, lang)
+    return passthrough(await fetch_mlbb_post_async(url_key, with_requested_fields(payload), lang, raw=True))
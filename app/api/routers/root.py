@@ -20,6 +20,10 @@ from app.core.config import (
     SUPPORT_STATUS_MESSAGES,
     BASE_URL,
 )
+from app.api.warmer import cache_warmer
+from app.core.cache import upstream_cache
+from app.core.resilience import upstream_guards, upstream_hedges, upstream_retries
+from app.core.singleflight import upstream_flights
 
 
 from fastapi.routing import APIRoute
@@ -149,6 +153,23 @@ async def api_index(request: Request) -> dict:
     }
 
 
+@router.get(
+    path="/api/metrics",
+    summary="Upstream Metrics",
+    include_in_schema=False,
+    description="Internal counters for the upstream response cache, request coalescing, per-upstream circuit breakers, retries, hedged requests and the cache warmer.",
+)
+def api_metrics() -> dict:
+    return {
+        "cache": upstream_cache.stats(),
+        "coalescing": upstream_flights.stats(),
+        "upstreams": {name: guard.snapshot() for name, guard in upstream_guards.items()},
+        "retries": upstream_retries.stats(),
+        "hedges": upstream_hedges.stats(),
+        "warmer": cache_warmer.stats(),
+    }
+
+
 @router.get(
     path="/robots.txt",
     summary="Robots.txt for Web Crawlers",
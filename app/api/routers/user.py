@@ -2,11 +2,12 @@
 
 from app.api.dependencies import require_api_available, require_user_jwt
 
-from app.services.user import fetch_user_post, fetch_user_actgateway, fetch_user_actgateway_post
+from app.services.user import fetch_user_post_async, fetch_user_actgateway_async, fetch_user_actgateway_post_async
 
 from app.core.exceptions import AppError
 from app.core.http import MLBBHeaderBuilder
 from app.core.errors import _hero_id_or_404
+from app.utils.deadline import bind_deadline
 from app.core.enums import LanguageEnum, VisibilityEnum
 from app.schemas.user import (
     UserAuthSimpleResponse,
@@ -26,7 +27,7 @@ from app.schemas.user import (
 
 from typing import Annotated
 
-router = APIRouter(prefix="/api/user", tags=["user"], dependencies=[Depends(require_api_available)])
+router = APIRouter(prefix="/api/user", tags=["user"], dependencies=[Depends(require_api_available), Depends(bind_deadline)])
 
 
 def _require_dict_response(data: object) -> dict[str, object]:
@@ -82,7 +83,7 @@ def _require_key(response_data: dict[str, object], key: str) -> None:
         }
     }
 )
-def send_vc(
+async def send_vc(
     body: UserSendVcRequest,
 ) -> object:
     headers = MLBBHeaderBuilder.get_user_header()
@@ -90,7 +91,7 @@ def send_vc(
         "roleId": body.role_id,
         "zoneId": body.zone_id,
     }
-    return fetch_user_post("base/sendVc", headers, payload)
+    return await fetch_user_post_async("base/sendVc", headers, payload)
 
 
 @router.post(
@@ -142,7 +143,7 @@ def send_vc(
         }
     }
 )
-def login(
+async def login(
     body: UserLoginRequest,
 ) -> object:
     headers = MLBBHeaderBuilder.get_user_header()
@@ -153,7 +154,7 @@ def login(
         "referer": "academy",
         "type": "web",
     }
-    return fetch_user_post("base/login", headers, payload)
+    return await fetch_user_post_async("base/login", headers, payload)
 
 
 @router.post(
@@ -189,7 +190,7 @@ def login(
         }
     }
 )
-def logout(
+async def logout(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -199,7 +200,7 @@ def logout(
         jwt=jwt
     )
     payload = {}
-    return fetch_user_post("base/logout", headers, payload)
+    return await fetch_user_post_async("base/logout", headers, payload)
 
 
 @router.get(
@@ -251,7 +252,7 @@ def logout(
         }
     }
 )
-def user_info(
+async def user_info(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -271,7 +272,7 @@ def user_info(
         jwt=jwt
     )
     payload = {}
-    response = _require_dict_response(fetch_user_post("base/getBaseInfo", headers, payload))
+    response = _require_dict_response(await fetch_user_post_async("base/getBaseInfo", headers, payload))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -441,7 +442,7 @@ def user_info(
         }
     }
 )
-def user_stats(
+async def user_stats(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -459,7 +460,7 @@ def user_stats(
         x_token=jwt,
     )
     params = {}
-    response = _require_dict_response(fetch_user_actgateway("battlereport/stats", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/stats", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -502,7 +503,7 @@ def user_stats(
         }
     }
 )
-def user_privacy_settings(
+async def user_privacy_settings(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -520,7 +521,7 @@ def user_privacy_settings(
         x_token=jwt,
     )
     params = {}
-    response = _require_dict_response(fetch_user_actgateway("battlereport/privacy/settings", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/privacy/settings", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -562,7 +563,7 @@ def user_privacy_settings(
         }
     }
 )
-def user_update_privacy_settings(
+async def user_update_privacy_settings(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -592,7 +593,7 @@ def user_update_privacy_settings(
     params = {
         "privacy": 1 if visibility == VisibilityEnum.VISIBLE else 2,
     }
-    response = _require_dict_response(fetch_user_actgateway_post("battlereport/privacy/settings", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_post_async("battlereport/privacy/settings", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -638,7 +639,7 @@ def user_update_privacy_settings(
         }
     }
 )
-def user_season(
+async def user_season(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -656,7 +657,7 @@ def user_season(
         x_token=jwt,
     )
     params = {}
-    response = _require_dict_response(fetch_user_actgateway("battlereport/season/list", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/season/list", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -752,7 +753,7 @@ def user_season(
         }
     }
 )
-def user_matches(
+async def user_matches(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -798,7 +799,7 @@ def user_matches(
     if last_cursor is not None:
         params["last_cursor"] = last_cursor
 
-    response = _require_dict_response(fetch_user_actgateway("battlereport/matches/recent", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/matches/recent", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -918,7 +919,7 @@ def user_matches(
         }
     }
 )
-def user_match_details(
+async def user_match_details(
     match_id: Annotated[
         int,
         Path(
@@ -952,7 +953,7 @@ def user_match_details(
     params = {
         "sid": sid
     }
-    response = _require_dict_response(fetch_user_actgateway(f"battlereport/matches/{match_id}", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async(f"battlereport/matches/{match_id}", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -1042,7 +1043,7 @@ def user_match_details(
         }
     }
 )
-def user_frequent_heroes(
+async def user_frequent_heroes(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -1088,7 +1089,7 @@ def user_frequent_heroes(
     if last_cursor is not None:
         params["last_cursor"] = last_cursor
 
-    response = _require_dict_response(fetch_user_actgateway("battlereport/heros/frequent", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/heros/frequent", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -1218,7 +1219,7 @@ def user_frequent_heroes(
         }
     }
 )
-def user_matches_by_hero(
+async def user_matches_by_hero(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -1262,7 +1263,7 @@ def user_matches_by_hero(
         )
     ] = LanguageEnum.ENGLISH,
 ) -> object:
-    hero_id = _hero_id_or_404(
+    hero_id = await _hero_id_or_404(
         hero_identifier,
         lang
     )
@@ -1278,7 +1279,7 @@ def user_matches_by_hero(
     if last_cursor is not None:
         params["last_cursor"] = last_cursor
 
-    response = _require_dict_response(fetch_user_actgateway("battlereport/hero/matches", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/hero/matches", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
@@ -1356,7 +1357,7 @@ def user_matches_by_hero(
         }
     }
 )
-def user_friends(
+async def user_friends(
     jwt: Annotated[
         str,
         Depends(require_user_jwt),
@@ -1384,7 +1385,7 @@ def user_friends(
         "sid": sid,
     }
 
-    response = _require_dict_response(fetch_user_actgateway("battlereport/friends", headers, params))
+    response = _require_dict_response(await fetch_user_actgateway_async("battlereport/friends", headers, params))
     _require_key(response, "code")
     _require_key(response, "data")
     return response
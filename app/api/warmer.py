@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from app.api.routers import academy, mlbb
+from app.core.config import WARMER_CONCURRENCY, WARMER_JITTER_SECONDS, WARMER_LANGS, WARMER_RANKS
+from app.core.enums import LanguageEnum, RankEnum
+from app.core.resilience import CircuitState, upstream_guards
+
+
+def _selected(raw: str, allowed: list[str]) -> list[str]:
+    """Comma-separated subset of ``allowed``; all of it when empty."""
+    wanted = [part.strip().lower() for part in raw.split(",") if part.strip()]
+    return [value for value in allowed if value in wanted] if wanted else allowed
+
+
+@dataclass(frozen=True)
+class WarmJob:
+    """One handler call with default paging, i.e. the request users send most."""
+
+    upstream: str
+    name: str
+    lang: str
+    call: Callable[[], Awaitable[Any]]
+
+
+def default_jobs(langs: list[str], ranks: list[str]) -> list[WarmJob]:
+    """Hero list, rank tables, academy catalogs and ratings per language."""
+    jobs: list[WarmJob] = []
+    for lang in langs:
+        language = LanguageEnum(lang)
+        jobs.append(WarmJob("mlbb", "hero_list", lang, lambda language=language: mlbb.hero_list(lang=language)))
+        for rank in ranks:
+            jobs.append(WarmJob("mlbb", f"hero_rank:{rank}", lang, lambda language=language, rank=RankEnum(rank): mlbb.hero_rank(rank=rank, lang=language)))
+        for name, handler in (
+            ("heroes", academy.heroes),
+            ("roles", academy.roles),
+            ("equipment", academy.equipment),
+            ("spells", academy.spells),
+            ("emblems", academy.emblems),
+            ("ranks", academy.ranks),
+        ):
+            jobs.append(WarmJob("academy", name, lang, lambda language=language, handler=handler: handler(lang=language)))
+        jobs.append(WarmJob("ratings", "heroes_ratings", lang, lambda language=language: academy.heroes_ratings(lang=language)))
+    return jobs
+
+
+class CacheWarmer:
+    """Re-fetch hot endpoint/parameter combinations into the response cache.
+
+    Jobs run ``concurrency`` at a time, each after a random delay of up to
+    ``jitter_seconds`` so a round never lands on the upstream as one burst.
+    Jobs for an upstream whose circuit is not closed are skipped instead of
+    adding load to it. Entries still fresh in the cache cost nothing.
+    """
+
+    def __init__(self, jobs: list[WarmJob], *, concurrency: int, jitter_seconds: float) -> None:
+        self.jobs = jobs
+        self.concurrency = max(1, concurrency)
+        self.jitter_seconds = max(0.0, jitter_seconds)
+        self.rounds = 0
+        self.running = False
+        self.last_round_seconds: float | None = None
+        self._outcomes: dict[str, dict[str, int]] = {}
+
+    def _count(self, job: WarmJob, outcome: str) -> None:
+        counts = self._outcomes.setdefault(job.upstream, {"warmed": 0, "failed": 0, "skipped": 0})
+        counts[outcome] += 1
+
+    async def _run(self, job: WarmJob, slots: asyncio.Semaphore) -> None:
+        # Jitter before taking a slot, so waiting jobs do not hold concurrency.
+        if self.jitter_seconds:
+            await asyncio.sleep(random.uniform(0, self.jitter_seconds))
+        async with slots:
+            guard = upstream_guards.get(job.upstream)
+            if guard is not None and guard.breaker.state is not CircuitState.CLOSED:
+                self._count(job, "skipped")
+                return
+            try:
+                await job.call()
+            except Exception:
+                # Any failure is this job's alone; the round and its stats go on.
+                self._count(job, "failed")
+            else:
+                self._count(job, "warmed")
+
+    async def warm(self) -> dict[str, Any]:
+        """Run every job once; returns ``stats()`` for the round."""
+        self.running = True
+        self._outcomes = {}
+        started = monotonic()
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            await asyncio.gather(*(self._run(job, slots) for job in self.jobs))
+        finally:
+            self.running = False
+        self.rounds += 1
+        self.last_round_seconds = round(monotonic() - started, 3)
+        return self.stats()
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.warm()
+            except Exception:
+                # One bad round must not stop the schedule.
+                pass
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        totals = {"warmed": 0, "failed": 0, "skipped": 0}
+        for counts in self._outcomes.values():
+            for outcome, count in counts.items():
+                totals[outcome] += count
+        done = sum(totals.values())
+        return {
+            "running": self.running,
+            "rounds": self.rounds,
+            "jobs": len(self.jobs),
+            "done": done,
+            **totals,
+            "coverage": round(totals["warmed"] / len(self.jobs), 4) if self.jobs else 0.0,
+            "last_round_seconds": self.last_round_seconds,
+            "upstreams": {name: dict(counts) for name, counts in self._outcomes.items()},
+        }
+
+    def reset(self) -> None:
+        self.rounds = 0
+        self.running = False
+        self.last_round_seconds = None
+        self._outcomes = {}
+
+
+cache_warmer = CacheWarmer(
+    default_jobs(
+        _selected(WARMER_LANGS, [language.value for language in LanguageEnum]),
+        _selected(WARMER_RANKS, [rank.value for rank in RankEnum]),
+    ),
+    concurrency=WARMER_CONCURRENCY,
+    jitter_seconds=WARMER_JITTER_SECONDS,
+)
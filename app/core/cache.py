@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from app.core.config import (
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_STALE_SECONDS,
+    CACHE_STALE_IF_ERROR_SECONDS,
+    CACHE_TTL_STATIC_SECONDS,
+    CACHE_TTL_WINDOW_SECONDS,
+)
+from app.core.exceptions import AppError
+from app.core.fastjson import RawJSON, parsed
+from app.core.singleflight import upstream_flights
+from app.utils.response_meta import mark_response_stale, note_cache_ttl
+
+# Upstream tables whose content only changes with game patches (hero list,
+# item/spell/emblem catalogs, roles, rank tiers). Everything else is a rank,
+# trend or ratings window and uses the short TTL.
+STATIC_ENDPOINTS: frozenset[str] = frozenset({
+    # mlbb
+    "2756564",
+    "2674711",
+    # academy
+    "2766683",
+    "2740642",
+    "2775075",
+    "2713995",
+    "2718122",
+    "2718121",
+    "3210596",
+})
+
+
+def ttl_for_endpoint(endpoint_id: str) -> int:
+    if endpoint_id in STATIC_ENDPOINTS:
+        return CACHE_TTL_STATIC_SECONDS
+    return CACHE_TTL_WINDOW_SECONDS
+
+
+def cache_key(source: str, endpoint_id: str, payload: dict[str, Any] | None, lang: str) -> str:
+    canonical = json.dumps(
+        [source, endpoint_id, payload, getattr(lang, "value", lang)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_cacheable(value: Any) -> bool:
+    if isinstance(value, RawJSON):
+        return True
+    return isinstance(value, dict) and value.get("code") in (0, "0")
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    retain_until: float
+
+
+class ResponseCache:
+    """Bounded LRU cache of parsed upstream responses with per-entry TTL.
+
+    An entry is fresh for ``ttl`` seconds and may then be served stale for up
+    to ``max_stale`` more seconds while it is being revalidated. It is kept
+    as a last known good value for ``stale_if_error`` seconds past its TTL.
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_if_error_hits = 0
+
+    def lookup(self, key: str) -> tuple[Any, float] | None:
+        """Return ``(value, fresh_for)`` or ``None`` once past the stale limit.
+
+        ``fresh_for`` is the seconds of freshness left, ``<= 0`` once stale.
+        """
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.stale_until <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.fresh_until > now:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry.value, entry.fresh_until - now
+
+    def get(self, key: str) -> Any | None:
+        found = self.lookup(key)
+        if found is None or found[1] <= 0:
+            return None
+        return found[0]
+
+    def last_good(self, key: str) -> Any | None:
+        """Return the retained value for ``key`` to stand in for a failed fetch."""
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.retain_until <= now:
+                return None
+            self.stale_if_error_hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: float, max_stale: float = 0, stale_if_error: float = 0) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        now = monotonic()
+        stale_until = now + ttl + max(max_stale, 0)
+        retain_until = max(stale_until, now + ttl + max(stale_if_error, 0))
+        with self._lock:
+            self._entries[key] = _CacheEntry(value, now + ttl, stale_until, retain_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.stale_if_error_hits = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_if_error_hits": self.stale_if_error_hits,
+            }
+
+
+upstream_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES)
+
+
+def _last_good_or_raise(key: str, exc: AppError) -> Any:
+    """Stale-if-error: answer an upstream failure with the last good value."""
+    if not exc.code.startswith("UPSTREAM_"):
+        raise exc
+    value = parsed(upstream_cache.last_good(key))
+    if value is None:
+        raise exc
+
+    mark_response_stale()
+    if isinstance(value, dict):
+        return {**value, "stale": True}
+    return value
+
+
+async def cached_fetch_async(
+    key: str,
+    ttl: float,
+    fetch: Callable[[], Awaitable[Any]],
+    max_stale: float = CACHE_MAX_STALE_SECONDS,
+    stale_if_error: float = CACHE_STALE_IF_ERROR_SECONDS,
+) -> Any:
+    async def fetch_and_store() -> Any:
+        value = await fetch()
+        if is_cacheable(value):
+            upstream_cache.set(key, value, ttl, max_stale, stale_if_error)
+        return value
+
+    found = upstream_cache.lookup(key)
+    if found is not None:
+        value, fresh_for = found
+        note_cache_ttl(fresh_for, max_stale)
+        if fresh_for <= 0:
+            # Stale-while-revalidate: answer now, refresh once in the background.
+            upstream_flights.start(key, fetch_and_store)
+        return value
+
+    note_cache_ttl(ttl, max_stale)
+    try:
+        return await upstream_flights.do(key, fetch_and_store)
+    except AppError as exc:
+        return _last_good_or_raise(key, exc)
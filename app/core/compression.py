@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_ENABLED,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment image
+    brotli = None
+
+# Preferred first; brotli only when the module is installed.
+SUPPORTED_ENCODINGS: tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# What we ask upstreams for; httpx and requests decode these transparently.
+UPSTREAM_ACCEPT_ENCODING = ", ".join((*SUPPORTED_ENCODINGS, "deflate"))
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported coding from an ``Accept-Encoding`` header."""
+    if not COMPRESSION_ENABLED or not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output stable for identical bodies.
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def should_compress(headers: Headers | MutableHeaders, size: int) -> bool:
+    if size < COMPRESSION_MIN_SIZE or "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def _passes_through(headers: Headers) -> bool:
+    """Responses forwarded from their start message on, never buffered.
+
+    Already-encoded or non-compressible types (e.g. the ``/images`` mount),
+    streams without a ``Content-Length`` and bodies declared too small.
+    """
+    if "content-encoding" in headers or not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES):
+        return True
+    length = headers.get("content-length")
+    return length is None or not length.isdigit() or int(length) < COMPRESSION_MIN_SIZE
+
+
+class CompressionMiddleware:
+    """gzip/brotli negotiation for buffered responses.
+
+    Only compressible responses of a declared ``Content-Length`` are
+    buffered and compressed; everything else (see ``_passes_through``) is
+    forwarded as it arrives. Bodies that already carry a
+    ``Content-Encoding`` (e.g. precompressed cache entries) pass through
+    untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if _passes_through(Headers(raw=message["headers"])):
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if should_compress(headers, len(body)):
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
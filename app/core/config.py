@@ -43,6 +43,10 @@ def env_int(key: str, default: int) -> int:
     return _env_cast(key, int, default)
 
 
+def env_float(key: str, default: float) -> float:
+    return _env_cast(key, float, default)
+
+
 # =========================
 # Debugging
 # =========================
@@ -142,3 +146,106 @@ CONTACT_FORM_LINK: str = env_str("CONTACT_FORM_LINK", default="https://ridwaanha
 SECRET_KEY: str = env_str("SECRET_KEY")
 RONE_DEV_ACCESS_KEY: str = env_str("RONE_DEV_ACCESS_KEY")
 RONE_DEV_ACCESS_KEY_V2: str = env_str("RONE_DEV_ACCESS_KEY_V2")
+
+# =========================
+# Upstream Transport
+# =========================
+UPSTREAM_POOL_SIZE: int = env_int("UPSTREAM_POOL_SIZE", default=32)
+UPSTREAM_KEEPALIVE_SECONDS: int = env_int("UPSTREAM_KEEPALIVE_SECONDS", default=90)
+UPSTREAM_MAX_CONCURRENCY: int = env_int("UPSTREAM_MAX_CONCURRENCY", default=64)
+UPSTREAM_TIMEOUT_SECONDS: float = env_float("UPSTREAM_TIMEOUT_SECONDS", default=30.0)
+REQUEST_DEADLINE_SECONDS: float = env_float("REQUEST_DEADLINE_SECONDS", default=25.0)
+
+# =========================
+# Upstream Circuit Breakers
+# =========================
+CIRCUIT_WINDOW_SECONDS: int = env_int("CIRCUIT_WINDOW_SECONDS", default=60)
+CIRCUIT_WINDOW_SIZE: int = env_int("CIRCUIT_WINDOW_SIZE", default=50)
+CIRCUIT_MIN_CALLS: int = env_int("CIRCUIT_MIN_CALLS", default=10)
+CIRCUIT_FAILURE_RATIO: float = env_float("CIRCUIT_FAILURE_RATIO", default=0.5)
+CIRCUIT_SLOW_CALL_SECONDS: float = env_float("CIRCUIT_SLOW_CALL_SECONDS", default=10.0)
+CIRCUIT_SLOW_CALL_RATIO: float = env_float("CIRCUIT_SLOW_CALL_RATIO", default=0.8)
+CIRCUIT_OPEN_SECONDS: int = env_int("CIRCUIT_OPEN_SECONDS", default=30)
+
+# =========================
+# Upstream Retries
+# =========================
+# Retries after the first attempt (a read makes at most 1 + this many calls).
+UPSTREAM_RETRY_MAX_RETRIES: int = env_int("UPSTREAM_RETRY_MAX_RETRIES", default=2)
+UPSTREAM_RETRY_BASE_SECONDS: float = env_float("UPSTREAM_RETRY_BASE_SECONDS", default=0.1)
+UPSTREAM_RETRY_MAX_SECONDS: float = env_float("UPSTREAM_RETRY_MAX_SECONDS", default=2.0)
+UPSTREAM_RETRY_BUDGET_RATIO: float = env_float("UPSTREAM_RETRY_BUDGET_RATIO", default=0.1)
+UPSTREAM_RETRY_BUDGET_RESERVE: int = env_int("UPSTREAM_RETRY_BUDGET_RESERVE", default=10)
+
+# =========================
+# Upstream Hedged Requests
+# =========================
+UPSTREAM_HEDGING_ENABLED: bool = env_bool("UPSTREAM_HEDGING_ENABLED", default=True)
+UPSTREAM_HEDGE_PERCENTILE: float = env_float("UPSTREAM_HEDGE_PERCENTILE", default=95.0)
+UPSTREAM_HEDGE_MIN_DELAY_SECONDS: float = env_float("UPSTREAM_HEDGE_MIN_DELAY_SECONDS", default=0.05)
+UPSTREAM_HEDGE_MAX_RATIO: float = env_float("UPSTREAM_HEDGE_MAX_RATIO", default=0.05)
+
+# =========================
+# Serialization
+# =========================
+# Use orjson for upstream decoding and response encoding when installed.
+FAST_JSON_ENABLED: bool = env_bool("FAST_JSON_ENABLED", default=True)
+# Stream successful upstream bodies to clients as-is on proxy endpoints.
+PASSTHROUGH_ENABLED: bool = env_bool("PASSTHROUGH_ENABLED", default=True)
+
+# =========================
+# Response Compression
+# =========================
+COMPRESSION_ENABLED: bool = env_bool("COMPRESSION_ENABLED", default=True)
+COMPRESSION_MIN_SIZE: int = env_int("COMPRESSION_MIN_SIZE", default=1024)
+COMPRESSION_GZIP_LEVEL: int = env_int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY: int = env_int("COMPRESSION_BROTLI_QUALITY", default=5)
+
+# =========================
+# Upstream Response Cache
+# =========================
+CACHE_MAX_ENTRIES: int = env_int("CACHE_MAX_ENTRIES", default=2048)
+CACHE_TTL_STATIC_SECONDS: int = env_int("CACHE_TTL_STATIC_SECONDS", default=6 * 60 * 60)
+CACHE_TTL_WINDOW_SECONDS: int = env_int("CACHE_TTL_WINDOW_SECONDS", default=10 * 60)
+CACHE_MAX_STALE_SECONDS: int = env_int("CACHE_MAX_STALE_SECONDS", default=30 * 60)
+CACHE_STALE_IF_ERROR_SECONDS: int = env_int("CACHE_STALE_IF_ERROR_SECONDS", default=24 * 60 * 60)
+HERO_DIRECTORY_TTL_SECONDS: int = env_int("HERO_DIRECTORY_TTL_SECONDS", default=60 * 60)
+
+# =========================
+# Local Data Engines
+# =========================
+# Answer hero list/position filters from a local per-language hero table.
+HERO_TABLE_ENABLED: bool = env_bool("HERO_TABLE_ENABLED", default=True)
+# Sort and page /api/heroes/rank locally from one full table per window/rank/lang.
+RANK_TABLE_ENABLED: bool = env_bool("RANK_TABLE_ENABLED", default=True)
+HERO_TABLE_PAGE_CACHE_SIZE: int = env_int("HERO_TABLE_PAGE_CACHE_SIZE", default=512)
+# Keep counter/synergy matrices for every window/rank warm in a background task
+# (60 full-table fetches per round); otherwise each is built on first request.
+MATCHUP_PRECOMPUTE_ENABLED: bool = env_bool("MATCHUP_PRECOMPUTE_ENABLED", default=False)
+MATCHUP_REFRESH_SECONDS: int = env_int("MATCHUP_REFRESH_SECONDS", default=10 * 60)
+# Append daily hero win/pick/ban rates per rank tier to local files (needs a writable disk).
+HISTORY_ENABLED: bool = env_bool("HISTORY_ENABLED", default=False)
+HISTORY_DIR: str = env_str("HISTORY_DIR", default="data/history")
+HISTORY_SNAPSHOT_SECONDS: int = env_int("HISTORY_SNAPSHOT_SECONDS", default=60 * 60)
+
+# =========================
+# Cache Warmer
+# =========================
+# Re-fetch hero list, rank tables, catalogs and ratings for every language/rank
+# at startup and then every WARMER_INTERVAL_SECONDS.
+WARMER_ENABLED: bool = env_bool("WARMER_ENABLED", default=False)
+WARMER_INTERVAL_SECONDS: int = env_int("WARMER_INTERVAL_SECONDS", default=10 * 60)
+WARMER_CONCURRENCY: int = env_int("WARMER_CONCURRENCY", default=4)
+WARMER_JITTER_SECONDS: float = env_float("WARMER_JITTER_SECONDS", default=0.5)
+# Comma-separated subsets, e.g. ``en,id``; empty means all.
+WARMER_LANGS: str = env_str("WARMER_LANGS", default="")
+WARMER_RANKS: str = env_str("WARMER_RANKS", default="")
+
+# =========================
+# Aggregate Endpoints
+# =========================
+HERO_BATCH_MAX_IDS: int = env_int("HERO_BATCH_MAX_IDS", default=150)
+# Try one upstream query with a ``main_heroid in [...]`` filter before fanning out.
+HERO_BATCH_IN_FILTER_ENABLED: bool = env_bool("HERO_BATCH_IN_FILTER_ENABLED", default=True)
+# How long an endpoint seen ignoring the ``in`` filter is only fanned out.
+HERO_BATCH_IN_FILTER_RETRY_SECONDS: int = env_int("HERO_BATCH_IN_FILTER_RETRY_SECONDS", default=60 * 60)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
@@ -9,9 +10,10 @@ from fastapi.responses import JSONResponse
 ## Removed circular import of AppError
 
 from app.core.hero_limits import validate_mlbb_hero_id
-from app.services.mlbb import resolve_hero_id
+from app.services.mlbb import hero_directory, resolve_hero_id_async
 from app.core.config import LIVECHAT_LINK, CONTACT_FORM_LINK
 from app.core.exceptions import AppError
+from app.utils.deadline import budget_share
 
 
 def timestamp_utc() -> str:
@@ -63,42 +65,87 @@ def safe_error_payload(message: str, status_code: int, details: Any = None) -> d
     return payload
 
 
-def _hero_id_or_404(hero_identifier: str, lang: str) -> int:
+def _hero_id_below_minimum(hero_id: int) -> AppError:
+    return AppError(
+        status_code=422,
+        code="VALIDATION_ERROR",
+        message="Validation failed.",
+        details=[
+            {
+                "type": "greater_than_equal",
+                "loc": ["path", "hero_identifier"],
+                "msg": "Input should be greater than or equal to 1",
+                "input": hero_id,
+                "ctx": {"ge": 1},
+            }
+        ],
+        extra={"code": "VALIDATION_ERROR"},
+    )
+
+
+def _hero_not_found(hero_identifier: str) -> AppError:
+    return AppError(
+        status_code=404,
+        code="RESOURCE_NOT_FOUND",
+        message="Hero not found",
+        details=f"No hero found with name: {hero_identifier}",
+    )
+
+
+async def _hero_id_or_404(hero_identifier: str, lang: str) -> int:
     try:
         numeric_hero_id = int(hero_identifier)
         if numeric_hero_id < 1:
-            raise AppError(
-                status_code=422,
-                code="VALIDATION_ERROR",
-                message="Validation failed.",
-                details=[
-                    {
-                        "type": "greater_than_equal",
-                        "loc": ["path", "hero_identifier"],
-                        "msg": "Input should be greater than or equal to 1",
-                        "input": numeric_hero_id,
-                        "ctx": {"ge": 1},
-                    }
-                ],
-                extra={"code": "VALIDATION_ERROR"},
-            )
-
-        validate_mlbb_hero_id(numeric_hero_id, lang)
+            raise _hero_id_below_minimum(numeric_hero_id)
+
+        # The lookup is the first of two sequential upstream steps; leave the
+        # handler's own fetch at least half of the request budget.
+        with budget_share(0.5):
+            await validate_mlbb_hero_id(numeric_hero_id, lang)
         return numeric_hero_id
     except ValueError:
         pass
 
-    hero_id = resolve_hero_id(hero_identifier, lang)
+    with budget_share(0.5):
+        hero_id = await resolve_hero_id_async(hero_identifier, lang)
     if hero_id <= 0:
+        raise _hero_not_found(hero_identifier)
+    return hero_id
+
+
+def _local_hero_id_or_404(hero_identifier: str, lang: str) -> int:
+    """Like ``_hero_id_or_404`` but without any upstream call.
+
+    Numeric IDs are taken as given; names resolve only from a hero list
+    that is already loaded.
+    """
+    try:
+        numeric_hero_id = int(hero_identifier)
+    except ValueError:
+        pass
+    else:
+        if numeric_hero_id < 1:
+            raise _hero_id_below_minimum(numeric_hero_id)
+        return numeric_hero_id
+
+    hero_id = hero_directory.get_loaded_hero_id(hero_identifier, getattr(lang, "value", lang))
+    if hero_id is None:
         raise AppError(
             status_code=404,
             code="RESOURCE_NOT_FOUND",
             message="Hero not found",
-            details=f"No hero found with name: {hero_identifier}",
+            details=f"Hero names are not loaded yet; use the numeric hero ID instead of: {hero_identifier}",
         )
+    if hero_id <= 0:
+        raise _hero_not_found(hero_identifier)
     return hero_id
 
 
+async def resolve_heroes(hero_identifiers: list[str], lang: str) -> list[int]:
+    """Resolve several identifiers concurrently; raises the first failure."""
+    return list(await asyncio.gather(*(_hero_id_or_404(identifier, lang) for identifier in hero_identifiers)))
+
+
 async def app_error_handler(_: Request, exc: AppError) -> JSONResponse:
     payload = safe_error_payload(exc.message, exc.status_code, exc.details)
     payload.update(exc.extra)
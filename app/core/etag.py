@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Route-name prefixes of the public read endpoints that get validators and
+# shared-cache headers. User endpoints carry per-account data and are excluded.
+CONDITIONAL_ROUTE_PREFIXES: tuple[str, ...] = ("api.mlbb.", "api.academy.", "api.addon.")
+
+# Headers a 304 must repeat from the 200 it stands in for (RFC 9110 15.4.5).
+_NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "date", "etag", "expires", "vary", "x-upstream-stale")
+
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    """Give each content-coding its own strong validator."""
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    # If-None-Match uses the weak comparison (RFC 9110 8.8.3.2).
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+def is_conditional_route(scope: Scope) -> bool:
+    route = scope.get("route")
+    name = getattr(route, "name", None) or ""
+    return scope.get("method") == "GET" and name.startswith(CONDITIONAL_ROUTE_PREFIXES)
+
+
+def not_modified_headers(headers: Headers | MutableHeaders) -> list[tuple[bytes, bytes]]:
+    return [
+        (key.encode("latin-1"), value.encode("latin-1"))
+        for key, value in headers.items()
+        if key in _NOT_MODIFIED_HEADERS
+    ]
+
+
+class ConditionalGetMiddleware:
+    """Strong ETags and ``If-None-Match`` → 304 for public read endpoints.
+
+    Installed outside ``CompressionMiddleware``, so it sees the
+    representation actually sent. The validator is the response's own
+    ``ETag`` (cached raw bodies precompute it from the identity body) or a
+    hash of the body, suffixed with the ``Content-Encoding``; this is the
+    only place validators are finalized and compared.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Message | None = None
+        chunks: list[bytes] = []
+        # "pass": stream through untouched; "drop": 304 sent, discard the body.
+        mode = "buffer"
+
+        async def finish(headers: MutableHeaders, base: str) -> bool:
+            """Set the final ETag; answer 304 and return True on a match."""
+            etag = encoded_etag(base, headers.get("content-encoding"))
+            headers["ETag"] = etag
+            if not etag_matches(if_none_match, etag):
+                return False
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers(headers)})
+            await send({"type": "http.response.body", "body": b""})
+            return True
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, mode
+            if message["type"] == "http.response.start":
+                if message["status"] != 200 or not is_conditional_route(scope):
+                    mode = "pass"
+                    await send(message)
+                    return
+                headers = MutableHeaders(raw=message["headers"])
+                if "etag" in headers:
+                    # Precomputed: no need to buffer the body to hash it.
+                    mode = "drop" if await finish(headers, headers["etag"]) else "pass"
+                    if mode == "pass":
+                        await send(message)
+                    return
+                start = message
+                return
+            if mode == "pass":
+                await send(message)
+                return
+            if mode == "drop" or start is None:
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            if await finish(MutableHeaders(raw=start["headers"]), body_etag(body)):
+                return
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from app.core.compression import choose_encoding, compress, should_compress
+from app.core.config import FAST_JSON_ENABLED
+from app.core.etag import body_etag
+from app.utils.projection import get_bound_fields, project_response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment image
+    orjson = None
+
+_orjson = orjson if FAST_JSON_ENABLED else None
+
+BACKEND = "orjson" if _orjson is not None else "json"
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON bytes; raises ``ValueError`` on invalid input with either backend."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_stdlib(value: Any) -> bytes:
+    # Same output options as Starlette's JSONResponse.
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(value: Any) -> bytes:
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(value, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers past 64 bits and exotic types: let the stdlib decide.
+            pass
+    return _dumps_stdlib(value)
+
+
+# A successful upstream envelope starts with ``{"code":0,`` (the upstream
+# always serializes ``code`` first); anything else takes the parsing path.
+_OK_ENVELOPE = re.compile(rb'\A\s*\{\s*"code"\s*:\s*"?0"?\s*,')
+
+
+def is_ok_envelope(body: bytes) -> bool:
+    """Cheap check that ``body`` is a successful ``code``/``data`` envelope."""
+    return _OK_ENVELOPE.match(body) is not None and body.rstrip().endswith(b"}") and b'"data"' in body
+
+
+class RawJSON:
+    """Upstream JSON body kept as bytes; parsed only if someone asks for it.
+
+    Compressed variants are memoized on the object, so a cached body is
+    compressed at most once per encoding.
+    """
+
+    __slots__ = ("body", "_value", "_parsed", "_encoded", "_etag")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self._value: Any = None
+        self._parsed = False
+        self._encoded: dict[str, bytes] = {}
+        self._etag: str | None = None
+
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = body_etag(self.body)
+        return self._etag
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.body, encoding)
+        return body
+
+    def value(self) -> Any:
+        if not self._parsed:
+            self._value = loads(self.body)
+            self._parsed = True
+        return self._value
+
+
+def parsed(value: Any) -> Any:
+    return value.value() if isinstance(value, RawJSON) else value
+
+
+def passthrough(value: Any) -> Any:
+    """Return raw upstream bytes as-is, skipping ``response_model`` validation.
+
+    Parsed values (upstream errors, stale fallbacks, bodies that failed the
+    envelope check) are returned unchanged and validated as usual. When the
+    client asked for ``fields=``, the body is projected and re-encoded.
+    """
+    fields = get_bound_fields()
+    if fields:
+        return Response(content=dumps(project_response(parsed(value), fields)), media_type="application/json")
+    if isinstance(value, RawJSON):
+        return RawJSONResponse(value)
+    return value
+
+
+def response_value(value: Any) -> Any:
+    """Undo ``passthrough`` for handlers that compose other endpoints' results."""
+    if isinstance(value, RawJSONResponse):
+        return value.raw.value()
+    if isinstance(value, Response):
+        return loads(value.body)
+    return value
+
+
+class RawJSONResponse(Response):
+    """Serves a ``RawJSON`` body, using its precompressed variant if accepted."""
+
+    media_type = "application/json"
+
+    def __init__(self, raw: RawJSON, status_code: int = 200) -> None:
+        super().__init__(content=raw.body, status_code=status_code)
+        self.raw = raw
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        if encoding is not None and should_compress(self.headers, len(self.raw.body)):
+            self.body = self.raw.encoded(encoding)
+            self.headers["Content-Encoding"] = encoding
+            self.headers["Content-Length"] = str(len(self.body))
+            self.headers.add_vary_header("Accept-Encoding")
+        # Identity-body validator; ConditionalGetMiddleware suffixes the coding.
+        self.headers["ETag"] = self.raw.etag()
+        await super().__call__(scope, receive, send)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that renders through orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -3,8 +3,8 @@ from __future__ import annotations
 from time import monotonic
 
 from app.core.exceptions import AppError
-from app.services.academy import fetch_academy_post
-from app.services.mlbb import fetch_mlbb_post
+from app.services.academy import fetch_academy_post_async
+from app.services.mlbb import fetch_mlbb_post_async
 
 _HERO_MAX_CACHE_TTL_SECONDS = 3600
 _hero_max_id_cache: dict[str, tuple[float, int]] = {}
@@ -30,7 +30,7 @@ def _set_cached_max(source: str, lang: str, value: int) -> None:
     _hero_max_id_cache[_cache_key(source, lang)] = (monotonic(), value)
 
 
-def get_academy_hero_max_id(lang: str) -> int:
+async def get_academy_hero_max_id(lang: str) -> int:
     cached_value = _get_cached_max("academy", lang)
     if cached_value is not None:
         return cached_value
@@ -43,7 +43,7 @@ def get_academy_hero_max_id(lang: str) -> int:
         "fields": ["hero_id"],
         "object": [],
     }
-    response = fetch_academy_post("2766683", payload, lang)
+    response = await fetch_academy_post_async("2766683", payload, lang)
 
     total: int | None = None
     if isinstance(response, dict):
@@ -67,7 +67,7 @@ def get_academy_hero_max_id(lang: str) -> int:
     return total
 
 
-def get_mlbb_hero_max_id(lang: str) -> int:
+async def get_mlbb_hero_max_id(lang: str) -> int:
     cached_value = _get_cached_max("mlbb", lang)
     if cached_value is not None:
         return cached_value
@@ -79,7 +79,7 @@ def get_mlbb_hero_max_id(lang: str) -> int:
         "fields": ["hero_id"],
         "object": [],
     }
-    response = fetch_mlbb_post("2756564", payload, lang)
+    response = await fetch_mlbb_post_async("2756564", payload, lang)
 
     max_hero_id: int | None = None
     if isinstance(response, dict):
@@ -109,8 +109,8 @@ def get_mlbb_hero_max_id(lang: str) -> int:
     return max_hero_id
 
 
-def validate_academy_hero_id(hero_id: int, lang: str) -> None:
-    max_hero_id = get_academy_hero_max_id(lang)
+async def validate_academy_hero_id(hero_id: int, lang: str) -> None:
+    max_hero_id = await get_academy_hero_max_id(lang)
     if hero_id > max_hero_id:
         raise AppError(
             status_code=422,
@@ -129,8 +129,8 @@ def validate_academy_hero_id(hero_id: int, lang: str) -> None:
         )
 
 
-def validate_mlbb_hero_id(hero_id: int, lang: str) -> None:
-    max_hero_id = get_mlbb_hero_max_id(lang)
+async def validate_mlbb_hero_id(hero_id: int, lang: str) -> None:
+    max_hero_id = await get_mlbb_hero_max_id(lang)
     if hero_id > max_hero_id:
         raise AppError(
             status_code=422,
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import random
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-import requests
+import httpx
 
+from app.core import fastjson
+from app.core.compression import UPSTREAM_ACCEPT_ENCODING
 from app.core.exceptions import AppError
+from app.core.resilience import UpstreamAttempt, guarded_attempt, upstream_hedges, upstream_retries
+from app.core.transport import upstream_transport
+from app.utils.deadline import deadline_exceeded, has_budget_for, upstream_timeout
 
 
 class MLBBHeaderBuilder:
@@ -56,6 +63,7 @@ class MLBBHeaderBuilder:
             "Origin": "https://www.mobilelegends.com",
             "Referer": "https://www.mobilelegends.com/",
             "User-Agent": MLBBHeaderBuilder.get_random_user_agent(),
+            "Accept-Encoding": UPSTREAM_ACCEPT_ENCODING,
             "DNT": "1",
         }
         if client_ip:
@@ -121,63 +129,187 @@ class MLBBHeaderBuilder:
         return headers
 
 
-def request_json(
-    *,
-    method: str,
-    url: str,
-    headers: dict[str, str],
-    payload: dict[str, Any] | None = None,
-    params: dict[str, Any] | None = None,
-) -> Any:
-    try:
-        if method == "GET":
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-        else:
-            if payload is None:
-                response = requests.post(url, headers=headers, params=params, timeout=30)
-            else:
-                response = requests.post(url, json=payload, headers=headers, params=params, timeout=30)
-    except requests.RequestException as exc:
-        raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data", details=str(exc)) from exc
+def _upstream_failure(exc: Exception, attempt: UpstreamAttempt) -> AppError:
+    if isinstance(exc, httpx.TimeoutException) and not has_budget_for(0):
+        # Our own budget ran out; that is not evidence against the upstream.
+        attempt.ignored = True
+        return deadline_exceeded()
+    return AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data", details=str(exc))
+
+
+def _counts_as_healthy(status_code: int) -> bool:
+    # Client errors say nothing about upstream health; throttling and 5xx do.
+    return status_code < 500 and status_code != 429
 
+
+def _decode_response(response: httpx.Response, non_200_details: str, raw: bool = False) -> Any:
     if response.status_code != 200:
         raise AppError(
             status_code=response.status_code,
             code="UPSTREAM_REQUEST_FAILED",
             message="Failed to fetch data",
-            details="Received non-200 response from upstream",
+            details=non_200_details,
         )
 
+    if raw and fastjson.is_ok_envelope(response.content):
+        return fastjson.RawJSON(response.content)
     try:
-        return response.json()
+        return fastjson.loads(response.content)
     except ValueError as exc:
         raise AppError(status_code=502, code="UPSTREAM_INVALID_RESPONSE", message="Failed to fetch data", details="Invalid JSON from upstream") from exc
 
 
-def request_form(
-    *,
+def _retry_delay(retry: bool, retry_number: int) -> float | None:
+    """Backoff before the next retry, or ``None`` when it must not happen."""
+    if not retry:
+        return None
+    delay = upstream_retries.backoff(retry_number)
+    if not has_budget_for(delay) or not upstream_retries.try_acquire(retry_number):
+        return None
+    return delay
+
+
+async def _send_with_retries_async(send: Callable[[], Awaitable[httpx.Response]], retry: bool) -> httpx.Response:
+    if retry:
+        upstream_retries.record_request()
+    retry_number = 0
+    while True:
+        try:
+            response = await send()
+        except AppError as exc:
+            # Only transport failures are retried; open circuits and shed
+            # calls must fail fast.
+            delay = _retry_delay(retry, retry_number) if exc.code == "UPSTREAM_REQUEST_FAILED" else None
+            if delay is None:
+                raise
+        else:
+            delay = None if _counts_as_healthy(response.status_code) else _retry_delay(retry, retry_number)
+            if delay is None:
+                return response
+        await asyncio.sleep(delay)
+        retry_number += 1
+
+
+async def _send_hedged_async(send: Callable[[], Awaitable[httpx.Response]], upstream: str | None) -> httpx.Response:
+    """Fire a second identical request if the first outlives the hedge delay.
+
+    The first successful response wins and the other request is cancelled.
+    If both fail, the primary's error is raised.
+    """
+    upstream_hedges.record_request()
+    delay = upstream_hedges.delay_for(upstream)
+    primary = asyncio.ensure_future(send())
+    pending: set[asyncio.Future[httpx.Response]] = {primary}
+    try:
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done or not upstream_hedges.try_fire():
+            return await primary
+
+        hedge = asyncio.ensure_future(send())
+        pending.add(hedge)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        upstream_hedges.record_win()
+                    return task.result()
+        return primary.result()
+    finally:
+        # Also runs when the caller is cancelled mid-wait: no request may
+        # outlive it holding a bulkhead slot, nor fail unobserved.
+        for task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
+
+
+async def _send_json_async(
+    method: str,
     url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any] | None,
+    params: dict[str, Any] | None,
+    upstream: str | None,
+) -> httpx.Response:
+    timeout = upstream_timeout()
+    with guarded_attempt(upstream) as attempt:
+        client = upstream_transport.async_client_for(url)
+        try:
+            if method == "GET":
+                response = await client.get(url, headers=headers, params=params, timeout=timeout)
+            else:
+                if payload is None:
+                    response = await client.post(url, headers=headers, params=params, timeout=timeout)
+                else:
+                    response = await client.post(url, json=payload, headers=headers, params=params, timeout=timeout)
+        except httpx.HTTPError as exc:
+            raise _upstream_failure(exc, attempt) from exc
+        attempt.ok = _counts_as_healthy(response.status_code)
+    return response
+
+
+async def _send_form_async(
     method: str,
+    url: str,
     headers: dict[str, str],
     payload: dict[str, Any],
+    upstream: str | None,
+) -> httpx.Response:
+    timeout = upstream_timeout()
+    with guarded_attempt(upstream) as attempt:
+        client = upstream_transport.async_client_for(url)
+        try:
+            if method == "GET":
+                response = await client.get(url, headers=headers, timeout=timeout)
+            else:
+                response = await client.post(url, data=payload, headers=headers, timeout=timeout)
+        except httpx.HTTPError as exc:
+            raise _upstream_failure(exc, attempt) from exc
+        attempt.ok = _counts_as_healthy(response.status_code)
+    return response
+
+
+async def request_json_async(
+    *,
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any] | None = None,
+    params: dict[str, Any] | None = None,
+    upstream: str | None = None,
+    retry: bool = False,
+    hedge: bool = False,
+    raw: bool = False,
 ) -> Any:
-    try:
-        if method == "GET":
-            response = requests.get(url, headers=headers, timeout=30)
-        else:
-            response = requests.post(url, data=payload, headers=headers, timeout=30)
-    except requests.RequestException as exc:
-        raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data", details=str(exc)) from exc
+    """Call an upstream JSON endpoint.
 
-    if response.status_code != 200:
-        raise AppError(
-            status_code=response.status_code,
-            code="UPSTREAM_REQUEST_FAILED",
-            message="Failed to fetch data",
-            details="Unable to fetch data from upstream service",
-        )
+    Pass ``retry=True`` only for idempotent reads; transport failures and
+    5xx/429 responses are then retried within the shared retry budget.
+    ``hedge=True`` is for reads worth a second request when the first is
+    slower than the upstream's p95, and ``raw=True`` returns successful
+    envelopes as unparsed ``RawJSON``.
+    """
 
-    try:
-        return response.json()
-    except ValueError as exc:
-        raise AppError(status_code=502, code="UPSTREAM_INVALID_RESPONSE", message="Failed to fetch data", details="Invalid JSON from upstream") from exc
+    def send() -> Awaitable[httpx.Response]:
+        if hedge:
+            return _send_hedged_async(lambda: _send_json_async(method, url, headers, payload, params, upstream), upstream)
+        return _send_json_async(method, url, headers, payload, params, upstream)
+
+    response = await _send_with_retries_async(send, retry)
+    return _decode_response(response, "Received non-200 response from upstream", raw)
+
+
+async def request_form_async(
+    *,
+    url: str,
+    method: str,
+    headers: dict[str, str],
+    payload: dict[str, Any],
+    upstream: str | None = None,
+) -> Any:
+    response = await _send_form_async(method, url, headers, payload, upstream)
+    return _decode_response(response, "Unable to fetch data from upstream service")
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+
+from app.core.config import (
+    CIRCUIT_FAILURE_RATIO,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_SLOW_CALL_RATIO,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    CIRCUIT_WINDOW_SECONDS,
+    CIRCUIT_WINDOW_SIZE,
+    UPSTREAM_HEDGE_MAX_RATIO,
+    UPSTREAM_HEDGE_MIN_DELAY_SECONDS,
+    UPSTREAM_HEDGE_PERCENTILE,
+    UPSTREAM_HEDGING_ENABLED,
+    UPSTREAM_MAX_CONCURRENCY,
+    UPSTREAM_RETRY_BASE_SECONDS,
+    UPSTREAM_RETRY_BUDGET_RATIO,
+    UPSTREAM_RETRY_BUDGET_RESERVE,
+    UPSTREAM_RETRY_MAX_RETRIES,
+    UPSTREAM_RETRY_MAX_SECONDS,
+)
+from app.core.exceptions import AppError
+
+UPSTREAM_NAMES: tuple[str, ...] = ("academy", "mlbb", "ratings", "user_auth", "user_stats")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    at: float
+    ok: bool
+    latency: float
+
+
+class CircuitBreaker:
+    """Rolling error-rate and latency breaker for one upstream.
+
+    The window keeps the last ``window_size`` calls younger than
+    ``window_seconds``. The circuit opens once at least ``min_calls`` are in
+    the window and either the failure ratio or the slow-call ratio reaches its
+    threshold. After ``open_seconds`` a single probe is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_seconds: float,
+        window_size: int,
+        min_calls: int,
+        failure_ratio: float,
+        slow_call_seconds: float,
+        slow_call_ratio: float,
+        open_seconds: float,
+    ) -> None:
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_ratio = slow_call_ratio
+        self.open_seconds = open_seconds
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._outcomes: deque[_Outcome] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0].at > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _reject(self) -> AppError:
+        self.rejected += 1
+        return AppError(
+            status_code=503,
+            code="UPSTREAM_CIRCUIT_OPEN",
+            message="Failed to fetch data",
+            details=f"Upstream '{self.name}' is temporarily unavailable",
+        )
+
+    def allow(self) -> None:
+        """Raise ``AppError(503)`` if a call to this upstream must fail fast."""
+        now = monotonic()
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return
+            if self.state is CircuitState.OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    raise self._reject()
+                self.state = CircuitState.HALF_OPEN
+            if self._probe_in_flight:
+                raise self._reject()
+            self._probe_in_flight = True
+
+    def record(self, ok: bool, latency: float) -> None:
+        now = monotonic()
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self._probe_in_flight = False
+                if ok and latency < self.slow_call_seconds:
+                    self.state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open(now)
+                return
+
+            self._outcomes.append(_Outcome(now, ok, latency))
+            self._prune(now)
+            if self.state is CircuitState.CLOSED and self._should_open():
+                self._open(now)
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self, now: float) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+
+    def _should_open(self) -> bool:
+        total = len(self._outcomes)
+        if total < self.min_calls:
+            return False
+        failures = sum(1 for outcome in self._outcomes if not outcome.ok)
+        slow = sum(1 for outcome in self._outcomes if outcome.latency >= self.slow_call_seconds)
+        return failures / total >= self.failure_ratio or slow / total >= self.slow_call_ratio
+
+    def successful_calls(self) -> int:
+        with self._lock:
+            self._prune(monotonic())
+            return sum(1 for outcome in self._outcomes if outcome.ok)
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        with self._lock:
+            self._prune(monotonic())
+            latencies = sorted(outcome.latency for outcome in self._outcomes if outcome.ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            self._prune(monotonic())
+            total = len(self._outcomes)
+            failures = sum(1 for outcome in self._outcomes if not outcome.ok)
+            state = self.state.value
+            rejected = self.rejected
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "state": state,
+            "calls": total,
+            "error_rate": round(failures / total, 4) if total else 0.0,
+            "latency_p50": round(p50, 4) if p50 is not None else None,
+            "latency_p95": round(p95, 4) if p95 is not None else None,
+            "rejected": rejected,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.opened_at = 0.0
+            self.rejected = 0
+            self._probe_in_flight = False
+            self._outcomes.clear()
+
+
+class Bulkhead:
+    """Fixed pool of concurrency slots for one upstream; fails fast when full."""
+
+    def __init__(self, name: str, *, max_concurrency: int) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.max_concurrency:
+                self.rejected += 1
+                raise AppError(
+                    status_code=503,
+                    code="UPSTREAM_BUSY",
+                    message="Failed to fetch data",
+                    details=f"Too many concurrent requests to upstream '{self.name}'",
+                )
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "rejected": self.rejected,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self.rejected = 0
+
+
+class UpstreamAttempt:
+    """Outcome holder for one guarded call; callers flip ``ok`` on bad responses.
+
+    ``ignored`` keeps an attempt out of the breaker window entirely, e.g. when
+    it was cut short by the caller's own deadline.
+    """
+
+    def __init__(self) -> None:
+        self.ok = True
+        self.ignored = False
+
+
+class UpstreamGuard:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.breaker = CircuitBreaker(
+            name,
+            window_seconds=CIRCUIT_WINDOW_SECONDS,
+            window_size=CIRCUIT_WINDOW_SIZE,
+            min_calls=CIRCUIT_MIN_CALLS,
+            failure_ratio=CIRCUIT_FAILURE_RATIO,
+            slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+            slow_call_ratio=CIRCUIT_SLOW_CALL_RATIO,
+            open_seconds=CIRCUIT_OPEN_SECONDS,
+        )
+        self.bulkhead = Bulkhead(name, max_concurrency=UPSTREAM_MAX_CONCURRENCY)
+
+    @contextmanager
+    def attempt(self) -> Iterator[UpstreamAttempt]:
+        self.breaker.allow()
+        try:
+            self.bulkhead.acquire()
+        except AppError:
+            self.breaker.release_probe()
+            raise
+
+        attempt = UpstreamAttempt()
+        started = monotonic()
+        try:
+            yield attempt
+        except asyncio.CancelledError:
+            # The caller went away; that says nothing about upstream health.
+            self.breaker.release_probe()
+            raise
+        except BaseException:
+            if attempt.ignored:
+                self.breaker.release_probe()
+            else:
+                self.breaker.record(False, monotonic() - started)
+            raise
+        else:
+            self.breaker.record(attempt.ok, monotonic() - started)
+        finally:
+            self.bulkhead.release()
+
+    def snapshot(self) -> dict[str, object]:
+        breaker = self.breaker.snapshot()
+        bulkhead = self.bulkhead.snapshot()
+        return {
+            **breaker,
+            "in_flight": bulkhead["in_flight"],
+            "max_concurrency": bulkhead["max_concurrency"],
+            "rejected": breaker["rejected"],
+            "shed": bulkhead["rejected"],
+        }
+
+    def reset(self) -> None:
+        self.breaker.reset()
+        self.bulkhead.reset()
+
+
+class RetryPolicy:
+    """Full-jitter exponential backoff bounded by a shared retry budget.
+
+    ``max_retries`` counts retries after the first attempt. Every retryable
+    request deposits ``budget_ratio`` of a token and every retry spends a
+    whole one, so retries add at most that fraction of extra upstream load
+    once the ``budget_reserve`` burst is used up.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int,
+        base_seconds: float,
+        max_seconds: float,
+        budget_ratio: float,
+        budget_reserve: float,
+    ) -> None:
+        self.max_retries = max_retries
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.balance = budget_reserve
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.balance = min(self.budget_reserve, round(self.balance + self.budget_ratio, 6))
+
+    def try_acquire(self, retry_number: int) -> bool:
+        """Claim budget for retry ``retry_number`` (0-based) or refuse it."""
+        if retry_number >= self.max_retries:
+            return False
+        with self._lock:
+            if self.balance < 1:
+                self.exhausted += 1
+                return False
+            self.balance -= 1
+            self.retries += 1
+            return True
+
+    def backoff(self, retry_number: int) -> float:
+        return random.uniform(0, min(self.max_seconds, self.base_seconds * 2**retry_number))
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "budget_exhausted": self.exhausted,
+                "budget_balance": round(self.balance, 2),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.balance = self.budget_reserve
+            self.requests = 0
+            self.retries = 0
+            self.exhausted = 0
+
+
+upstream_retries = RetryPolicy(
+    max_retries=UPSTREAM_RETRY_MAX_RETRIES,
+    base_seconds=UPSTREAM_RETRY_BASE_SECONDS,
+    max_seconds=UPSTREAM_RETRY_MAX_SECONDS,
+    budget_ratio=UPSTREAM_RETRY_BUDGET_RATIO,
+    budget_reserve=UPSTREAM_RETRY_BUDGET_RESERVE,
+)
+
+
+class HedgePolicy:
+    """Decides when a slow upstream read gets a second, identical request.
+
+    The hedge delay is the observed latency percentile of the upstream's
+    successful calls; no hedging happens until the breaker window holds
+    ``min_samples`` of them. Hedges are capped at ``max_ratio`` of requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        percentile: float,
+        min_delay_seconds: float,
+        max_ratio: float,
+        min_samples: int,
+    ) -> None:
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay_seconds = min_delay_seconds
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.capped = 0
+        self._lock = threading.Lock()
+
+    def delay_for(self, upstream: str | None) -> float | None:
+        guard = upstream_guards.get(upstream) if upstream else None
+        if not self.enabled or guard is None or guard.breaker.state is not CircuitState.CLOSED:
+            return None
+        if guard.breaker.successful_calls() < self.min_samples:
+            return None
+        delay = guard.breaker.latency_percentile(self.percentile)
+        if delay is None:
+            return None
+        return max(self.min_delay_seconds, delay)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_fire(self) -> bool:
+        with self._lock:
+            if self.fired + 1 > self.max_ratio * self.requests:
+                self.capped += 1
+                return False
+            self.fired += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.won += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "fired": self.fired,
+                "won": self.won,
+                "capped": self.capped,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.fired = 0
+            self.won = 0
+            self.capped = 0
+
+
+upstream_guards: dict[str, UpstreamGuard] = {name: UpstreamGuard(name) for name in UPSTREAM_NAMES}
+
+upstream_hedges = HedgePolicy(
+    enabled=UPSTREAM_HEDGING_ENABLED,
+    percentile=UPSTREAM_HEDGE_PERCENTILE,
+    min_delay_seconds=UPSTREAM_HEDGE_MIN_DELAY_SECONDS,
+    max_ratio=UPSTREAM_HEDGE_MAX_RATIO,
+    min_samples=CIRCUIT_MIN_CALLS,
+)
+
+
+@contextmanager
+def guarded_attempt(upstream: str | None) -> Iterator[UpstreamAttempt]:
+    guard = upstream_guards.get(upstream) if upstream else None
+    if guard is None:
+        yield UpstreamAttempt()
+        return
+    with guard.attempt() as attempt:
+        yield attempt
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import base64
 import hashlib
+from functools import cache
+from types import MappingProxyType
 
 from cryptography.fernet import Fernet
 
@@ -44,15 +46,15 @@ class BasePathProvider:
 
     @classmethod
     def get_base_path(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY)
+        return resolved_routes()[cls.RONE_DEV_KEY]
 
     @classmethod
     def get_base_path_academy(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY_ACADEMY)
+        return resolved_routes()[cls.RONE_DEV_KEY_ACADEMY]
 
     @classmethod
     def get_base_path_ratings(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY_RATINGS)
+        return resolved_routes()[cls.RONE_DEV_KEY_RATINGS]
 
 
 class BaseUserPathProvider:
@@ -70,12 +72,32 @@ class BaseUserPathProvider:
 
     @classmethod
     def get_base_url_path_auth(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY_AUTH)
+        return resolved_routes()[cls.RONE_DEV_KEY_AUTH]
 
     @classmethod
     def get_base_url_path_data(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY_DATA)
+        return resolved_routes()[cls.RONE_DEV_KEY_DATA]
 
     @classmethod
     def get_base_url_path_stats(cls) -> str:
-        return CryptoManager(SECRET_KEY).decrypt(cls.RONE_DEV_KEY_STATS)
\ No newline at end of file
+        return resolved_routes()[cls.RONE_DEV_KEY_STATS]
+
+
+@cache
+def resolved_routes() -> MappingProxyType[bytes, str]:
+    """Decrypt every upstream route prefix once per process.
+
+    A wrong ``SECRET_KEY`` raises ``InvalidToken`` here; nothing is cached in
+    that case, so every upstream call keeps failing loudly instead of using a
+    partial table.
+    """
+    crypto = CryptoManager(SECRET_KEY)
+    tokens = (
+        BasePathProvider.RONE_DEV_KEY,
+        BasePathProvider.RONE_DEV_KEY_ACADEMY,
+        BasePathProvider.RONE_DEV_KEY_RATINGS,
+        BaseUserPathProvider.RONE_DEV_KEY_AUTH,
+        BaseUserPathProvider.RONE_DEV_KEY_DATA,
+        BaseUserPathProvider.RONE_DEV_KEY_STATS,
+    )
+    return MappingProxyType({token: crypto.decrypt(token) for token in tokens})
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.utils.deadline import SharedDeadline, current_deadline, deadline_exceeded, remaining_budget, under_shared_deadline
+
+
+class _Flight:
+    __slots__ = ("task", "deadline", "waiters", "background")
+
+    def __init__(self, task: asyncio.Task[Any], deadline: SharedDeadline) -> None:
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+        self.background = False
+
+
+class SingleFlight:
+    """Collapse concurrent identical async calls onto one in-flight task.
+
+    The shared task is shielded from its callers, so a disconnecting client
+    cannot cancel the upstream request other callers are waiting on. It is
+    bounded by the latest deadline among its waiters, each of which waits at
+    most its own remaining budget; once the last waiter gives up, the task is
+    cancelled. Background starts are unbounded and run to completion.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _running(self, key: str) -> _Flight | None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task.get_loop() is asyncio.get_running_loop() and not flight.task.done():
+            return flight
+        return None
+
+    def _join(self, key: str, fn: Callable[[], Awaitable[Any]], deadline: float | None) -> _Flight:
+        flight = self._running(key)
+        if flight is not None:
+            flight.deadline.extend(deadline)
+            return flight
+
+        shared = SharedDeadline(deadline)
+        task = asyncio.get_running_loop().create_task(under_shared_deadline(shared, fn))
+        flight = _Flight(task, shared)
+        self._flights[key] = flight
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.leaders += 1
+        return flight
+
+    def start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task[Any]:
+        """Start ``fn`` for ``key`` in the background unless already in flight; do not wait."""
+        flight = self._join(key, fn, None)
+        flight.background = True
+        return flight.task
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise deadline_exceeded()
+        if self._running(key) is not None:
+            self.followers += 1
+        flight = self._join(key, fn, current_deadline())
+        flight.waiters += 1
+        try:
+            if remaining is None:
+                return await asyncio.shield(flight.task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight.task), remaining)
+            except asyncio.TimeoutError:
+                raise deadline_exceeded() from None
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.background:
+                # Nobody is left to use the result: free the slot and connection.
+                flight.task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task[Any]) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every waiter has gone away.
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+    def clear(self) -> None:
+        self._flights.clear()
+        self.leaders = 0
+        self.followers = 0
+
+
+upstream_flights = SingleFlight()
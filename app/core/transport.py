@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import UPSTREAM_KEEPALIVE_SECONDS, UPSTREAM_POOL_SIZE
+
+
+def upstream_host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+@dataclass
+class _PooledAsyncClient:
+    client: httpx.AsyncClient
+    loop: asyncio.AbstractEventLoop
+
+
+class UpstreamTransport:
+    """Keep-alive async HTTP clients pooled per upstream host.
+
+    Clients are created lazily on first use and are bound to the event loop
+    that created them: a client from another loop is replaced and closed on
+    its own loop. httpx expires connections idle for ``keepalive_seconds``.
+    """
+
+    def __init__(self, *, pool_size: int, keepalive_seconds: float) -> None:
+        self.pool_size = pool_size
+        self.keepalive_seconds = keepalive_seconds
+        self._async_clients: dict[str, _PooledAsyncClient] = {}
+        self._lock = threading.Lock()
+
+    def _new_async_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_seconds,
+        )
+        return httpx.AsyncClient(limits=limits)
+
+    def async_client_for(self, url: str) -> httpx.AsyncClient:
+        host = upstream_host(url)
+        loop = asyncio.get_running_loop()
+        retired: _PooledAsyncClient | None = None
+        with self._lock:
+            pooled = self._async_clients.get(host)
+            if pooled is None or pooled.loop is not loop:
+                retired = pooled
+                pooled = _PooledAsyncClient(self._new_async_client(), loop)
+                self._async_clients[host] = pooled
+        if retired is not None:
+            self._retire_async_client(retired)
+        return pooled.client
+
+    @staticmethod
+    def _retire_async_client(pooled: _PooledAsyncClient) -> None:
+        """Close a client replaced because the event loop changed.
+
+        Its connections belong to the old loop, so the close is scheduled
+        there. A closed loop can no longer run it; its sockets are released
+        when that loop's transports are collected.
+        """
+        if pooled.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(pooled.client.aclose(), pooled.loop)
+
+    def async_hosts(self) -> list[str]:
+        with self._lock:
+            return list(self._async_clients)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        for pooled in clients:
+            if pooled.loop is loop:
+                await pooled.client.aclose()
+
+
+upstream_transport = UpstreamTransport(
+    pool_size=UPSTREAM_POOL_SIZE,
+    keepalive_seconds=UPSTREAM_KEEPALIVE_SECONDS,
+)
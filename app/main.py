@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from copy import deepcopy
 from pathlib import Path
 
@@ -14,19 +17,55 @@ from app.core.config import (
     ALTERNATIVE_ENDPOINT_URL,
     API_STATUS_MESSAGES,
     DEBUG,
+    HISTORY_ENABLED,
+    HISTORY_SNAPSHOT_SECONDS,
     IS_AVAILABLE,
+    MATCHUP_PRECOMPUTE_ENABLED,
+    MATCHUP_REFRESH_SECONDS,
+    WARMER_ENABLED,
+    WARMER_INTERVAL_SECONDS,
     PROJECT_VERSION,
 )
 
 from app.api.routers.root import router as root_router
 from app.api.routers.mlbb import router as mlbb_router
+from app.api.routers.aggregate import academy_router as academy_aggregate_router, router as aggregate_router
 from app.api.routers.academy import router as academy_router
+from app.api.routers.history import router as history_router
+from app.api.routers.matchups import router as matchups_router
 from app.api.routers.addon import router as addon_router
 from app.api.routers.user import router as user_router
+from app.api.warmer import cache_warmer
 from app.web.routers.root import router as web_router
 from app.web.routers.blog import router as blog_router
 
+from app.core.compression import CompressionMiddleware
+from app.core.etag import ConditionalGetMiddleware
+from app.core.fastjson import FastJSONResponse
 from app.core.errors import AppError, app_error_handler, safe_error_payload, unhandled_error_handler
+from app.core.transport import upstream_transport
+from app.services.history import history_store
+from app.services.matchups import matchup_matrices
+from app.utils.response_meta import response_meta_middleware
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    background: list[asyncio.Task[None]] = []
+    if MATCHUP_PRECOMPUTE_ENABLED:
+        background.append(asyncio.create_task(matchup_matrices.run_forever(MATCHUP_REFRESH_SECONDS)))
+    if HISTORY_ENABLED:
+        background.append(asyncio.create_task(history_store.run_forever(HISTORY_SNAPSHOT_SECONDS)))
+    if WARMER_ENABLED:
+        background.append(asyncio.create_task(cache_warmer.run_forever(WARMER_INTERVAL_SECONDS)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await upstream_transport.aclose()
+
 
 app = FastAPI(
     debug=DEBUG,
@@ -40,6 +79,7 @@ app = FastAPI(
         "The API is designed with a consistent and RESTful structure, supports flexible hero identifiers using either ID or name, and delivers standardized responses optimized for seamless integration into applications, dashboards, and analytics systems."
     ),
     version=PROJECT_VERSION,
+    default_response_class=FastJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
@@ -74,7 +114,8 @@ app = FastAPI(
             "name": "addon",
             "description": "Utility tools and extra features.",
         },
-    ]
+    ],
+    lifespan=lifespan,
 )
 
 # ==========================================
@@ -86,7 +127,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, OPTIONS, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Upstream-Stale", "ETag"],
 )
+app.middleware("http")(response_meta_middleware)
+app.add_middleware(CompressionMiddleware)
+# Wraps CompressionMiddleware, so ETags are computed for the content-coding actually sent.
+app.add_middleware(ConditionalGetMiddleware)
 
 def _inline_enum_defaults_in_parameters(schema: dict[str, object]) -> None:
     components = schema.get("components", {})
@@ -281,7 +327,11 @@ async def maintenance_mode_guard(request: Request, call_next):
 
 # api routers
 app.include_router(root_router)
+app.include_router(aggregate_router)
+app.include_router(matchups_router)
+app.include_router(history_router)
 app.include_router(mlbb_router)
+app.include_router(academy_aggregate_router)
 app.include_router(academy_router)
 app.include_router(user_router)
 app.include_router(addon_router)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.academy import AcademyCollectionResponse
+from app.schemas.mlbb import MlbbCollectionResponse
+
+
+class AggregateError(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    status: int
+    code: str
+    message: str | None = None
+
+
+class AggregateErrorEntry(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    error: AggregateError
+
+
+class HeroDossierData(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    hero_id: int
+    # ``builds`` comes from the academy, every other section from mlbb.
+    sections: dict[str, AggregateErrorEntry | MlbbCollectionResponse | AcademyCollectionResponse]
+
+
+class HeroDossierResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    code: int
+    message: str | None = None
+    data: HeroDossierData
+
+
+class MlbbHeroBatchData(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    heroes: dict[str, AggregateErrorEntry | MlbbCollectionResponse]
+
+
+class MlbbHeroBatchResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    code: int
+    message: str | None = None
+    data: MlbbHeroBatchData
+
+
+class AcademyHeroBatchData(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    heroes: dict[str, AggregateErrorEntry | AcademyCollectionResponse]
+
+
+class AcademyHeroBatchResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    code: int
+    message: str | None = None
+    data: AcademyHeroBatchData
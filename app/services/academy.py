@@ -2,28 +2,54 @@ from __future__ import annotations
 
 from typing import Any
 
-from app.core.config import RONE_DEV_ACCESS_KEY, RONE_DEV_ACCESS_KEY_V2
-from app.core.http import MLBBHeaderBuilder, request_json
+from app.core.cache import cache_key, cached_fetch_async, ttl_for_endpoint
+from app.core.config import CACHE_TTL_WINDOW_SECONDS, PASSTHROUGH_ENABLED, RONE_DEV_ACCESS_KEY, RONE_DEV_ACCESS_KEY_V2
+from app.core.fastjson import parsed
+from app.core.http import MLBBHeaderBuilder, request_json_async
 from app.core.security import BasePathProvider
 from app.utils.client_ip import get_bound_client_ip
 
 
-def fetch_academy_post(endpoint_id: str, payload: dict[str, Any], lang: str) -> Any:
+def _academy_url(endpoint_id: str) -> str:
     base_path = BasePathProvider.get_base_path_academy()
-    url = f"{RONE_DEV_ACCESS_KEY}{base_path}/{endpoint_id}"
-    headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
-    return request_json(method="POST", url=url, payload=payload, headers=headers)
+    return f"{RONE_DEV_ACCESS_KEY}{base_path}/{endpoint_id}"
 
 
-def fetch_ratings_all(lang: str) -> Any:
+def _ratings_all_url() -> str:
     base_path = BasePathProvider.get_base_path_ratings()
-    url = f"{RONE_DEV_ACCESS_KEY_V2}{base_path}?offset=0"
-    headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
-    return request_json(method="GET", url=url, headers=headers)
+    return f"{RONE_DEV_ACCESS_KEY_V2}{base_path}?offset=0"
 
 
-def fetch_ratings_subject(lang: str, subject: str) -> Any:
+def _ratings_subject_url(subject: str) -> str:
     base_path = BasePathProvider.get_base_path_ratings()
-    url = f"{RONE_DEV_ACCESS_KEY_V2}{base_path}/{subject}"
+    return f"{RONE_DEV_ACCESS_KEY_V2}{base_path}/{subject}"
+
+
+async def fetch_academy_post_async(endpoint_id: str, payload: dict[str, Any], lang: str, raw: bool = False) -> Any:
+    headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
+    value = await cached_fetch_async(
+        cache_key("academy", endpoint_id, payload, lang),
+        ttl_for_endpoint(endpoint_id),
+        lambda: request_json_async(method="POST", url=_academy_url(endpoint_id), payload=payload, headers=headers, upstream="academy", retry=True, hedge=True, raw=PASSTHROUGH_ENABLED),
+    )
+    return value if raw else parsed(value)
+
+
+async def fetch_ratings_all_async(lang: str, raw: bool = False) -> Any:
+    headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
+    value = await cached_fetch_async(
+        cache_key("ratings", "all", None, lang),
+        CACHE_TTL_WINDOW_SECONDS,
+        lambda: request_json_async(method="GET", url=_ratings_all_url(), headers=headers, upstream="ratings", retry=True, raw=PASSTHROUGH_ENABLED),
+    )
+    return value if raw else parsed(value)
+
+
+async def fetch_ratings_subject_async(lang: str, subject: str, raw: bool = False) -> Any:
     headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
-    return request_json(method="GET", url=url, headers=headers)
+    value = await cached_fetch_async(
+        cache_key("ratings", subject, None, lang),
+        CACHE_TTL_WINDOW_SECONDS,
+        lambda: request_json_async(method="GET", url=_ratings_subject_url(subject), headers=headers, upstream="ratings", retry=True, raw=PASSTHROUGH_ENABLED),
+    )
+    return value if raw else parsed(value)
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from typing import Any
 
-from app.core.http import MLBBHeaderBuilder, request_json
+from app.core.http import MLBBHeaderBuilder, request_json_async
 from app.core.security import BaseUserPathProvider
 
 
-def fetch_ip_get(path: str, client_ip: str | None = None) -> Any:
+def _ip_url(path: str) -> str:
     base_path = BaseUserPathProvider.get_base_url_path_auth()
-    url = f"{base_path}/{path}"
+    return f"{base_path}/{path}"
+
+
+async def fetch_ip_get_async(path: str, client_ip: str | None = None) -> Any:
     headers = MLBBHeaderBuilder.get_ip_check_header(client_ip)
-    return request_json(method="GET", url=url, headers=headers, payload=None, params=None)
\ No newline at end of file
+    return await request_json_async(method="GET", url=_ip_url(path), headers=headers, payload=None, params=None, upstream="user_auth")
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import Any
+
+from app.core.config import HERO_BATCH_IN_FILTER_ENABLED, HERO_BATCH_IN_FILTER_RETRY_SECONDS
+from app.core.fastjson import parsed
+
+Fetch = Callable[..., Awaitable[Any]]
+
+# Endpoints seen ignoring the ``in`` operator, with the ``monotonic()`` time
+# until which they are only fanned out.
+_in_filter_ignored: dict[str, float] = {}
+
+
+def _ignores_in_filter(endpoint_id: str) -> bool:
+    until = _in_filter_ignored.get(endpoint_id)
+    if until is None:
+        return False
+    if until <= monotonic():
+        del _in_filter_ignored[endpoint_id]
+        return False
+    return True
+
+
+def _hero_of(record: Any) -> int | None:
+    data = record.get("data") if isinstance(record, dict) else None
+    value = data.get("main_heroid") if isinstance(data, dict) else None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+async def fetch_grouped_by_hero(
+    fetch: Fetch,
+    endpoint_id: str,
+    hero_ids: list[int],
+    filters: list[dict[str, Any]],
+    lang: str,
+    per_hero: int,
+) -> dict[int, Any] | None:
+    """One upstream query with ``main_heroid in hero_ids``, split per hero.
+
+    Each hero gets the envelope its single-hero query would return (first
+    ``per_hero`` records); an upstream error envelope is every hero's answer.
+    Returns ``None`` only when the query cannot be split per hero (the
+    upstream ignored the filter or truncated the page), so the caller fans
+    out instead. Upstream failures raise ``AppError`` as usual.
+    """
+    if not HERO_BATCH_IN_FILTER_ENABLED or _ignores_in_filter(endpoint_id):
+        return None
+
+    wanted = sorted(set(hero_ids))
+    payload = {
+        "pageSize": per_hero * len(wanted),
+        "pageIndex": 1,
+        "filters": [{"field": "main_heroid", "operator": "in", "value": wanted}, *filters],
+        "sorts": [],
+    }
+    value = parsed(await fetch(endpoint_id, payload, lang, raw=True))
+    data = value.get("data") if isinstance(value, dict) else None
+    records = data.get("records") if isinstance(data, dict) else None
+    if not isinstance(records, list) or value.get("code") not in (0, "0"):
+        # The single-hero queries would get the same answer.
+        return {hero_id: value for hero_id in wanted}
+
+    grouped: dict[int, list[Any]] = {hero_id: [] for hero_id in wanted}
+    for record in records:
+        hero_id = _hero_of(record)
+        if hero_id not in grouped:
+            # The filter was not applied; fan out for this endpoint for a while.
+            _in_filter_ignored[endpoint_id] = monotonic() + HERO_BATCH_IN_FILTER_RETRY_SECONDS
+            return None
+        grouped[hero_id].append(record)
+    total = data.get("total")
+    if isinstance(total, int) and total > len(records):
+        # Some heroes' rows did not fit the page.
+        return None
+
+    envelope = {key: item for key, item in value.items() if key != "data"}
+    return {
+        hero_id: {**envelope, "data": {"records": hero_records[:per_hero], "total": len(hero_records)}}
+        for hero_id, hero_records in grouped.items()
+    }
+
+
+def reset_batch_state() -> None:
+    _in_filter_ignored.clear()
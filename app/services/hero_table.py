@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import HERO_TABLE_ENABLED, HERO_TABLE_PAGE_CACHE_SIZE, RANK_TABLE_ENABLED
+from app.core.fastjson import RawJSON, dumps, parsed
+from app.services.academy import fetch_academy_post_async
+from app.services.mlbb import HERO_LIST_FIELDS, fetch_mlbb_post_async, full_list_payload
+from app.utils.projection import select_paths
+
+Fetch = Callable[..., Awaitable[Any]]
+
+_ROLE_FILTER = "<hero.data.sortid>"
+_LANE_FILTER = "<hero.data.roadsort>"
+_MASK_BITS = 32
+
+
+def _is_ok(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("code") in (0, "0") and isinstance(value.get("data"), dict)
+
+
+def _mask(values: list[int] | None) -> int:
+    if values is None:
+        return (1 << _MASK_BITS) - 1
+    mask = 0
+    for value in values:
+        if 0 <= value < _MASK_BITS:
+            mask |= 1 << value
+    return mask
+
+
+def _option_mask(options: Any, id_key: str) -> int:
+    # ``sortid``/``roadsort`` lists hold option records (or "" placeholders).
+    mask = 0
+    if not isinstance(options, list):
+        return mask
+    for option in options:
+        if not isinstance(option, dict):
+            continue
+        value = option.get("data", {}).get(id_key)
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= number < _MASK_BITS:
+            mask |= 1 << number
+    return mask
+
+
+@dataclass(frozen=True)
+class HeroQuery:
+    """The subset of the upstream list query the local table can answer."""
+
+    size: int
+    index: int
+    descending: bool
+    roles: int
+    lanes: int
+    fields: tuple[str, ...]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], available: frozenset[str]) -> HeroQuery | None:
+        """Parse an upstream payload; ``None`` when it asks for anything else."""
+        if set(payload) - {"pageSize", "pageIndex", "filters", "sorts", "fields", "object"} or payload.get("object"):
+            return None
+
+        size, index = payload.get("pageSize"), payload.get("pageIndex", 1)
+        if not isinstance(size, int) or not isinstance(index, int) or size < 1 or index < 1:
+            return None
+
+        sorts = payload.get("sorts")
+        if not isinstance(sorts, list) or len(sorts) != 1:
+            return None
+        sort = sorts[0].get("data", {}) if isinstance(sorts[0], dict) else {}
+        if sort.get("field") != "hero_id" or sort.get("order") not in ("asc", "desc"):
+            return None
+
+        filters: dict[str, list[int]] = {}
+        for item in payload.get("filters") or []:
+            field = item.get("field") if isinstance(item, dict) else None
+            values = item.get("value") if isinstance(item, dict) else None
+            if field not in (_ROLE_FILTER, _LANE_FILTER) or field in filters or item.get("operator") != "hasAnyOf":
+                return None
+            if not isinstance(values, list) or not all(isinstance(value, int) for value in values):
+                return None
+            filters[field] = values
+
+        fields = payload.get("fields")
+        if not isinstance(fields, list) or not fields or not set(fields) <= available:
+            return None
+
+        return cls(
+            size=size,
+            index=index,
+            descending=sort["order"] == "desc",
+            roles=_mask(filters.get(_ROLE_FILTER)),
+            lanes=_mask(filters.get(_LANE_FILTER)),
+            fields=tuple(fields),
+        )
+
+
+class HeroSnapshot:
+    """One language's full hero list held as columns.
+
+    ``hero_ids`` and the role/lane bitmasks are parallel arrays; ``ascending``
+    is the row order by hero ID. Filter results, shaped records and encoded
+    pages are memoized, so repeat queries only slice and look up.
+    ``listed`` holds the field specs the full list was fetched with.
+    """
+
+    def __init__(self, envelope: dict[str, Any], records: list[dict[str, Any]], listed: tuple[str, ...] = ()) -> None:
+        self.envelope = envelope
+        self.records = records
+        self.listed_roots = frozenset(spec.split(".", 1)[0] for spec in listed)
+        self.hero_ids = array("I", (int(record["data"].get("hero_id") or 0) for record in records))
+        self.role_masks = array("I", (_option_mask(self._hero(record).get("sortid"), "sort_id") for record in records))
+        self.lane_masks = array("I", (_option_mask(self._hero(record).get("roadsort"), "road_sort_id") for record in records))
+        self.ascending = tuple(sorted(range(len(records)), key=self.hero_ids.__getitem__))
+        # Without any tagged row the source did not return the option lists.
+        self.has_roles = any(self.role_masks)
+        self.has_lanes = any(self.lane_masks)
+        self.rows = {hero_id: row for row, hero_id in enumerate(self.hero_ids)}
+        self._matches: dict[tuple[int, int], tuple[int, ...]] = {}
+        self._shaped: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        self._pages: dict[HeroQuery, RawJSON] = {}
+
+    @staticmethod
+    def _hero(record: dict[str, Any]) -> dict[str, Any]:
+        hero = record["data"].get("hero")
+        data = hero.get("data") if isinstance(hero, dict) else None
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def build(cls, value: Any, listed: tuple[str, ...] = ()) -> HeroSnapshot | None:
+        """Build from a full upstream list, or ``None`` if it is not one."""
+        if not _is_ok(value):
+            return None
+        records = value["data"].get("records")
+        if not isinstance(records, list) or not all(isinstance(record, dict) and isinstance(record.get("data"), dict) for record in records):
+            return None
+        total = value["data"].get("total")
+        if isinstance(total, int) and total > len(records):
+            # The upstream truncated the list; a partial table would give wrong totals.
+            return None
+        envelope = {key: item for key, item in value.items() if key != "data"}
+        return cls(envelope, records, listed)
+
+    def can_answer(self, query: HeroQuery) -> bool:
+        full = _mask(None)
+        return (query.roles == full or self.has_roles) and (query.lanes == full or self.has_lanes)
+
+    def _matching(self, roles: int, lanes: int) -> tuple[int, ...]:
+        key = (roles, lanes)
+        rows = self._matches.get(key)
+        if rows is None:
+            role_masks, lane_masks = self.role_masks, self.lane_masks
+            rows = self._matches[key] = tuple(row for row in self.ascending if role_masks[row] & roles and lane_masks[row] & lanes)
+        return rows
+
+    def _shape(self, fields: tuple[str, ...]) -> list[dict[str, Any]]:
+        shaped = self._shaped.get(fields)
+        if shaped is None:
+            shaped = self._shaped[fields] = [self._shape_record(record, fields) for record in self.records]
+        return shaped
+
+    def _shape_record(self, record: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+        # Project only what the full list asked for beyond ``fields``; keys the
+        # upstream sends unasked (such as ``relation``) stay, as they would
+        # in its answer to the narrower payload.
+        data = record["data"]
+        paths = tuple(spec for spec in fields if spec.split(".", 1)[0] in data)
+        paths += tuple(key for key in data if key not in self.listed_roots)
+        return {**record, "data": select_paths(data, paths)}
+
+    def page(self, query: HeroQuery) -> RawJSON:
+        body = self._pages.get(query)
+        if body is not None:
+            return body
+
+        rows = self._matching(query.roles, query.lanes)
+        if query.descending:
+            rows = rows[::-1]
+        start = (query.index - 1) * query.size
+        shaped = self._shape(query.fields)
+        value = {
+            **self.envelope,
+            "data": {"records": [shaped[row] for row in rows[start:start + query.size]], "total": len(rows)},
+        }
+
+        if len(self._pages) >= HERO_TABLE_PAGE_CACHE_SIZE:
+            self._pages.clear()
+        body = self._pages[query] = RawJSON(dumps(value))
+        return body
+
+
+class HeroTable:
+    """Local filter/sort/paginate engine over one upstream hero list.
+
+    The full list is fetched through the response cache, so it is refreshed
+    (and served stale on errors) on the cache's schedule; a snapshot is
+    rebuilt only when the cached body changes. Payloads the table cannot
+    interpret go to the upstream unchanged.
+    """
+
+    def __init__(self, *, endpoint_id: str, fields: tuple[str, ...], fetch: Fetch) -> None:
+        self.endpoint_id = endpoint_id
+        self.fields = fields
+        self._available = frozenset(fields)
+        self._fetch = fetch
+        self._snapshots: dict[str, tuple[Any, HeroSnapshot | None]] = {}
+
+    def _full_payload(self) -> dict[str, Any]:
+        return full_list_payload(self.fields)
+
+    def _snapshot(self, lang: str, source: Any) -> HeroSnapshot | None:
+        current = self._snapshots.get(lang)
+        if current is not None and current[0] is source:
+            return current[1]
+        snapshot = HeroSnapshot.build(parsed(source), self.fields)
+        self._snapshots[lang] = (source, snapshot)
+        return snapshot
+
+    async def query(self, payload: dict[str, Any], lang: str) -> Any:
+        query = HeroQuery.from_payload(payload, self._available) if HERO_TABLE_ENABLED else None
+        if query is None:
+            return await self._fetch(self.endpoint_id, payload, lang, raw=True)
+
+        lang = getattr(lang, "value", lang)
+        source = await self._fetch(self.endpoint_id, self._full_payload(), lang, raw=True)
+        snapshot = self._snapshot(lang, source)
+        if snapshot is None and not _is_ok(parsed(source)):
+            # Upstream error envelopes pass through like any other response.
+            return source
+        if snapshot is None or not snapshot.can_answer(query):
+            return await self._fetch(self.endpoint_id, payload, lang, raw=True)
+        return snapshot.page(query)
+
+    async def record(self, hero_id: int, lang: str) -> dict[str, Any] | None:
+        """One hero's full record from the table, or ``None`` if unavailable."""
+        if not HERO_TABLE_ENABLED:
+            return None
+        lang = getattr(lang, "value", lang)
+        source = await self._fetch(self.endpoint_id, self._full_payload(), lang, raw=True)
+        snapshot = self._snapshot(lang, source)
+        row = snapshot.rows.get(hero_id) if snapshot is not None else None
+        return snapshot.records[row] if row is not None else None
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+_RANK_SORT_FIELDS = frozenset({"main_hero_appearance_rate", "main_hero_ban_rate", "main_hero_win_rate"})
+
+
+def _data_path(spec: str) -> str:
+    # Rank field specs sometimes address the record data behind ``data.``.
+    return spec[len("data."):] if spec.startswith("data.") else spec
+
+
+@dataclass(frozen=True)
+class RankQuery:
+    """Sort field/order and paging of an upstream rank query.
+
+    Filters are not interpreted: they select which full table to load.
+    """
+
+    filters: str
+    size: int
+    index: int
+    sort_field: str
+    descending: bool
+    fields: tuple[str, ...]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], available: frozenset[str]) -> RankQuery | None:
+        if set(payload) - {"pageSize", "pageIndex", "filters", "sorts", "fields"}:
+            return None
+
+        size, index = payload.get("pageSize"), payload.get("pageIndex", 1)
+        if not isinstance(size, int) or not isinstance(index, int) or size < 1 or index < 1:
+            return None
+
+        sorts = payload.get("sorts")
+        if not isinstance(sorts, list) or len(sorts) != 1:
+            return None
+        sort = sorts[0].get("data", {}) if isinstance(sorts[0], dict) else {}
+        if sort.get("field") not in _RANK_SORT_FIELDS or sort.get("order") not in ("asc", "desc"):
+            return None
+
+        fields = payload.get("fields")
+        if not isinstance(fields, list) or not fields or not set(fields) <= available:
+            return None
+
+        return cls(
+            filters=json.dumps(payload.get("filters") or [], sort_keys=True, default=str),
+            size=size,
+            index=index,
+            sort_field=sort["field"],
+            descending=sort["order"] == "desc",
+            fields=tuple(fields),
+        )
+
+
+class RankSnapshot:
+    """One (window, filters, language) rank table held as columns.
+
+    Pick, ban and win rates are float arrays parallel to ``main_heroids``;
+    ``sub_heroids`` holds each row's sub-hero IDs. Every sortable field has
+    its ascending row order precomputed (ties broken by hero ID), so a page
+    is a slice of an existing index.
+    """
+
+    def __init__(self, envelope: dict[str, Any], records: list[dict[str, Any]], columns: dict[str, array]) -> None:
+        self.envelope = envelope
+        self.records = records
+        self.main_heroids = array("I", (int(record["data"]["main_heroid"]) for record in records))
+        self.columns = columns
+        self.sub_heroids = tuple(
+            tuple(int(sub["heroid"]) for sub in record["data"].get("sub_hero") or [] if isinstance(sub, dict) and str(sub.get("heroid", "")).isdigit())
+            for record in records
+        )
+        self.ascending = {
+            field: tuple(sorted(range(len(records)), key=lambda row, values=values: (values[row], self.main_heroids[row])))
+            for field, values in columns.items()
+        }
+        self._shaped: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        self._pages: dict[RankQuery, RawJSON] = {}
+
+    @classmethod
+    def build(cls, value: Any) -> RankSnapshot | None:
+        """Build from a full upstream rank table, or ``None`` if it is not one."""
+        if not _is_ok(value):
+            return None
+        records = value["data"].get("records")
+        if not isinstance(records, list) or not all(isinstance(record, dict) and isinstance(record.get("data"), dict) for record in records):
+            return None
+        total = value["data"].get("total")
+        if isinstance(total, int) and total > len(records):
+            return None
+        try:
+            columns = {field: array("d", (float(record["data"][field]) for record in records)) for field in _RANK_SORT_FIELDS}
+            for record in records:
+                int(record["data"]["main_heroid"])
+        except (KeyError, TypeError, ValueError):
+            # Rows without numeric sort keys cannot be ordered like the upstream.
+            return None
+        envelope = {key: item for key, item in value.items() if key != "data"}
+        return cls(envelope, records, columns)
+
+    def _shape(self, fields: tuple[str, ...]) -> list[dict[str, Any]]:
+        shaped = self._shaped.get(fields)
+        if shaped is None:
+            paths = tuple(_data_path(spec) for spec in fields)
+            shaped = self._shaped[fields] = [{**record, "data": select_paths(record["data"], paths)} for record in self.records]
+        return shaped
+
+    def page(self, query: RankQuery) -> RawJSON:
+        body = self._pages.get(query)
+        if body is not None:
+            return body
+
+        rows = self.ascending[query.sort_field]
+        if query.descending:
+            rows = rows[::-1]
+        start = (query.index - 1) * query.size
+        shaped = self._shape(query.fields)
+        value = {
+            **self.envelope,
+            "data": {"records": [shaped[row] for row in rows[start:start + query.size]], "total": len(rows)},
+        }
+
+        if len(self._pages) >= HERO_TABLE_PAGE_CACHE_SIZE:
+            self._pages.clear()
+        body = self._pages[query] = RawJSON(dumps(value))
+        return body
+
+
+class RankTable:
+    """Local sort/paginate engine over the upstream hero rank tables.
+
+    Each (endpoint, filters, language) table is loaded in full once through
+    the response cache; every sort field, order and page is then served
+    from its snapshot.
+    """
+
+    def __init__(self, *, fields: tuple[str, ...], fetch: Fetch) -> None:
+        self.fields = fields
+        self._available = frozenset(fields)
+        self._fetch = fetch
+        self._snapshots: dict[tuple[str, str, str], tuple[Any, RankSnapshot | None]] = {}
+
+    def _full_payload(self, filters: str) -> dict[str, Any]:
+        return {
+            "pageSize": 10000,
+            "pageIndex": 1,
+            "filters": json.loads(filters),
+            "sorts": [{"data": {"field": "main_hero_win_rate", "order": "desc"}, "type": "sequence"}],
+            "fields": list(self.fields),
+        }
+
+    def _snapshot(self, key: tuple[str, str, str], source: Any) -> RankSnapshot | None:
+        current = self._snapshots.get(key)
+        if current is not None and current[0] is source:
+            return current[1]
+        snapshot = RankSnapshot.build(parsed(source))
+        self._snapshots[key] = (source, snapshot)
+        return snapshot
+
+    async def snapshot(self, endpoint_id: str, filters: list[dict[str, Any]], lang: str) -> RankSnapshot | None:
+        """The full table for ``filters``, or ``None`` if it could not be built."""
+        key = (endpoint_id, json.dumps(filters, sort_keys=True, default=str), getattr(lang, "value", lang))
+        source = await self._fetch(endpoint_id, self._full_payload(key[1]), key[2], raw=True)
+        return self._snapshot(key, source)
+
+    async def query(self, endpoint_id: str, payload: dict[str, Any], lang: str) -> Any:
+        query = RankQuery.from_payload(payload, self._available) if RANK_TABLE_ENABLED else None
+        if query is None:
+            return await self._fetch(endpoint_id, payload, lang, raw=True)
+
+        key = (endpoint_id, query.filters, getattr(lang, "value", lang))
+        source = await self._fetch(endpoint_id, self._full_payload(query.filters), key[2], raw=True)
+        snapshot = self._snapshot(key, source)
+        if snapshot is None and not _is_ok(parsed(source)):
+            return source
+        if snapshot is None:
+            return await self._fetch(endpoint_id, payload, lang, raw=True)
+        return snapshot.page(query)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+mlbb_hero_table = HeroTable(
+    endpoint_id="2756564",
+    fields=HERO_LIST_FIELDS,
+    fetch=fetch_mlbb_post_async,
+)
+
+academy_hero_table = HeroTable(
+    endpoint_id="2766683",
+    fields=("head", "hero_id", "hero.data.name", "hero.data.sortid", "hero.data.roadsort"),
+    fetch=fetch_academy_post_async,
+)
+
+rank_table = RankTable(
+    fields=(
+        "main_hero",
+        "main_hero_appearance_rate",
+        "main_hero_ban_rate",
+        "main_hero_channel",
+        "main_hero_win_rate",
+        "main_heroid",
+        "data.sub_hero.hero",
+        "data.sub_hero.hero_channel",
+        "data.sub_hero.increase_win_rate",
+        "data.sub_hero.heroid",
+    ),
+    fetch=fetch_mlbb_post_async,
+)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from app.core.config import HISTORY_DIR
+from app.core.exceptions import AppError
+from app.services.hero_table import RankSnapshot, rank_table
+from app.utils.filters import RANK_MAP
+
+# The 1-day rank table, with the filters /api/heroes/rank uses, so the
+# snapshot shares its cached upstream table.
+DAILY_ENDPOINT = "2756567"
+
+# One segment per day: header, then one column each for hero ID deltas
+# (uint16) and win/pick/ban rates as fixed-point uint32 (1e-6 units).
+_MAGIC = b"HTS1"
+_HEADER = struct.Struct("<4sIH")
+_SCALE = 1_000_000
+_RATE_FIELDS = ("main_hero_win_rate", "main_hero_appearance_rate", "main_hero_ban_rate")
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _column(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+@dataclass(frozen=True)
+class DaySnapshot:
+    """Win, pick and ban rates of every hero on one day, as parallel columns."""
+
+    day: date
+    hero_ids: array
+    win_rates: array
+    pick_rates: array
+    ban_rates: array
+
+    @classmethod
+    def from_rows(cls, day: date, rows: dict[int, tuple[float, float, float]]) -> DaySnapshot:
+        hero_ids = sorted(rows)
+        fixed = [[max(0, min(0xFFFFFFFF, round(rate * _SCALE))) for rate in rows[hero_id]] for hero_id in hero_ids]
+        return cls(
+            day,
+            array("H", hero_ids),
+            *(array("I", (rates[index] for rates in fixed)) for index in range(3)),
+        )
+
+    def encode(self) -> bytes:
+        deltas = array("H", (hero_id - previous for hero_id, previous in zip(self.hero_ids, (0, *self.hero_ids))))
+        return b"".join((
+            _HEADER.pack(_MAGIC, self.day.toordinal(), len(self.hero_ids)),
+            _little_endian(deltas),
+            _little_endian(self.win_rates),
+            _little_endian(self.pick_rates),
+            _little_endian(self.ban_rates),
+        ))
+
+    @classmethod
+    def decode(cls, data: bytes, offset: int) -> tuple[DaySnapshot, int] | None:
+        """The segment at ``offset`` and the offset after it, or ``None`` if incomplete."""
+        if len(data) - offset < _HEADER.size:
+            return None
+        magic, ordinal, count = _HEADER.unpack_from(data, offset)
+        end = offset + _HEADER.size + count * 14
+        if magic != _MAGIC or len(data) < end:
+            return None
+
+        start = offset + _HEADER.size
+        deltas = _column("H", data[start:start + count * 2])
+        hero_ids = array("H")
+        running = 0
+        for delta in deltas:
+            running += delta
+            hero_ids.append(running)
+        start += count * 2
+        rates = [_column("I", data[start + index * count * 4:start + (index + 1) * count * 4]) for index in range(3)]
+        return cls(date.fromordinal(ordinal), hero_ids, *rates), end
+
+    def rates(self, hero_id: int) -> tuple[float, float, float] | None:
+        index = bisect_left(self.hero_ids, hero_id)
+        if index == len(self.hero_ids) or self.hero_ids[index] != hero_id:
+            return None
+        return (
+            self.win_rates[index] / _SCALE,
+            self.pick_rates[index] / _SCALE,
+            self.ban_rates[index] / _SCALE,
+        )
+
+
+def _bucket(day: date, resolution: str) -> date:
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    return day
+
+
+class HistoryStore:
+    """Append-only daily hero rate history, one file per rank tier.
+
+    Each file is a sequence of day segments in date order; a day is
+    written once and never rewritten. A torn trailing segment (from a
+    crash mid-write) is ignored when reading and cut off before the next
+    append. Rates are language independent, so one series serves every
+    ``lang``. Reads may run in worker threads while the event loop appends,
+    so the loaded segments are guarded by a lock.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._loaded: dict[str, tuple[tuple[int, int], list[DaySnapshot], int]] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, rank_code: str) -> Path:
+        return self.root / f"rank-{rank_code}.hts"
+
+    def _load(self, rank_code: str) -> tuple[list[DaySnapshot], int]:
+        with self._lock:
+            return self._load_locked(rank_code)
+
+    def _load_locked(self, rank_code: str) -> tuple[list[DaySnapshot], int]:
+        path = self._path(rank_code)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return [], 0
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._loaded.get(rank_code)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        data = path.read_bytes()
+        days: list[DaySnapshot] = []
+        offset = 0
+        while (decoded := DaySnapshot.decode(data, offset)) is not None:
+            snapshot, offset = decoded
+            days.append(snapshot)
+        self._loaded[rank_code] = (version, days, offset)
+        return days, offset
+
+    def days(self, rank_code: str) -> list[DaySnapshot]:
+        return self._load(rank_code)[0]
+
+    def append(self, rank_code: str, snapshot: DaySnapshot) -> bool:
+        """Write ``snapshot`` unless its day (or a later one) is already stored."""
+        with self._lock:
+            days, valid_end = self._load_locked(rank_code)
+            if days and days[-1].day >= snapshot.day:
+                return False
+            path = self._path(rank_code)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("ab") as handle:
+                handle.truncate(valid_end)
+                handle.write(snapshot.encode())
+            return True
+
+    def series(self, rank_code: str, hero_id: int, start: date, end: date, resolution: str) -> list[dict[str, Any]]:
+        """Mean rates per ``resolution`` bucket for days in ``[start, end]``."""
+        days = self.days(rank_code)
+        ordinals = [snapshot.day.toordinal() for snapshot in days]
+        buckets: dict[date, list[tuple[float, float, float]]] = {}
+        for snapshot in days[bisect_left(ordinals, start.toordinal()):]:
+            if snapshot.day > end:
+                break
+            rates = snapshot.rates(hero_id)
+            if rates is not None:
+                buckets.setdefault(_bucket(snapshot.day, resolution), []).append(rates)
+        return [
+            {
+                "date": bucket.isoformat(),
+                "days": len(values),
+                "win_rate": round(sum(value[0] for value in values) / len(values), 6),
+                "pick_rate": round(sum(value[1] for value in values) / len(values), 6),
+                "ban_rate": round(sum(value[2] for value in values) / len(values), 6),
+            }
+            for bucket, values in buckets.items()
+        ]
+
+    @staticmethod
+    def _rows(snapshot: RankSnapshot) -> dict[int, tuple[float, float, float]]:
+        columns = [snapshot.columns[field] for field in _RATE_FIELDS]
+        return {
+            hero_id: (columns[0][row], columns[1][row], columns[2][row])
+            for row, hero_id in enumerate(snapshot.main_heroids)
+            if 0 < hero_id <= 0xFFFF
+        }
+
+    async def capture(self, rank_codes: Iterable[str] | None = None, today: date | None = None) -> int:
+        """Snapshot the 1-day rank table per tier; returns how many days were written.
+
+        The 1-day window describes the previous (UTC) day, so it is stored
+        under that date.
+        """
+        day = (today or datetime.now(timezone.utc).date()) - timedelta(days=1)
+        written = 0
+        for rank_code in rank_codes or RANK_MAP.values():
+            days = self.days(rank_code)
+            if days and days[-1].day >= day:
+                continue
+            filters = [
+                {"field": "bigrank", "operator": "eq", "value": rank_code},
+                {"field": "match_type", "operator": "eq", "value": "0"},
+            ]
+            try:
+                snapshot = await rank_table.snapshot(DAILY_ENDPOINT, filters, "en")
+            except AppError:
+                continue
+            if snapshot is not None and self.append(rank_code, DaySnapshot.from_rows(day, self._rows(snapshot))):
+                written += 1
+        return written
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.capture()
+            except Exception:
+                # Missing a round only delays the day's snapshot.
+                pass
+            await asyncio.sleep(interval_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded.clear()
+
+
+history_store = HistoryStore(Path(HISTORY_DIR))
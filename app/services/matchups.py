@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+from array import array
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from app.core.exceptions import AppError
+from app.core.fastjson import parsed
+from app.services.mlbb import fetch_mlbb_post_async
+from app.utils.filters import RANK_MAP
+
+Fetch = Callable[..., Awaitable[Any]]
+
+# Rank statistics table per past-days window (same tables as /api/heroes/rank).
+WINDOW_ENDPOINTS: dict[str, str] = {"1": "2756567", "3": "2756568", "7": "2756569", "15": "2756565", "30": "2756570"}
+
+# ``match_type`` of the upstream rows: ``sub_hero`` lists counters of the
+# main hero (0) or teammates that raise its win rate (1).
+COUNTERS = "0"
+SYNERGIES = "1"
+
+_SUB_HERO_LISTS = ("sub_hero", "sub_hero_last")
+
+# Hero IDs are small and dense; anything past this is not a hero row.
+_MAX_HERO_ID = 1024
+
+
+def _hero_id(value: Any) -> int | None:
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, int) and 0 < value <= _MAX_HERO_ID:
+        return value
+    return None
+
+
+class MatchupMatrix:
+    """Dense N×N ``increase_win_rate`` matrix (float32) indexed by hero ID.
+
+    ``values[row * size + column]`` is how much hero ``column`` changes its
+    win rate against (counters) or alongside (synergies) hero ``row``.
+    Pairs the upstream does not list are 0. ``win_rates`` holds each main
+    hero's own win rate (0 when the table has no row for it).
+    """
+
+    __slots__ = ("size", "values", "heroes", "win_rates")
+
+    def __init__(self, size: int, values: array, heroes: tuple[int, ...], win_rates: array) -> None:
+        self.size = size
+        self.values = values
+        self.heroes = heroes
+        self.win_rates = win_rates
+
+    @classmethod
+    def build(cls, value: Any) -> MatchupMatrix | None:
+        if not isinstance(value, dict) or value.get("code") not in (0, "0") or not isinstance(value.get("data"), dict):
+            return None
+        records = value["data"].get("records")
+        if not isinstance(records, list):
+            return None
+
+        pairs: list[tuple[int, int, float]] = []
+        heroes: set[int] = set()
+        own_rates: dict[int, float] = {}
+        for record in records:
+            data = record.get("data") if isinstance(record, dict) else None
+            row = _hero_id(data.get("main_heroid")) if isinstance(data, dict) else None
+            if row is None:
+                continue
+            heroes.add(row)
+            try:
+                own_rates[row] = float(data["main_hero_win_rate"])
+            except (KeyError, TypeError, ValueError):
+                pass
+            for key in _SUB_HERO_LISTS:
+                for sub in data.get(key) or []:
+                    column = _hero_id(sub.get("heroid")) if isinstance(sub, dict) else None
+                    try:
+                        rate = float(sub["increase_win_rate"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if column is not None:
+                        pairs.append((row, column, rate))
+                        heroes.add(column)
+        if not heroes:
+            return None
+
+        size = max(heroes) + 1
+        values = array("f", bytes(4 * size * size))
+        for row, column, rate in pairs:
+            values[row * size + column] = rate
+        win_rates = array("f", bytes(4 * size))
+        for row, rate in own_rates.items():
+            win_rates[row] = rate
+        return cls(size, values, tuple(sorted(heroes)), win_rates)
+
+    def row(self, hero_id: int) -> array:
+        if not 0 < hero_id < self.size:
+            return array("f", bytes(4 * self.size))
+        return self.values[hero_id * self.size:(hero_id + 1) * self.size]
+
+    def column_sums(self, rows: Iterable[int], size: int | None = None) -> list[float]:
+        """Element-wise sum of the given rows, padded with 0 to ``size`` columns."""
+        size = max(size or 0, self.size)
+        selected = [self.row(hero_id) for hero_id in rows]
+        sums = [sum(column) for column in zip(*selected)] if selected else [0.0] * self.size
+        return sums + [0.0] * (size - self.size)
+
+    def top(self, rows: list[int], *, exclude: Iterable[int], limit: int) -> list[dict[str, Any]]:
+        """Best heroes by summed rate against/alongside ``rows``, with the per-row breakdown."""
+        totals = self.column_sums(rows)
+        excluded = set(exclude) | set(rows)
+        candidates = [hero_id for hero_id in self.heroes if hero_id not in excluded]
+        candidates.sort(key=lambda hero_id: (-totals[hero_id], hero_id))
+        size, values = self.size, self.values
+        return [
+            {
+                "heroid": hero_id,
+                "score": round(totals[hero_id], 6),
+                "breakdown": {str(row): round(values[row * size + hero_id], 6) if 0 < row < size else 0.0 for row in rows},
+            }
+            for hero_id in candidates[:limit]
+        ]
+
+
+class MatchupMatrices:
+    """Counter and synergy matrices per (kind, days, rank).
+
+    Each matrix is built from one full upstream rank table fetched through
+    the response cache, and rebuilt only when that cached body changes.
+    ``run_forever`` can keep every combination warm in the background;
+    otherwise each matrix is built on its first request.
+    Matrices are keyed by hero ID, so one language serves all.
+    """
+
+    def __init__(self, *, fetch: Fetch, lang: str = "en") -> None:
+        self._fetch = fetch
+        self.lang = lang
+        self._built: dict[tuple[str, str, str], tuple[Any, MatchupMatrix | None]] = {}
+
+    @staticmethod
+    def _payload(kind: str, rank_code: str) -> dict[str, Any]:
+        return {
+            "pageSize": 10000,
+            "pageIndex": 1,
+            "filters": [
+                {"field": "match_type", "operator": "eq", "value": kind},
+                {"field": "bigrank", "operator": "eq", "value": rank_code},
+            ],
+            "sorts": [],
+        }
+
+    async def matrix(self, kind: str, days: str, rank_code: str) -> MatchupMatrix:
+        key = (kind, days, rank_code)
+        source = await self._fetch(WINDOW_ENDPOINTS[days], self._payload(kind, rank_code), self.lang, raw=True)
+        current = self._built.get(key)
+        if current is None or current[0] is not source:
+            current = self._built[key] = (source, MatchupMatrix.build(parsed(source)))
+        if current[1] is None:
+            raise AppError(
+                status_code=502,
+                code="UPSTREAM_REQUEST_FAILED",
+                message="Failed to fetch data",
+                details="Upstream matchup table was empty or malformed.",
+            )
+        return current[1]
+
+    async def refresh_all(self) -> int:
+        """Build every (kind, days, rank) matrix once; returns how many succeeded."""
+        built = 0
+        for kind in (COUNTERS, SYNERGIES):
+            for days in WINDOW_ENDPOINTS:
+                for rank_code in RANK_MAP.values():
+                    try:
+                        await self.matrix(kind, days, rank_code)
+                    except AppError:
+                        continue
+                    built += 1
+        return built
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.refresh_all()
+            except Exception:
+                # A failed round leaves the previous matrices in place.
+                pass
+            await asyncio.sleep(interval_seconds)
+
+    async def recommend(
+        self,
+        *,
+        allies: list[int],
+        enemies: list[int],
+        bans: list[int],
+        days: str,
+        rank_code: str,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Rank every hero still available for a draft.
+
+        One pass over all heroes adds, per candidate, its summed counter
+        rate against ``enemies``, its summed synergy rate with ``allies``
+        and its own win rate above 50%. All three are win rate deltas, so
+        they are added unweighted.
+        """
+        counters, synergies = await asyncio.gather(
+            self.matrix(COUNTERS, days, rank_code),
+            self.matrix(SYNERGIES, days, rank_code),
+        )
+        size = max(counters.size, synergies.size)
+        counter_totals = counters.column_sums(enemies, size)
+        synergy_totals = synergies.column_sums(allies, size)
+        base = list(counters.win_rates) + [0.0] * (size - counters.size)
+        scores = [
+            counter + synergy + (rate - 0.5 if rate else 0.0)
+            for counter, synergy, rate in zip(counter_totals, synergy_totals, base)
+        ]
+
+        taken = set(allies) | set(enemies) | set(bans)
+        candidates = sorted(
+            (hero_id for hero_id in set(counters.heroes) | set(synergies.heroes) if hero_id not in taken),
+            key=lambda hero_id: (-scores[hero_id], hero_id),
+        )
+        return [
+            {
+                "heroid": hero_id,
+                "score": round(scores[hero_id], 6),
+                "counter": round(counter_totals[hero_id], 6),
+                "synergy": round(synergy_totals[hero_id], 6),
+                "win_rate": round(base[hero_id], 6),
+            }
+            for hero_id in candidates[:limit]
+        ]
+
+    def stats(self) -> dict[str, int]:
+        return {"matrices": sum(1 for _, matrix in self._built.values() if matrix is not None)}
+
+    def clear(self) -> None:
+        self._built.clear()
+
+
+matchup_matrices = MatchupMatrices(fetch=fetch_mlbb_post_async)
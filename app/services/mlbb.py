@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import re
+from time import monotonic
 from typing import Any
 
-from app.core.config import RONE_DEV_ACCESS_KEY
-from app.core.http import MLBBHeaderBuilder, request_json
+from app.core.cache import cache_key, cached_fetch_async, ttl_for_endpoint, upstream_cache
+from app.core.config import HERO_DIRECTORY_TTL_SECONDS, PASSTHROUGH_ENABLED, RONE_DEV_ACCESS_KEY
+from app.core.exceptions import AppError
+from app.core.fastjson import parsed
+from app.core.http import MLBBHeaderBuilder, request_json_async
 from app.core.security import BasePathProvider
+from app.core.singleflight import upstream_flights
 from app.utils.client_ip import get_bound_client_ip
 
 
@@ -13,56 +18,134 @@ def normalize_hero_name(name: str) -> str:
     return re.sub(r"[^a-zA-Z0-9]", "", name.lower())
 
 
-def _hero_list_payload() -> dict[str, Any]:
+# Fields of the full mlbb hero list. The local hero table loads the same
+# list, so name lookups share its cached upstream response.
+HERO_LIST_FIELDS: tuple[str, ...] = (
+    "id",
+    "hero_id",
+    "hero.data.head",
+    "hero.data.name",
+    "hero.data.smallmap",
+    "hero.data.sortid",
+    "hero.data.roadsort",
+)
+
+
+def full_list_payload(fields: tuple[str, ...]) -> dict[str, Any]:
+    """Payload for every hero in one page, ascending by hero ID."""
     return {
         "pageSize": 10000,
-        "sorts": [
-            {
-                "data": {
-                    "field": "hero_id",
-                    "order": "desc",
-                },
-                "type": "sequence",
-            }
-        ],
         "pageIndex": 1,
-        "fields": [
-            "hero_id",
-            "hero.data.head",
-            "hero.data.name",
-            "hero.data.smallmap",
-        ],
+        "filters": [],
+        "sorts": [{"data": {"field": "hero_id", "order": "asc"}, "type": "sequence"}],
+        "fields": list(fields),
+        "object": [],
     }
 
 
-def get_hero_id_by_name(hero_name: str, lang: str = "en") -> int:
-    base_path = BasePathProvider.get_base_path()
-    url = f"{RONE_DEV_ACCESS_KEY}{base_path}/2756564"
-    data = request_json(
-        method="POST",
-        url=url,
-        payload=_hero_list_payload(),
-        headers=MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip()),
-    )
-    search_name = normalize_hero_name(hero_name)
+class HeroDirectory:
+    """Per-language map of normalized hero names to hero IDs.
+
+    Each language is built once from the full hero list, read through the
+    response cache. Once ``ttl_seconds`` have passed the current map keeps
+    answering while a single background task reloads it. A list that yields
+    no heroes (an error envelope, an empty page) is never stored.
+    """
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._indexes: dict[str, tuple[float, dict[str, int]]] = {}
+
+    @staticmethod
+    def build_index(data: Any) -> dict[str, int]:
+        index: dict[str, int] = {}
+        body = data.get("data") if isinstance(data, dict) else None
+        records = body.get("records") if isinstance(body, dict) else None
+        for record in records if isinstance(records, list) else []:
+            record_data = record.get("data", {})
+            hero_data = record_data.get("hero", {}).get("data", {})
+            normalized_name = normalize_hero_name(hero_data.get("name", ""))
+            hero_id = int(record_data.get("hero_id", 0) or 0)
+            if normalized_name and hero_id:
+                index.setdefault(normalized_name, hero_id)
+        return index
+
+    def _is_expired(self, loaded_at: float) -> bool:
+        return monotonic() - loaded_at >= self.ttl_seconds
+
+    def _store(self, lang: str, data: Any) -> dict[str, int]:
+        index = self.build_index(data) if isinstance(data, dict) and data.get("code") in (0, "0") else {}
+        if not index:
+            raise AppError(
+                status_code=502,
+                code="UPSTREAM_REQUEST_FAILED",
+                message="Failed to fetch data",
+                details="Unable to build the hero name index from mlbb hero list source.",
+            )
+        self._indexes[lang] = (monotonic(), index)
+        return index
+
+    async def _load(self, lang: str) -> dict[str, int]:
+        return self._store(lang, await fetch_mlbb_post_async("2756564", full_list_payload(HERO_LIST_FIELDS), lang))
 
-    for record in data.get("data", {}).get("records", []):
-        hero_data = record.get("data", {}).get("hero", {}).get("data", {})
-        normalized_actual_name = normalize_hero_name(hero_data.get("name", ""))
-        if normalized_actual_name == search_name:
-            return int(record.get("data", {}).get("hero_id", 0) or 0)
-    return 0
+    async def get_hero_id(self, hero_name: str, lang: str) -> int:
+        flight_key = f"hero-directory:{lang}"
+        cached = self._indexes.get(lang)
+        if cached is None:
+            index = await upstream_flights.do(flight_key, lambda: self._load(lang))
+        else:
+            loaded_at, index = cached
+            if self._is_expired(loaded_at):
+                # Keep answering from the current index while it reloads.
+                upstream_flights.start(flight_key, lambda: self._load(lang))
+        return index.get(normalize_hero_name(hero_name), 0)
 
+    def get_loaded_hero_id(self, hero_name: str, lang: str) -> int | None:
+        """Resolve from local data only: the current index, else the cached hero list.
 
-def resolve_hero_id(hero_identifier: str, lang: str) -> int:
+        Never calls the upstream; ``None`` when neither is loaded for ``lang``.
+        """
+        cached = self._indexes.get(lang)
+        if cached is not None:
+            index = cached[1]
+        else:
+            found = upstream_cache.lookup(cache_key("mlbb", "2756564", full_list_payload(HERO_LIST_FIELDS), lang))
+            if found is None:
+                return None
+            try:
+                index = self._store(lang, parsed(found[0]))
+            except AppError:
+                return None
+        return index.get(normalize_hero_name(hero_name), 0)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+hero_directory = HeroDirectory(ttl_seconds=HERO_DIRECTORY_TTL_SECONDS)
+
+
+async def get_hero_id_by_name_async(hero_name: str, lang: str = "en") -> int:
+    return await hero_directory.get_hero_id(hero_name, getattr(lang, "value", lang))
+
+
+async def resolve_hero_id_async(hero_identifier: str, lang: str) -> int:
     try:
         return int(hero_identifier)
     except ValueError:
-        return get_hero_id_by_name(hero_identifier, lang)
+        return await get_hero_id_by_name_async(hero_identifier, lang)
 
 
-def fetch_mlbb_post(endpoint_id: str, payload: dict[str, Any], lang: str) -> Any:
+def _mlbb_url(endpoint_id: str) -> str:
     base_path = BasePathProvider.get_base_path()
-    url = f"{RONE_DEV_ACCESS_KEY}{base_path}/{endpoint_id}"
+    return f"{RONE_DEV_ACCESS_KEY}{base_path}/{endpoint_id}"
+
+
+async def fetch_mlbb_post_async(endpoint_id: str, payload: dict[str, Any], lang: str, raw: bool = False) -> Any:
     headers = MLBBHeaderBuilder.get_academy_mlbb_header(lang, client_ip=get_bound_client_ip())
-    return request_json(method="POST", url=url, payload=payload, headers=headers)
+    value = await cached_fetch_async(
+        cache_key("mlbb", endpoint_id, payload, lang),
+        ttl_for_endpoint(endpoint_id),
+        lambda: request_json_async(method="POST", url=_mlbb_url(endpoint_id), payload=payload, headers=headers, upstream="mlbb", retry=True, hedge=True, raw=PASSTHROUGH_ENABLED),
+    )
+    return value if raw else parsed(value)
@@ -2,22 +2,27 @@ from __future__ import annotations
 
 from typing import Any
 
-from app.core.http import request_form, request_json
+from app.core.http import request_form_async, request_json_async
 from app.core.security import BaseUserPathProvider
 
 
-def fetch_user_post(path: str, headers: dict, payload: dict[str, Any]) -> Any:
+def _auth_url(path: str) -> str:
     base_path = BaseUserPathProvider.get_base_url_path_auth()
-    url = f"{base_path}/{path}"
-    return request_form(method="POST", url=url, headers=headers, payload=payload)
+    return f"{base_path}/{path}"
 
-def fetch_user_actgateway(path: str, headers: dict, params: dict[str, Any]) -> Any:
+
+def _stats_url(path: str) -> str:
     base_path = BaseUserPathProvider.get_base_url_path_stats()
-    url = f"{base_path}/{path}"
-    return request_json(method="GET", url=url, headers=headers, params=params)
+    return f"{base_path}/{path}"
 
 
-def fetch_user_actgateway_post(path: str, headers: dict, params: dict[str, Any]) -> Any:
-    base_path = BaseUserPathProvider.get_base_url_path_stats()
-    url = f"{base_path}/{path}"
-    return request_json(method="POST", url=url, headers=headers, params=params)
+async def fetch_user_post_async(path: str, headers: dict, payload: dict[str, Any]) -> Any:
+    return await request_form_async(method="POST", url=_auth_url(path), headers=headers, payload=payload, upstream="user_auth")
+
+
+async def fetch_user_actgateway_async(path: str, headers: dict, params: dict[str, Any]) -> Any:
+    return await request_json_async(method="GET", url=_stats_url(path), headers=headers, params=params, upstream="user_stats", retry=True)
+
+
+async def fetch_user_actgateway_post_async(path: str, headers: dict, params: dict[str, Any]) -> Any:
+    return await request_json_async(method="POST", url=_stats_url(path), headers=headers, params=params, upstream="user_stats")
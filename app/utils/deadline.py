@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any
+
+from fastapi import Request
+
+from app.core.config import REQUEST_DEADLINE_SECONDS, UPSTREAM_TIMEOUT_SECONDS
+from app.core.exceptions import AppError
+
+
+class SharedDeadline:
+    """Deadline of work that several callers wait on: the latest of theirs.
+
+    ``None`` means at least one caller has no deadline, so neither does the work.
+    """
+
+    def __init__(self, at: float | None) -> None:
+        self.at = at
+
+    def extend(self, at: float | None) -> None:
+        if self.at is not None:
+            self.at = None if at is None else max(self.at, at)
+
+
+# Absolute ``monotonic()`` time by which the current request must be answered.
+_deadline_ctx: ContextVar[float | SharedDeadline | None] = ContextVar("deadline", default=None)
+
+DEADLINE_HEADER = "x-request-timeout"
+
+
+def _requested_budget(request: Request) -> float:
+    raw_value = request.headers.get(DEADLINE_HEADER)
+    if raw_value:
+        try:
+            value = float(raw_value)
+        except ValueError:
+            value = 0.0
+        # Callers may only shorten the budget, never extend it.
+        if value > 0:
+            return min(value, REQUEST_DEADLINE_SECONDS)
+    return REQUEST_DEADLINE_SECONDS
+
+
+async def bind_deadline(request: Request) -> AsyncGenerator[None, None]:
+    token = _deadline_ctx.set(monotonic() + _requested_budget(request))
+    try:
+        yield
+    finally:
+        _deadline_ctx.reset(token)
+
+
+def current_deadline() -> float | None:
+    deadline = _deadline_ctx.get()
+    if isinstance(deadline, SharedDeadline):
+        return deadline.at
+    return deadline
+
+
+def remaining_budget() -> float | None:
+    deadline = current_deadline()
+    if deadline is None:
+        return None
+    return deadline - monotonic()
+
+
+def deadline_exceeded() -> AppError:
+    return AppError(
+        status_code=504,
+        code="UPSTREAM_DEADLINE_EXCEEDED",
+        message="Failed to fetch data",
+        details="The request deadline expired before upstream answered",
+    )
+
+
+def upstream_timeout() -> float:
+    """Timeout for the next upstream call: the remaining budget, capped."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return UPSTREAM_TIMEOUT_SECONDS
+    if remaining <= 0:
+        raise deadline_exceeded()
+    return min(remaining, UPSTREAM_TIMEOUT_SECONDS)
+
+
+def has_budget_for(seconds: float) -> bool:
+    remaining = remaining_budget()
+    return remaining is None or remaining > seconds
+
+
+@contextmanager
+def budget_share(fraction: float) -> Iterator[None]:
+    """Give the enclosed sequential step only ``fraction`` of what is left.
+
+    Aggregate handlers use this so an early step cannot starve later ones.
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        yield
+        return
+    token = _deadline_ctx.set(monotonic() + max(remaining, 0) * fraction)
+    try:
+        yield
+    finally:
+        _deadline_ctx.reset(token)
+
+
+async def under_shared_deadline(deadline: SharedDeadline, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``fn`` bounded by ``deadline``, which may move while it runs."""
+    token = _deadline_ctx.set(deadline)
+    try:
+        return await fn()
+    finally:
+        _deadline_ctx.reset(token)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.errors import to_error_code, to_error_message
+from app.core.exceptions import AppError
+from app.utils.deadline import deadline_exceeded, remaining_budget
+
+K = TypeVar("K")
+
+
+def section_error(exc: Exception) -> dict[str, Any]:
+    """Error entry for one failed part of an aggregate response."""
+    if isinstance(exc, AppError):
+        status_code, code, message = exc.status_code, exc.code, exc.message
+    elif isinstance(exc, HTTPException):
+        status_code, code, message = exc.status_code, to_error_code(exc.status_code, ""), str(exc.detail)
+    else:
+        status_code, code, message = 500, "INTERNAL_SERVER_ERROR", ""
+    return {"error": {"status": status_code, "code": code, "message": to_error_message(status_code, message)}}
+
+
+async def fan_out(calls: Mapping[K, Callable[[], Awaitable[Any]]]) -> dict[K, Any]:
+    """Run ``calls`` concurrently under the request's shared deadline.
+
+    Each result is the call's value or a ``section_error`` entry, so one
+    failing or late call never fails the others.
+    """
+    remaining = remaining_budget()
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            if remaining is None:
+                return await call()
+            # Upstream calls already honour the deadline; this also bounds
+            # time spent waiting on another request's in-flight fetch.
+            return await asyncio.wait_for(call(), timeout=max(remaining, 0))
+        except asyncio.TimeoutError:
+            return section_error(deadline_exceeded())
+        except Exception as exc:
+            return section_error(exc)
+
+    results = await asyncio.gather(*(run(call) for call in calls.values()))
+    return dict(zip(calls, results))
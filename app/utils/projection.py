@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Query
+
+_fields_ctx: ContextVar[tuple[str, ...] | None] = ContextVar("fields", default=None)
+
+_FIELD_PATH = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+# ``None`` marks a path that selects the whole subtree below it.
+_PathTree = dict[str, "_PathTree | None"]
+
+
+def parse_fields(raw: str | None) -> tuple[str, ...] | None:
+    """Parse ``a,b.c`` into dotted paths. Raises HTTPException on bad paths."""
+    if raw is None:
+        return None
+    paths = tuple(part.strip() for part in raw.split(",") if part.strip())
+    if not paths:
+        return None
+    invalid = [path for path in paths if not _FIELD_PATH.match(path)]
+    if invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid fields: {', '.join(invalid)}. Use comma-separated dotted paths such as main_heroid,main_hero.data.name",
+        )
+    return paths
+
+
+async def bind_fields(
+    fields: Annotated[
+        str | None,
+        Query(
+            title="Fields",
+            description=(
+                "Comma-separated dotted paths to keep in each record's `data` object, "
+                "for example `main_heroid,main_hero.data.name,main_hero_win_rate`. "
+                "Omit to receive every field."
+            ),
+        ),
+    ] = None,
+) -> AsyncGenerator[None, None]:
+    token = _fields_ctx.set(parse_fields(fields))
+    try:
+        yield
+    finally:
+        _fields_ctx.reset(token)
+
+
+def get_bound_fields() -> tuple[str, ...] | None:
+    return _fields_ctx.get()
+
+
+def _upstream_root(spec: str) -> str:
+    # Upstream field specs name record keys, sometimes behind a ``data.`` prefix.
+    if spec.startswith("data."):
+        spec = spec[len("data."):]
+    return spec.split(".", 1)[0]
+
+
+def with_requested_fields(payload: dict[str, Any]) -> dict[str, Any]:
+    """Narrow the upstream ``fields`` list to what the client asked for.
+
+    Only entries already in the endpoint's list are kept, so the upstream
+    never sees a spec it was not written for. Payloads without a ``fields``
+    list are returned unchanged and projected while serializing instead.
+    """
+    requested = get_bound_fields()
+    upstream_fields = payload.get("fields")
+    if not requested or not isinstance(upstream_fields, list):
+        return payload
+
+    roots = {path.split(".", 1)[0] for path in requested}
+    narrowed = [spec for spec in upstream_fields if isinstance(spec, str) and _upstream_root(spec) in roots]
+    if not narrowed:
+        return payload
+    return {**payload, "fields": narrowed}
+
+
+def _path_tree(paths: tuple[str, ...]) -> _PathTree:
+    tree: _PathTree = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break
+            node[part] = child
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def _select(value: Any, tree: _PathTree | None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, dict):
+        return {key: _select(value[key], subtree) for key, subtree in tree.items() if key in value}
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    return value
+
+
+def select_paths(value: Any, paths: tuple[str, ...]) -> Any:
+    """Keep only ``paths`` of a single record; the input is not mutated."""
+    return _select(value, _path_tree(paths))
+
+
+def project_response(value: Any, paths: tuple[str, ...]) -> Any:
+    """Keep only ``paths`` inside each record of a collection envelope.
+
+    Collection records (``data.records[*].data``) and ratings items
+    (``data.list[*]``) are projected; the envelope itself is left intact.
+    The input is not mutated, since it may be a shared cache entry.
+    """
+    if not isinstance(value, dict) or not isinstance(value.get("data"), dict):
+        return value
+
+    tree = _path_tree(paths)
+    data = dict(value["data"])
+    records = data.get("records")
+    if isinstance(records, list):
+        data["records"] = [
+            {**record, "data": _select(record["data"], tree)}
+            if isinstance(record, dict) and isinstance(record.get("data"), dict)
+            else record
+            for record in records
+        ]
+    items = data.get("list")
+    if isinstance(items, list):
+        data["list"] = [_select(item, tree) for item in items]
+    return {**value, "data": data}
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import math
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi import Request
+from starlette.middleware.base import RequestResponseEndpoint
+from starlette.responses import Response
+
+from app.core.etag import is_conditional_route
+
+
+@dataclass
+class ResponseMeta:
+    """Per-request facts the service layer reports back to the HTTP layer."""
+
+    stale: bool = False
+    fresh_for: float | None = None
+    max_stale: float = 0
+
+
+_response_meta_ctx: ContextVar[ResponseMeta | None] = ContextVar("response_meta", default=None)
+
+
+def get_response_meta() -> ResponseMeta | None:
+    return _response_meta_ctx.get()
+
+
+def mark_response_stale() -> None:
+    meta = _response_meta_ctx.get()
+    if meta is not None:
+        meta.stale = True
+
+
+def note_cache_ttl(fresh_for: float, max_stale: float) -> None:
+    """Record how long the cached data behind this response stays fresh (shortest wins).
+
+    ``fresh_for`` is what is left of the entry's TTL; it is ``<= 0`` for an
+    entry served stale while it is revalidated.
+    """
+    meta = _response_meta_ctx.get()
+    if meta is not None and (meta.fresh_for is None or fresh_for < meta.fresh_for):
+        meta.fresh_for = fresh_for
+        meta.max_stale = max_stale
+
+
+def _cache_control(meta: ResponseMeta) -> str | None:
+    if meta.fresh_for is None:
+        return None
+    if meta.stale:
+        return "no-cache"
+    max_age = max(math.ceil(meta.fresh_for), 0)
+    # Past its TTL, the entry's stale window is already partly used up.
+    stale_window = max(int(meta.max_stale + min(meta.fresh_for, 0)), 0)
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_window}"
+
+
+async def response_meta_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
+    # The endpoint runs in a copied context, so share one mutable object
+    # instead of reading a value it sets.
+    meta = ResponseMeta()
+    token = _response_meta_ctx.set(meta)
+    try:
+        response = await call_next(request)
+    finally:
+        _response_meta_ctx.reset(token)
+
+    if meta.stale:
+        response.headers["X-Upstream-Stale"] = "true"
+    cache_control = _cache_control(meta)
+    if (
+        cache_control is not None
+        and response.status_code in (200, 304)
+        and "cache-control" not in response.headers
+        and is_conditional_route(request.scope)
+    ):
+        response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,75 @@
+"""Compare stdlib json with the fast JSON backend on upstream-shaped payloads.
+
+Usage:
+    python benchmarks/bench_json.py [payload.json ...]
+
+Pass files recorded from the upstream (for example the raw body behind
+``/api/heroes/rank?size=130`` or ``/api/academy/equipment/expanded``). With
+no arguments a synthetic rank-shaped payload is generated instead; its
+numbers are indicative only and should not be quoted as production gains.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import fastjson  # noqa: E402
+
+
+def synthetic_rank_payload(heroes: int = 130) -> bytes:
+    rng = random.Random(7)
+    records = []
+    for hero_id in range(1, heroes + 1):
+        records.append({
+            "_id": f"{hero_id:024x}",
+            "data": {
+                "main_heroid": hero_id,
+                "main_hero": {"data": {"name": f"Hero {hero_id}", "head": f"https://cdn.example/{hero_id}.png"}},
+                "main_hero_appearance_rate": rng.random(),
+                "main_hero_ban_rate": rng.random(),
+                "main_hero_win_rate": rng.random(),
+                "main_hero_channel": {"id": rng.randint(1, 10_000)},
+                "sub_hero": [
+                    {"heroid": rng.randint(1, heroes), "hero_win_rate": rng.random(), "increase_win_rate": rng.random()}
+                    for _ in range(5)
+                ],
+                "sub_hero_last": [
+                    {"heroid": rng.randint(1, heroes), "hero_win_rate": rng.random(), "increase_win_rate": rng.random()}
+                    for _ in range(5)
+                ],
+            },
+        })
+    return json.dumps({"code": 0, "message": "OK", "data": {"records": records, "total": heroes}}).encode()
+
+
+def bench(label: str, raw: bytes, number: int) -> None:
+    value = json.loads(raw)
+    results = {
+        "decode stdlib": timeit.timeit(lambda: json.loads(raw), number=number),
+        f"decode {fastjson.BACKEND}": timeit.timeit(lambda: fastjson.loads(raw), number=number),
+        "encode stdlib": timeit.timeit(lambda: fastjson._dumps_stdlib(value), number=number),
+        f"encode {fastjson.BACKEND}": timeit.timeit(lambda: fastjson.dumps(value), number=number),
+    }
+    print(f"{label} ({len(raw) / 1024:.0f} KiB, {number} runs)")
+    for name, seconds in results.items():
+        print(f"  {name:<16} {seconds / number * 1000:8.3f} ms/op")
+
+
+def main(paths: list[str]) -> None:
+    if fastjson.BACKEND == "json":
+        print("orjson is not installed; both columns use the stdlib backend.")
+    if not paths:
+        bench("synthetic rank payload", synthetic_rank_payload(), number=200)
+        return
+    for path in paths:
+        bench(path, Path(path).read_bytes(), number=100)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import inspect
+import os
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.api.warmer import cache_warmer
+from app.core.cache import upstream_cache
+from app.core.hero_limits import _hero_max_id_cache
+from app.core.resilience import upstream_guards, upstream_hedges, upstream_retries
+from app.core.singleflight import upstream_flights
+from app.services.batch import reset_batch_state
+from app.services.hero_table import academy_hero_table, mlbb_hero_table, rank_table
+from app.services.history import history_store
+from app.services.matchups import matchup_matrices
+from app.services.mlbb import hero_directory
+
+
+@pytest.fixture(autouse=True)
+def _reset_upstream_cache() -> None:
+    upstream_cache.clear()
+    upstream_flights.clear()
+    hero_directory.clear()
+    _hero_max_id_cache.clear()
+    mlbb_hero_table.clear()
+    academy_hero_table.clear()
+    rank_table.clear()
+    matchup_matrices.clear()
+    history_store.clear()
+    cache_warmer.reset()
+    reset_batch_state()
+    for guard in upstream_guards.values():
+        guard.reset()
+    upstream_retries.reset()
+    upstream_hedges.reset()
+
+
+@dataclass(frozen=True)
+class UpstreamCall:
+    """One request that reached the stubbed upstream."""
+
+    url: str
+    payload: Any
+    headers: dict[str, str]
+
+    @property
+    def endpoint_id(self) -> str:
+        return self.url.rsplit("/", 1)[-1]
+
+
+@pytest.fixture
+def fake_upstream(monkeypatch) -> Callable[[Callable[[UpstreamCall], Any]], list[UpstreamCall]]:
+    """Answer every mlbb, academy and ratings upstream request from a factory.
+
+    Call the fixture with ``respond(call)``, which returns the envelope (or a
+    coroutine for it) or raises ``AppError``; it returns the list of calls.
+    """
+
+    def install(respond: Callable[[UpstreamCall], Any]) -> list[UpstreamCall]:
+        calls: list[UpstreamCall] = []
+
+        async def fake_request_json(*, method: str, url: str, headers: dict[str, str], payload=None, params=None, upstream=None, retry=False, hedge=False, raw=False) -> Any:
+            call = UpstreamCall(url, payload, headers)
+            calls.append(call)
+            response = respond(call)
+            return await response if inspect.isawaitable(response) else response
+
+        for service in ("mlbb", "academy"):
+            monkeypatch.setattr(f"app.services.{service}.request_json_async", fake_request_json)
+            monkeypatch.setattr(f"app.services.{service}._{service}_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+        monkeypatch.setattr("app.services.academy._ratings_all_url", lambda: "https://upstream/ratings")
+        monkeypatch.setattr("app.services.academy._ratings_subject_url", lambda subject: f"https://upstream/ratings/{subject}")
+        return calls
+
+    return install
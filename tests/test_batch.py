@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core.config import HERO_BATCH_IN_FILTER_RETRY_SECONDS
+from app.core.exceptions import AppError
+from app.main import app
+from app.services import batch as batch_module
+
+client = TestClient(app)
+
+HERO_LIST = {
+    "code": 0,
+    "data": {
+        "records": [
+            {"data": {"hero_id": 3, "hero": {"data": {"name": "Alucard"}}}},
+            {"data": {"hero_id": 2, "hero": {"data": {"name": "Balmond"}}}},
+            {"data": {"hero_id": 1, "hero": {"data": {"name": "Miya"}}}},
+        ],
+        "total": 3,
+    },
+}
+
+
+def _stats_row(hero_id: int) -> dict[str, object]:
+    return {"data": {"main_heroid": hero_id, "main_hero_win_rate": hero_id / 10}}
+
+
+def _stats_upstream(*, honours_in: bool):
+    def respond(call) -> dict[str, object]:
+        if call.endpoint_id == "2756564":
+            return HERO_LIST
+        hero_filter = call.payload["filters"][0]
+        if hero_filter["operator"] == "in" and honours_in:
+            rows = [_stats_row(hero_id) for hero_id in hero_filter["value"]]
+        elif hero_filter["operator"] == "in":
+            rows = [_stats_row(hero_id) for hero_id in (1, 2, 3)]
+        else:
+            rows = [_stats_row(hero_filter["value"])]
+        return {"code": 0, "message": "OK", "data": {"records": rows, "total": len(rows)}}
+
+    return respond
+
+
+def _stats_payloads(calls) -> list[dict[str, object]]:
+    return [call.payload for call in calls if call.endpoint_id != "2756564"]
+
+
+def test_batch_uses_one_in_query_keyed_by_hero_id(fake_upstream) -> None:
+    calls = fake_upstream(_stats_upstream(honours_in=True))
+
+    response = client.get("/api/heroes/stats:batch?ids=3,Miya,nobody")
+    heroes = response.json()["data"]["heroes"]
+
+    assert response.status_code == 200
+    assert list(heroes) == ["3", "1", "nobody"]
+    assert heroes["3"]["data"]["records"] == [_stats_row(3)]
+    assert heroes["1"]["data"]["total"] == 1
+    assert heroes["nobody"]["error"]["code"] == "RESOURCE_NOT_FOUND"
+    payloads = _stats_payloads(calls)
+    assert len(payloads) == 1
+    assert payloads[0]["filters"][0] == {"field": "main_heroid", "operator": "in", "value": [1, 3]}
+
+
+def test_batch_fans_out_when_upstream_ignores_in(fake_upstream) -> None:
+    calls = fake_upstream(_stats_upstream(honours_in=False))
+
+    first = client.get("/api/academy/heroes/stats:batch?ids=1,2")
+    second = client.get("/api/academy/heroes/stats:batch?ids=1,2")
+
+    assert first.json()["data"]["heroes"]["2"]["data"]["records"] == [_stats_row(2)]
+    assert second.json() == first.json()
+    operators = [payload["filters"][0]["operator"] for payload in _stats_payloads(calls)]
+    assert operators == ["in", "eq", "eq"]
+
+
+def test_batch_does_not_fan_out_after_upstream_errors(fake_upstream) -> None:
+    def respond(call) -> dict[str, object]:
+        if call.endpoint_id == "2756564":
+            return HERO_LIST
+        raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data")
+
+    calls = fake_upstream(respond)
+
+    response = client.get("/api/heroes/stats:batch?ids=1,2")
+
+    assert response.status_code == 200
+    assert {hero["error"]["code"] for hero in response.json()["data"]["heroes"].values()} == {"UPSTREAM_REQUEST_FAILED"}
+    assert [payload["filters"][0]["operator"] for payload in _stats_payloads(calls)] == ["in"]
+
+
+def test_ignored_in_filter_is_retried_after_its_ttl(monkeypatch, fake_upstream) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(batch_module, "monotonic", lambda: clock["now"])
+    calls = fake_upstream(_stats_upstream(honours_in=False))
+
+    client.get("/api/academy/heroes/stats:batch?ids=1,2")
+    clock["now"] = HERO_BATCH_IN_FILTER_RETRY_SECONDS + 1
+    client.get("/api/academy/heroes/stats:batch?ids=1,3")
+
+    operators = [payload["filters"][0]["operator"] for payload in _stats_payloads(calls)]
+    assert operators == ["in", "eq", "eq", "in", "eq"]
+
+
+def test_batch_validates_ids(monkeypatch) -> None:
+    monkeypatch.setattr("app.api.routers.aggregate.HERO_BATCH_MAX_IDS", 2)
+
+    assert client.get("/api/heroes/stats:batch?ids=,").status_code == 422
+    assert client.get("/api/heroes/stats:batch?ids=1,2,3").status_code == 422
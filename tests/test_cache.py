@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from time import monotonic
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import cache as cache_module
+from app.core.cache import ResponseCache, cache_key, ttl_for_endpoint, upstream_cache
+from app.core.config import CACHE_MAX_STALE_SECONDS, CACHE_TTL_STATIC_SECONDS, CACHE_TTL_WINDOW_SECONDS
+from app.core.exceptions import AppError
+from app.core.singleflight import upstream_flights
+from app.main import app
+from app.utils.deadline import _deadline_ctx, remaining_budget
+
+
+client = TestClient(app)
+
+
+def test_cache_key_is_independent_of_payload_key_order() -> None:
+    first = cache_key("mlbb", "2756564", {"pageSize": 20, "pageIndex": 1}, "en")
+    second = cache_key("mlbb", "2756564", {"pageIndex": 1, "pageSize": 20}, "en")
+
+    assert first == second
+    assert first != cache_key("mlbb", "2756564", {"pageIndex": 1, "pageSize": 20}, "id")
+    assert first != cache_key("academy", "2756564", {"pageIndex": 1, "pageSize": 20}, "en")
+
+
+def test_ttl_classes_split_static_catalogs_from_windows() -> None:
+    assert ttl_for_endpoint("2756564") == CACHE_TTL_STATIC_SECONDS
+    assert ttl_for_endpoint("2775075") == CACHE_TTL_STATIC_SECONDS
+    assert ttl_for_endpoint("2756567") == CACHE_TTL_WINDOW_SECONDS
+    assert ttl_for_endpoint("2755185") == CACHE_TTL_WINDOW_SECONDS
+
+
+def test_cache_evicts_least_recently_used_entry() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"code": 0}, 60)
+    cache.set("b", {"code": 0}, 60)
+    assert cache.get("a") is not None
+
+    cache.set("c", {"code": 0}, 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entries_expire_and_count_hits_and_misses(monkeypatch) -> None:
+    clock = {"now": 10.0}
+    monkeypatch.setattr(cache_module, "monotonic", lambda: clock["now"])
+    cache = ResponseCache(max_entries=4)
+    cache.set("a", {"code": 0}, 5)
+
+    assert cache.get("a") == {"code": 0}
+    clock["now"] += 6
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_meta_version_is_served_from_cache_on_repeat(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: {"code": 0, "data": {"records": [], "total": 0}})
+
+    first = client.get("/api/academy/meta/version?size=5")
+    second = client.get("/api/academy/meta/version?size=5")
+    other_page = client.get("/api/academy/meta/version?size=5&index=2")
+
+    assert first.status_code == second.status_code == other_page.status_code == 200
+    assert len(calls) == 2
+    assert upstream_cache.stats()["hits"] == 1
+
+
+def test_upstream_error_envelopes_are_not_cached(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: {"code": 500, "message": "busy"})
+
+    client.get("/api/academy/spells")
+    client.get("/api/academy/spells")
+
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_fetches_share_one_upstream_call() -> None:
+    calls: list[int] = []
+
+    async def fetch() -> dict[str, object]:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"code": 0, "data": {"records": []}}
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(*(cache_module.cached_fetch_async("same-key", 60, fetch) for _ in range(25)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert upstream_flights.stats()["followers"] == 24
+
+
+def test_coalesced_callers_share_upstream_failure() -> None:
+    calls: list[int] = []
+
+    async def fetch() -> dict[str, object]:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data")
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            *(cache_module.cached_fetch_async("failing-key", 60, fetch) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, AppError) for result in results)
+    assert upstream_flights.in_flight() == 0
+
+
+def test_coalesced_callers_wait_on_their_own_budgets() -> None:
+    seen: list[float | None] = []
+
+    async def fetch() -> dict[str, object]:
+        await asyncio.sleep(0)
+        seen.append(remaining_budget())
+        await asyncio.sleep(0.2)
+        return {"code": 0, "data": {"records": []}}
+
+    async def call(budget: float) -> object:
+        _deadline_ctx.set(monotonic() + budget)
+        return await cache_module.cached_fetch_async("budget-key", 60, fetch)
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(call(0.05), call(5.0), return_exceptions=True)
+
+    short, default = asyncio.run(scenario())
+
+    assert isinstance(short, AppError) and short.code == "UPSTREAM_DEADLINE_EXCEEDED"
+    assert default == {"code": 0, "data": {"records": []}}
+    # The shared fetch is bounded by the longest waiter, not the full upstream timeout.
+    assert len(seen) == 1 and seen[0] is not None and 4 < seen[0] <= 5.0
+
+
+def test_flight_is_cancelled_when_its_last_waiter_gives_up() -> None:
+    cancelled: list[bool] = []
+
+    async def fetch() -> dict[str, object]:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"code": 0, "data": {"records": []}}
+
+    async def call(budget: float) -> object:
+        _deadline_ctx.set(monotonic() + budget)
+        return await cache_module.cached_fetch_async("abandoned-key", 60, fetch)
+
+    async def scenario() -> list[object]:
+        results = await asyncio.gather(call(0.02), call(0.05), return_exceptions=True)
+        await asyncio.sleep(0)
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, AppError) and result.code == "UPSTREAM_DEADLINE_EXCEEDED" for result in results)
+    assert cancelled == [True]
+    assert upstream_flights.in_flight() == 0
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(cache_module, "monotonic", lambda: clock["now"])
+    versions = iter(range(1, 100))
+    calls: list[int] = []
+
+    async def fetch() -> dict[str, object]:
+        version = next(versions)
+        calls.append(version)
+        await asyncio.sleep(0.01)
+        return {"code": 0, "data": {"version": version}}
+
+    async def scenario() -> tuple[object, list[object], object]:
+        first = await cache_module.cached_fetch_async("rank-key", 10, fetch, max_stale=60)
+        clock["now"] = 15
+        stale = await asyncio.gather(*(cache_module.cached_fetch_async("rank-key", 10, fetch, max_stale=60) for _ in range(5)))
+        await asyncio.sleep(0.05)
+        refreshed = await cache_module.cached_fetch_async("rank-key", 10, fetch, max_stale=60)
+        return first, stale, refreshed
+
+    first, stale, refreshed = asyncio.run(scenario())
+
+    assert first == {"code": 0, "data": {"version": 1}}
+    assert all(value == first for value in stale)
+    assert refreshed == {"code": 0, "data": {"version": 2}}
+    assert calls == [1, 2]
+    assert upstream_cache.stats()["stale_hits"] == 5
+
+
+def test_entry_past_max_stale_waits_for_upstream(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(cache_module, "monotonic", lambda: clock["now"])
+    versions = iter(range(1, 100))
+
+    async def fetch() -> dict[str, object]:
+        return {"code": 0, "data": {"version": next(versions)}}
+
+    async def scenario() -> tuple[object, object]:
+        first = await cache_module.cached_fetch_async("trend-key", 10, fetch, max_stale=60)
+        clock["now"] = 71
+        second = await cache_module.cached_fetch_async("trend-key", 10, fetch, max_stale=60)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == {"code": 0, "data": {"version": 1}}
+    assert second == {"code": 0, "data": {"version": 2}}
+
+
+def _upstream_failure(call) -> dict[str, object]:
+    raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data")
+
+
+def test_upstream_failure_serves_last_good_response_marked_stale(monkeypatch, fake_upstream) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(cache_module, "monotonic", lambda: clock["now"])
+    state = {"fail": False}
+
+    def respond(call) -> dict[str, object]:
+        if state["fail"]:
+            return _upstream_failure(call)
+        return {"code": 0, "data": {"records": [{"data": {"hero_id": 1}}], "total": 1}}
+
+    fake_upstream(respond)
+
+    fresh = client.get("/api/academy/roles")
+    state["fail"] = True
+    clock["now"] = CACHE_TTL_STATIC_SECONDS + CACHE_MAX_STALE_SECONDS + 1
+    fallback = client.get("/api/academy/roles")
+
+    assert fresh.status_code == 200
+    assert "stale" not in fresh.json()
+    assert fallback.status_code == 200
+    assert fallback.json()["stale"] is True
+    assert fallback.json()["data"]["total"] == 1
+    assert fallback.headers["X-Upstream-Stale"] == "true"
+    assert upstream_cache.stats()["stale_if_error_hits"] == 1
+
+
+def test_upstream_failure_without_last_good_response_still_errors(fake_upstream) -> None:
+    fake_upstream(_upstream_failure)
+
+    response = client.get("/api/academy/roles")
+
+    assert response.status_code == 502
+    assert response.json()["code"] == "UPSTREAM_REQUEST_FAILED"
+    assert "X-Upstream-Stale" not in response.headers
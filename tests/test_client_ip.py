@@ -14,12 +14,12 @@ client = TestClient(app)
 def test_addon_ip_prefers_public_from_x_forwarded_for(monkeypatch) -> None:
     captured: dict[str, str | None] = {}
 
-    def fake_fetch(path: str, client_ip: str | None = None) -> dict[str, object]:
+    async def fake_fetch(path: str, client_ip: str | None = None) -> dict[str, object]:
         captured["path"] = path
         captured["client_ip"] = client_ip
         return {"code": 0, "msg": "ok", "data": {"client_ip": client_ip}}
 
-    monkeypatch.setattr("app.api.routers.addon.fetch_ip_get", fake_fetch)
+    monkeypatch.setattr("app.api.routers.addon.fetch_ip_get_async", fake_fetch)
 
     response = client.get(
         "/api/addon/ip",
@@ -34,12 +34,12 @@ def test_addon_ip_prefers_public_from_x_forwarded_for(monkeypatch) -> None:
 def test_addon_ip_ignores_private_only_forwarded_ip(monkeypatch) -> None:
     captured: dict[str, str | None] = {}
 
-    def fake_fetch(path: str, client_ip: str | None = None) -> dict[str, object]:
+    async def fake_fetch(path: str, client_ip: str | None = None) -> dict[str, object]:
         captured["path"] = path
         captured["client_ip"] = client_ip
         return {"code": 0, "msg": "ok", "data": {"client_ip": client_ip}}
 
-    monkeypatch.setattr("app.api.routers.addon.fetch_ip_get", fake_fetch)
+    monkeypatch.setattr("app.api.routers.addon.fetch_ip_get_async", fake_fetch)
 
     response = client.get(
         "/api/addon/ip",
@@ -51,14 +51,8 @@ def test_addon_ip_ignores_private_only_forwarded_ip(monkeypatch) -> None:
     assert captured["client_ip"] is None
 
 
-def test_mlbb_service_header_uses_public_forwarded_ip(monkeypatch) -> None:
-    captured_headers: dict[str, str] = {}
-
-    def fake_request_json(*, method: str, url: str, headers: dict[str, str], payload: dict[str, object] | None = None, params: dict[str, object] | None = None) -> dict[str, object]:
-        captured_headers.update(headers)
-        return {"code": 0, "data": {"records": []}}
-
-    monkeypatch.setattr("app.services.mlbb.request_json", fake_request_json)
+def test_mlbb_service_header_uses_public_forwarded_ip(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: {"code": 0, "data": {"records": []}})
 
     response = client.get(
         "/api/heroes?size=1&index=1",
@@ -66,17 +60,11 @@ def test_mlbb_service_header_uses_public_forwarded_ip(monkeypatch) -> None:
     )
 
     assert response.status_code == 200
-    assert captured_headers.get("X-Forwarded-For") == "36.80.5.9"
-
-
-def test_academy_service_header_uses_public_forwarded_ip(monkeypatch) -> None:
-    captured_headers: dict[str, str] = {}
+    assert calls[0].headers.get("X-Forwarded-For") == "36.80.5.9"
 
-    def fake_request_json(*, method: str, url: str, headers: dict[str, str], payload: dict[str, object] | None = None, params: dict[str, object] | None = None) -> dict[str, object]:
-        captured_headers.update(headers)
-        return {"code": 0, "data": {"records": []}}
 
-    monkeypatch.setattr("app.services.academy.request_json", fake_request_json)
+def test_academy_service_header_uses_public_forwarded_ip(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: {"code": 0, "data": {"records": []}})
 
     response = client.get(
         "/api/academy/meta/version?size=1&index=1",
@@ -84,4 +72,4 @@ def test_academy_service_header_uses_public_forwarded_ip(monkeypatch) -> None:
     )
 
     assert response.status_code == 200
-    assert captured_headers.get("X-Forwarded-For") == "103.90.20.10"
+    assert calls[0].headers.get("X-Forwarded-For") == "103.90.20.10"
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+from starlette.types import Message
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import compression
+from app.core.compression import CompressionMiddleware
+from app.core.fastjson import RawJSON
+from app.main import app
+
+
+client = TestClient(app)
+
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), "..", "images", "blog")
+
+
+class _FakeHttpxResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+def _large_body() -> bytes:
+    records = ",".join(f'{{"data":{{"hero_id":{i},"name":"Hero {i}"}}}}' for i in range(200))
+    return f'{{"code":0,"message":"OK","data":{{"records":[{records}],"total":200}}}}'.encode()
+
+
+def _serve_academy(monkeypatch, body: bytes) -> list[str]:
+    calls: list[str] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeHttpxResponse:
+            calls.append(url)
+            return _FakeHttpxResponse(body)
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+    return calls
+
+
+def test_choose_encoding_honours_quality_values() -> None:
+    assert compression.choose_encoding("gzip, deflate") == "gzip"
+    assert compression.choose_encoding("gzip;q=0, identity") is None
+    assert compression.choose_encoding("*") == compression.SUPPORTED_ENCODINGS[0]
+    assert compression.choose_encoding(None) is None
+
+
+def test_cached_body_is_compressed_once(monkeypatch) -> None:
+    body = _large_body()
+    _serve_academy(monkeypatch, body)
+    compressed: list[bytes] = []
+    original = compression.compress
+
+    def counting_compress(data: bytes, encoding: str) -> bytes:
+        compressed.append(data)
+        return original(data, encoding)
+
+    monkeypatch.setattr("app.core.fastjson.compress", counting_compress)
+
+    first = client.get("/api/academy/roles", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/academy/roles", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.content == second.content == body
+    assert len(compressed) == 1
+
+
+def test_identity_clients_get_uncompressed_body(monkeypatch) -> None:
+    body = _large_body()
+    _serve_academy(monkeypatch, body)
+
+    response = client.get("/api/academy/roles", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == body
+
+
+def test_small_responses_stay_uncompressed() -> None:
+    response = client.get("/api/addon/win-rate-calculator?match-now=10&wr-now=50&wr-future=60", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_middleware_compresses_non_cached_json(monkeypatch) -> None:
+    monkeypatch.setattr(compression, "COMPRESSION_MIN_SIZE", 10)
+
+    with client.stream("GET", "/api/metrics", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).startswith(b"{")
+
+
+def test_raw_json_memoizes_encoded_variants() -> None:
+    raw = RawJSON(_large_body())
+
+    assert raw.encoded("gzip") is raw.encoded("gzip")
+    assert gzip.decompress(raw.encoded("gzip")) == raw.body
+
+
+
+def test_streamed_body_is_forwarded_without_buffering() -> None:
+    sent: list[Message] = []
+
+    async def streaming_app(scope, receive, send) -> None:
+        chunks = iter([b'{"a":"' + b"x" * 2000, b'"}'])
+        await StreamingResponse(chunks, media_type="application/json")(scope, receive, send)
+
+    async def record(message: Message) -> None:
+        sent.append(message)
+
+    async def receive() -> Message:
+        await asyncio.sleep(1)
+        return {"type": "http.disconnect"}
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(streaming_app)(scope, receive, record))
+
+    # Each chunk went out as its own message, uncompressed.
+    assert [message["body"] for message in sent[1:] if message.get("body")] == [b'{"a":"' + b"x" * 2000, b'"}']
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+
+
+def test_static_images_are_not_compressed() -> None:
+    image = next(name for name in sorted(os.listdir(IMAGES_DIR)) if name.endswith((".png", ".jpg", ".webp")))
+
+    response = client.get(f"/images/blog/{image}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.content == open(os.path.join(IMAGES_DIR, image), "rb").read()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core.exceptions import AppError
+from app.main import app
+
+client = TestClient(app)
+
+HERO_LIST = {
+    "code": 0,
+    "message": "OK",
+    "data": {
+        "records": [
+            {
+                "data": {
+                    "hero_id": 30,
+                    "hero": {"data": {"name": "Yi Sun-shin", "roadsort": [{"data": {"road_sort_id": "4"}}, ""]}},
+                }
+            }
+        ],
+        "total": 1,
+    },
+}
+
+
+def _dossier_upstream(failing: set[str]):
+    def respond(call) -> dict[str, object]:
+        if call.endpoint_id in failing:
+            raise AppError(status_code=502, code="UPSTREAM_REQUEST_FAILED", message="Failed to fetch data")
+        if call.endpoint_id == "2756564":
+            return HERO_LIST
+        return {"code": 0, "message": "OK", "data": {"records": [{"data": {"endpoint": call.endpoint_id}}], "total": 1}}
+
+    return respond
+
+
+def test_dossier_fans_out_and_reports_section_errors(fake_upstream) -> None:
+    calls = fake_upstream(_dossier_upstream({"2756569"}))
+
+    response = client.get("/api/heroes/yisunshin/dossier?include=stats,counters,builds&days=7")
+    body = response.json()
+    sections = body["data"]["sections"]
+
+    assert response.status_code == 200
+    assert body["data"]["hero_id"] == 30
+    assert list(sections) == ["stats", "counters", "builds"]
+    assert sections["stats"]["data"]["records"][0]["data"] == {"endpoint": "2756567"}
+    assert sections["counters"]["error"]["code"] == "UPSTREAM_REQUEST_FAILED"
+    assert sections["counters"]["error"]["status"] == 502
+    builds_payload = next(call.payload for call in calls if call.endpoint_id == "2776688")
+    assert {"field": "real_road", "operator": "eq", "value": 4} in builds_payload["filters"]
+
+
+def test_dossier_rejects_unknown_sections_and_heroes(fake_upstream) -> None:
+    fake_upstream(_dossier_upstream(set()))
+
+    assert client.get("/api/heroes/30/dossier?include=stats,gossip").status_code == 422
+    assert client.get("/api/heroes/nobody/dossier").status_code == 404
+
+
+def test_dossier_without_deadline_budget_returns_timeouts_per_section(monkeypatch, fake_upstream) -> None:
+    fake_upstream(_dossier_upstream(set()))
+    monkeypatch.setattr("app.utils.fanout.remaining_budget", lambda: 0.0)
+
+    response = client.get("/api/heroes/30/dossier?include=detail,relations")
+
+    assert response.status_code == 200
+    assert {section["error"]["code"] for section in response.json()["data"]["sections"].values()} == {"UPSTREAM_DEADLINE_EXCEEDED"}
+
+
+def test_dossier_documents_sections_keyed_by_name() -> None:
+    schema = app.openapi()
+    response = schema["paths"]["/api/heroes/{hero_identifier}/dossier"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    data = schema["components"]["schemas"]["HeroDossierData"]
+
+    assert response == {"$ref": "#/components/schemas/HeroDossierResponse"}
+    assert set(data["required"]) == {"hero_id", "sections"}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import cache as cache_module
+from app.core.config import CACHE_MAX_STALE_SECONDS, CACHE_TTL_STATIC_SECONDS, CACHE_TTL_WINDOW_SECONDS
+from app.core.etag import body_etag, encoded_etag, etag_matches
+from app.main import app
+
+
+client = TestClient(app)
+
+BODY = b'{"code":0,"message":"OK","data":{"records":[{"data":{"hero_id":1}}],"total":1}}'
+
+
+class _FakeHttpxResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+def _serve(monkeypatch, body: bytes = BODY) -> None:
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeHttpxResponse:
+            return _FakeHttpxResponse(body)
+
+        async def get(self, url: str, **kwargs: object) -> _FakeHttpxResponse:
+            return _FakeHttpxResponse(body)
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+    monkeypatch.setattr("app.services.academy._ratings_all_url", lambda: "https://upstream/ratings")
+
+
+def test_etag_comparison_is_weak_but_coding_specific() -> None:
+    etag = body_etag(BODY)
+    gzip_etag = encoded_etag(etag, "gzip")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(f'"other", {gzip_etag}', gzip_etag)
+    assert not etag_matches(gzip_etag, etag)
+    assert not etag_matches(etag, gzip_etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_cached_body_gets_strong_etag_and_304(monkeypatch) -> None:
+    _serve(monkeypatch)
+
+    first = client.get("/api/academy/roles", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+    second = client.get("/api/academy/roles", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert etag == body_etag(BODY)
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert second.headers["cache-control"] == first.headers["cache-control"]
+
+
+def test_cache_control_matches_endpoint_ttl(monkeypatch) -> None:
+    _serve(monkeypatch)
+
+    static = client.get("/api/academy/roles")
+    window = client.get("/api/academy/heroes/ratings")
+
+    assert static.headers["cache-control"] == f"public, max-age={CACHE_TTL_STATIC_SECONDS}, stale-while-revalidate={CACHE_MAX_STALE_SECONDS}"
+    assert window.headers["cache-control"] == f"public, max-age={CACHE_TTL_WINDOW_SECONDS}, stale-while-revalidate={CACHE_MAX_STALE_SECONDS}"
+
+
+def test_cache_control_advertises_only_the_freshness_left(monkeypatch) -> None:
+    _serve(monkeypatch)
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(cache_module, "monotonic", lambda: clock["now"])
+
+    client.get("/api/academy/heroes/ratings")
+    clock["now"] += 100
+    aged = client.get("/api/academy/heroes/ratings")
+    clock["now"] += CACHE_TTL_WINDOW_SECONDS
+    stale = client.get("/api/academy/heroes/ratings")
+
+    assert aged.headers["cache-control"] == f"public, max-age={CACHE_TTL_WINDOW_SECONDS - 100}, stale-while-revalidate={CACHE_MAX_STALE_SECONDS}"
+    assert stale.headers["cache-control"] == f"public, max-age=0, stale-while-revalidate={CACHE_MAX_STALE_SECONDS - 100}"
+
+
+def test_non_cached_read_endpoints_get_etag_from_body() -> None:
+    url = "/api/addon/win-rate-calculator?match-now=10&wr-now=50&wr-future=60"
+
+    first = client.get(url)
+    second = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.headers["etag"] == body_etag(first.content)
+    assert "cache-control" not in first.headers
+    assert second.status_code == 304
+
+
+def test_user_endpoints_get_no_validators() -> None:
+    response = client.get("/api/user/info")
+
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+
+def test_gzip_and_identity_get_distinct_validators(monkeypatch) -> None:
+    spells = b'{"code":0,"message":"OK","data":{"records":[' + b",".join(
+        b'{"data":{"name":"Flicker %d","description":"%s"}}' % (index, b"x" * 40) for index in range(40)
+    ) + b'],"total":40}}'
+    _serve(monkeypatch, spells)
+
+    for url in ("/api/academy/spells", "/api/academy/spells?fields=name"):
+        identity = client.get(url, headers={"Accept-Encoding": "identity"})
+        gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.headers["etag"] != identity.headers["etag"]
+        assert gzipped.headers["etag"].endswith('-gzip"')
+
+        cross = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]})
+        same = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]})
+
+        assert cross.status_code == 200
+        assert cross.headers["etag"] == identity.headers["etag"]
+        assert same.status_code == 304
+        assert same.headers["etag"] == gzipped.headers["etag"]
+        assert "accept-encoding" in same.headers["vary"].lower()
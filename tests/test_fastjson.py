@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import fastjson
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_round_trip_matches_stdlib() -> None:
+    value = {"code": 0, "data": {"name": "Layla – 莱拉", "rate": 0.5123, "ids": [1, 2, 3], "none": None}}
+
+    encoded = fastjson.dumps(value)
+
+    assert json.loads(encoded) == value
+    assert fastjson.loads(encoded) == value
+    assert fastjson.loads(encoded.decode()) == value
+
+
+def test_invalid_json_raises_value_error() -> None:
+    with pytest.raises(ValueError):
+        fastjson.loads(b"{not json")
+
+
+def test_oversized_integers_fall_back_to_stdlib() -> None:
+    assert json.loads(fastjson.dumps({"big": 2**70})) == {"big": 2**70}
+
+
+def test_api_responses_use_fast_json_class() -> None:
+    assert app.router.default_response_class is fastjson.FastJSONResponse
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_envelope_check_accepts_only_successful_envelopes() -> None:
+    assert fastjson.is_ok_envelope(b'{"code":0,"message":"OK","data":{"records":[]}}')
+    assert fastjson.is_ok_envelope(b' { "code" : "0", "data": null }\n')
+    assert not fastjson.is_ok_envelope(b'{"code":500,"message":"busy","data":null}')
+    assert not fastjson.is_ok_envelope(b'{"message":"OK","code":0,"data":{}}')
+    assert not fastjson.is_ok_envelope(b'{"code":0,"message":"OK"}')
+    assert not fastjson.is_ok_envelope(b'{"code":0,"data":{"records":[')
+
+
+class _FakeHttpxResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+def test_proxy_endpoint_streams_upstream_bytes_unchanged(monkeypatch) -> None:
+    body = b'{"code":0,"message":"OK","data":{"records":[{"data":{"hero_id":1}}],"total":1},"traceID":"t"}'
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeHttpxResponse:
+            return _FakeHttpxResponse(body)
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+
+    response = client.get("/api/academy/roles")
+
+    assert response.status_code == 200
+    assert response.content == body
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_non_envelope_bodies_are_parsed_and_validated(monkeypatch) -> None:
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeHttpxResponse:
+            return _FakeHttpxResponse(b'{"message":"OK","code":0,"data":{"records":[],"total":0}}')
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+
+    response = client.get("/api/academy/roles")
+
+    assert response.status_code == 200
+    assert response.json()["code"] == 0
+    assert response.json()["data"] == {"records": [], "total": 0}
+
+
+def test_openapi_still_advertises_response_models() -> None:
+    schema = client.get("/api/openapi.json").json()
+
+    ok = schema["paths"]["/api/academy/roles"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert ok["$ref"].endswith("/AcademyCollectionResponse")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core.exceptions import AppError
+from app.services import mlbb as mlbb_service
+from app.services.hero_table import mlbb_hero_table
+from app.services.mlbb import HeroDirectory, hero_directory, resolve_hero_id_async
+
+
+def _hero_list_response() -> dict[str, object]:
+    return {
+        "code": 0,
+        "data": {
+            "records": [
+                {"data": {"hero_id": 132, "hero": {"data": {"name": "Marcel"}}}},
+                {"data": {"hero_id": 107, "hero": {"data": {"name": "Yi Sun-shin"}}}},
+                {"data": {"hero_id": 84, "hero": {"data": {"name": "Chang'e"}}}},
+            ]
+        },
+    }
+
+
+def _langs(calls) -> list[str]:
+    return [call.headers.get("x-lang", "en") for call in calls]
+
+
+def test_build_index_normalizes_names() -> None:
+    index = HeroDirectory.build_index(_hero_list_response())
+
+    assert index == {"marcel": 132, "yisunshin": 107, "change": 84}
+
+
+def test_directory_loads_once_per_language(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: _hero_list_response())
+
+    async def scenario() -> list[int]:
+        return [
+            await resolve_hero_id_async("Yi Sun-Shin", "en"),
+            await resolve_hero_id_async("chang-e", "en"),
+            await resolve_hero_id_async("unknown", "en"),
+            await resolve_hero_id_async("marcel", "id"),
+        ]
+
+    assert asyncio.run(scenario()) == [107, 84, 0, 132]
+    assert _langs(calls) == ["en", "id"]
+
+
+def test_expired_directory_refreshes_in_background(monkeypatch, fake_upstream) -> None:
+    calls = fake_upstream(lambda call: _hero_list_response())
+    clock = {"now": 0.0}
+    monkeypatch.setattr(mlbb_service, "monotonic", lambda: clock["now"])
+
+    async def scenario() -> tuple[int, int]:
+        first = await hero_directory.get_hero_id("Marcel", "en")
+        clock["now"] += hero_directory.ttl_seconds + 1
+        stale = await hero_directory.get_hero_id("Marcel", "en")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return first, stale
+
+    assert asyncio.run(scenario()) == (132, 132)
+    # The reload rebuilt the index from the still-cached hero list.
+    assert _langs(calls) == ["en"]
+    assert hero_directory._indexes["en"][0] == clock["now"]
+
+
+def test_directory_shares_the_hero_table_list(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: _hero_list_response())
+
+    async def scenario() -> tuple[dict[str, object] | None, int]:
+        return await mlbb_hero_table.record(132, "en"), await resolve_hero_id_async("Marcel", "en")
+
+    record, hero_id = asyncio.run(scenario())
+
+    assert record is not None and hero_id == 132
+    assert _langs(calls) == ["en"]
+
+
+def test_error_envelope_is_not_stored(fake_upstream) -> None:
+    fake_upstream(lambda call: {"code": 500, "msg": "busy", "data": None})
+
+    async def scenario() -> None:
+        await resolve_hero_id_async("Marcel", "en")
+
+    with pytest.raises(AppError) as excinfo:
+        asyncio.run(scenario())
+
+    assert excinfo.value.code == "UPSTREAM_REQUEST_FAILED"
+    assert "en" not in hero_directory._indexes
+
+
+def test_empty_hero_list_is_not_stored(fake_upstream) -> None:
+    fake_upstream(lambda call: {"code": 0, "data": {"records": []}})
+
+    with pytest.raises(AppError):
+        asyncio.run(hero_directory.get_hero_id("Marcel", "en"))
+
+    assert "en" not in hero_directory._indexes
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.main import app
+from app.services.hero_table import HeroQuery, HeroSnapshot, RankSnapshot
+
+client = TestClient(app)
+
+
+def _option(key: str, value: int) -> dict[str, object]:
+    return {"data": {key: str(value)}}
+
+
+def _hero(hero_id: int, roles: list[int], lanes: list[int]) -> dict[str, object]:
+    return {
+        "id": 1000 + hero_id,
+        "data": {
+            "hero_id": hero_id,
+            "head": f"https://cdn/{hero_id}.png",
+            "hero": {
+                "data": {
+                    "name": f"Hero {hero_id}",
+                    "head": f"https://cdn/{hero_id}.png",
+                    "smallmap": f"https://cdn/{hero_id}-map.png",
+                    "sortid": [_option("sort_id", role) for role in roles] + [""],
+                    "roadsort": [_option("road_sort_id", lane) for lane in lanes],
+                }
+            },
+        },
+    }
+
+
+HEROES = {
+    "code": 0,
+    "message": "OK",
+    "data": {
+        "records": [
+            _hero(3, [1], [3]),
+            _hero(1, [5], [5]),
+            _hero(4, [4], [2]),
+            _hero(2, [1, 2], [1, 3]),
+        ],
+        "total": 4,
+    },
+}
+
+
+def _ids(response) -> list[int]:
+    return [record["data"]["hero_id"] for record in response.json()["data"]["records"]]
+
+
+def test_hero_list_pages_from_one_upstream_load(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: HEROES)
+
+    first = client.get("/api/heroes?size=2&index=1&order=desc")
+    second = client.get("/api/heroes?size=2&index=2&order=desc")
+    ascending = client.get("/api/heroes?size=3&order=asc")
+
+    assert _ids(first) == [4, 3]
+    assert _ids(second) == [2, 1]
+    assert _ids(ascending) == [1, 2, 3]
+    assert first.json()["data"]["total"] == 4
+    assert first.json()["data"]["records"][0] == {
+        "id": 1004,
+        "data": {"hero_id": 4, "head": "https://cdn/4.png", "hero": {"data": {"head": "https://cdn/4.png", "name": "Hero 4", "smallmap": "https://cdn/4-map.png"}}},
+    }
+    assert len(calls) == 1
+    assert calls[0].payload["pageSize"] == 10000
+
+
+def test_local_page_matches_the_documented_upstream_example(fake_upstream) -> None:
+    example = app.openapi()["paths"]["/api/heroes"]["get"]["responses"]["200"]["content"]["application/json"]["example"]
+    documented = example["data"]["records"][0]
+    # The full list also carries the option lists the table filters on.
+    hero = {**documented["data"]["hero"]["data"], "sortid": [_option("sort_id", 1)], "roadsort": [_option("road_sort_id", 1)]}
+    full_record = {"data": {**documented["data"], "hero": {"data": hero}}}
+    fake_upstream(lambda call: {"code": 0, "message": "OK", "data": {"records": [full_record], "total": 1}})
+
+    response = client.get("/api/heroes?size=1")
+
+    assert response.json() == {**example, "data": {"records": [documented], "total": 1}}
+
+
+def test_hero_position_filters_with_role_and_lane_masks(fake_upstream) -> None:
+    fake_upstream(lambda call: HEROES)
+
+    tanks = client.get("/api/heroes/positions?role=tank&order=asc")
+    roam_tanks = client.get("/api/heroes/positions?role=tank&lane=roam&lane=gold")
+    gold = client.get("/api/heroes/positions?lane=gold")
+
+    assert _ids(tanks) == [2, 3]
+    assert tanks.json()["data"]["total"] == 2
+    assert tanks.json()["data"]["records"][0]["id"] == 1002
+    assert _ids(roam_tanks) == [3, 2]
+    assert _ids(gold) == [1]
+
+
+def test_academy_heroes_use_their_own_table(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: HEROES)
+
+    response = client.get("/api/academy/heroes?role=mage")
+
+    assert _ids(response) == [4]
+    assert response.json()["data"]["records"][0] == {"id": 1004, "data": {"head": "https://cdn/4.png", "hero": {"data": {"name": "Hero 4"}}, "hero_id": 4}}
+    assert calls[0].payload["fields"] == ["head", "hero_id", "hero.data.name", "hero.data.sortid", "hero.data.roadsort"]
+
+
+def test_upstream_errors_pass_through(fake_upstream) -> None:
+    fake_upstream(lambda call: {"code": 500, "message": "busy"})
+
+    response = client.get("/api/heroes")
+
+    assert response.json()["code"] == 500
+
+
+def test_truncated_or_untagged_lists_fall_back_to_upstream(fake_upstream) -> None:
+    truncated = {**HEROES, "data": {**HEROES["data"], "total": 200}}
+    calls = fake_upstream(lambda call: truncated)
+
+    client.get("/api/heroes?size=5")
+
+    assert [call.payload["pageSize"] for call in calls] == [10000, 5]
+
+    untagged = HeroSnapshot.build({"code": 0, "data": {"records": [{"data": {"hero_id": 1}}], "total": 1}})
+    query = HeroQuery.from_payload(
+        {
+            "pageSize": 5,
+            "sorts": [{"data": {"field": "hero_id", "order": "asc"}, "type": "sequence"}],
+            "filters": [{"field": "<hero.data.sortid>", "operator": "hasAnyOf", "value": [1]}],
+            "fields": ["hero_id"],
+        },
+        frozenset({"hero_id"}),
+    )
+    assert untagged is not None and query is not None
+    assert not untagged.can_answer(query)
+
+
+def test_unsupported_payloads_are_not_planned() -> None:
+    available = frozenset({"hero_id"})
+    sorts = [{"data": {"field": "hero_id", "order": "asc"}, "type": "sequence"}]
+
+    assert HeroQuery.from_payload({"pageSize": 5, "sorts": sorts, "fields": ["hero_id"]}, available) is not None
+    assert HeroQuery.from_payload({"pageSize": 5, "sorts": sorts, "fields": ["painting"]}, available) is None
+    assert HeroQuery.from_payload({"pageSize": 5, "sorts": [], "fields": ["hero_id"]}, available) is None
+    assert HeroQuery.from_payload({"pageSize": 5, "sorts": sorts, "fields": ["hero_id"], "object": [2667538]}, available) is None
+    assert HeroQuery.from_payload(
+        {"pageSize": 5, "sorts": sorts, "fields": ["hero_id"], "filters": [{"field": "hero_id", "operator": "eq", "value": 1}]},
+        available,
+    ) is None
+
+
+def _rank_row(hero_id: int, pick: float, ban: float, win: float) -> dict[str, object]:
+    return {
+        "_id": f"r{hero_id}",
+        "data": {
+            "main_heroid": hero_id,
+            "main_hero": {"data": {"name": f"Hero {hero_id}"}},
+            "main_hero_appearance_rate": pick,
+            "main_hero_ban_rate": ban,
+            "main_hero_win_rate": win,
+            "main_hero_channel": {"id": hero_id},
+            "sub_hero": [{"heroid": hero_id + 100, "increase_win_rate": 0.01}],
+        },
+    }
+
+
+RANKS = {
+    "code": 0,
+    "message": "OK",
+    "data": {
+        "records": [
+            _rank_row(1, 0.10, 0.30, 0.52),
+            _rank_row(2, 0.30, 0.10, 0.48),
+            _rank_row(3, 0.20, 0.20, 0.55),
+        ],
+        "total": 3,
+    },
+}
+
+
+def test_rank_sort_and_page_variants_share_one_upstream_fetch(fake_upstream) -> None:
+    calls = fake_upstream(lambda call: RANKS)
+
+    def main_ids(query: str) -> list[int]:
+        response = client.get(f"/api/heroes/rank?{query}")
+        return [record["data"]["main_heroid"] for record in response.json()["data"]["records"]]
+
+    assert main_ids("sort_field=win_rate") == [3, 1, 2]
+    assert main_ids("sort_field=pick_rate&sort_order=asc") == [1, 3, 2]
+    assert main_ids("sort_field=ban_rate&size=1&index=2") == [3]
+    assert main_ids("sort_field=ban_rate&fields=main_heroid") == [1, 3, 2]
+    assert len(calls) == 1
+    assert calls[0].payload["filters"][0] == {"field": "bigrank", "operator": "eq", "value": "101"}
+
+    client.get("/api/heroes/rank?rank=mythic&days=7")
+    assert len(calls) == 2
+
+
+def test_rank_snapshot_keeps_rate_and_sub_hero_columns() -> None:
+    rank = RankSnapshot.build(RANKS)
+
+    assert rank is not None
+    assert list(rank.columns["main_hero_win_rate"]) == [0.52, 0.48, 0.55]
+    assert rank.sub_heroids == ((101,), (102,), (103,))
+    assert rank.ascending["main_hero_win_rate"] == (1, 0, 2)
+    assert RankSnapshot.build({"code": 0, "data": {"records": [{"data": {"main_heroid": 1}}]}}) is None
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.main import app
+from app.services.history import DaySnapshot, history_store
+
+client = TestClient(app)
+
+
+def _rank_row(hero_id: int, win: float) -> dict[str, object]:
+    return {
+        "data": {
+            "main_heroid": hero_id,
+            "main_hero_win_rate": win,
+            "main_hero_appearance_rate": 0.01,
+            "main_hero_ban_rate": 0.002,
+        }
+    }
+
+
+def _use_tmp_store(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(history_store, "root", tmp_path)
+
+
+def _table(records: list[dict[str, object]]):
+    return lambda call: {"code": 0, "message": "OK", "data": {"records": records, "total": len(records)}}
+
+
+HERO_LIST = [{"data": {"hero_id": 30, "hero": {"data": {"name": "Yi Sun-shin"}}}}]
+
+
+def test_day_segments_round_trip_and_skip_torn_tail(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    first = DaySnapshot.from_rows(date(2026, 10, 1), {30: (0.512345, 0.01, 0.2), 1: (0.48, 0.003, 0.0)})
+    second = DaySnapshot.from_rows(date(2026, 10, 2), {1: (0.49, 0.003, 0.0)})
+
+    assert history_store.append("101", first)
+    assert not history_store.append("101", first)
+    path = tmp_path / "rank-101.hts"
+    path.write_bytes(path.read_bytes() + b"HTS1\x00")  # torn write
+    assert history_store.append("101", second)
+
+    assert len(path.read_bytes()) == len(first.encode()) + len(second.encode())
+    days = history_store.days("101")
+    assert [snapshot.day for snapshot in days] == [date(2026, 10, 1), date(2026, 10, 2)]
+    assert list(days[0].hero_ids) == [1, 30]
+    assert days[0].rates(30) == (0.512345, 0.01, 0.2)
+    assert days[1].rates(30) is None
+
+
+def test_capture_snapshots_each_rank_once_per_day(monkeypatch, tmp_path, fake_upstream) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    calls = fake_upstream(_table([_rank_row(30, 0.5), _rank_row(1, 0.52)]))
+
+    assert asyncio.run(history_store.capture(today=date(2026, 10, 3))) == 6
+    assert asyncio.run(history_store.capture(today=date(2026, 10, 3))) == 0
+    assert {call.endpoint_id for call in calls} == {"2756567"}
+    assert len(calls) == 6
+    # The 1-day window captured on Oct 3 describes Oct 2.
+    assert [snapshot.day for snapshot in history_store.days("7")] == [date(2026, 10, 2)]
+    assert history_store.days("7")[0].rates(1) == (0.52, 0.01, 0.002)
+
+
+def test_history_endpoint_buckets_by_resolution(monkeypatch, tmp_path, fake_upstream) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    calls = fake_upstream(_table(HERO_LIST))
+    for day, win in ((date(2026, 9, 28), 0.5), (date(2026, 9, 30), 0.54), (date(2026, 10, 5), 0.6)):
+        history_store.append("101", DaySnapshot.from_rows(day, {30: (win, 0.01, 0.02)}))
+
+    daily = client.get("/api/heroes/30/history?from=2026-09-29&to=2026-10-31")
+    weekly = client.get("/api/heroes/30/history?from=2026-09-01&to=2026-10-31&resolution=week")
+
+    assert [record["data"]["date"] for record in daily.json()["data"]["records"]] == ["2026-09-30", "2026-10-05"]
+    assert [record["data"] for record in weekly.json()["data"]["records"]] == [
+        {"date": "2026-09-28", "days": 2, "win_rate": 0.52, "pick_rate": 0.01, "ban_rate": 0.02},
+        {"date": "2026-10-05", "days": 1, "win_rate": 0.6, "pick_rate": 0.01, "ban_rate": 0.02},
+    ]
+    assert client.get("/api/heroes/30/history?from=2026-10-02&to=2026-10-01").status_code == 422
+    assert calls == []
+
+
+def test_history_endpoint_resolves_names_only_from_loaded_hero_list(monkeypatch, tmp_path, fake_upstream) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    calls = fake_upstream(_table(HERO_LIST))
+    history_store.append("101", DaySnapshot.from_rows(date(2026, 9, 30), {30: (0.5, 0.01, 0.02)}))
+
+    unloaded = client.get("/api/heroes/yisunshin/history?from=2026-09-29&to=2026-10-31")
+    assert unloaded.status_code == 404
+    assert calls == []
+
+    assert client.get("/api/heroes").status_code == 200
+    loaded = client.get("/api/heroes/yisunshin/history?from=2026-09-29&to=2026-10-31")
+    missing = client.get("/api/heroes/unknown/history?from=2026-09-29&to=2026-10-31")
+
+    assert loaded.json()["data"]["total"] == 1
+    assert missing.status_code == 404
+    assert len(calls) == 1
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.main import app
+from app.services.matchups import COUNTERS, MatchupMatrix, matchup_matrices
+
+client = TestClient(app)
+
+HERO_LIST = {
+    "code": 0,
+    "data": {
+        "records": [
+            {"data": {"hero_id": 4, "hero": {"data": {"name": "Alucard"}}}},
+            {"data": {"hero_id": 2, "hero": {"data": {"name": "Balmond"}}}},
+            {"data": {"hero_id": 1, "hero": {"data": {"name": "Miya"}}}},
+        ],
+        "total": 3,
+    },
+}
+
+
+def _row(main: int, subs: dict[int, float], win_rate: float = 0.5) -> dict[str, object]:
+    return {
+        "data": {
+            "main_heroid": main,
+            "main_hero_win_rate": win_rate,
+            "sub_hero": [{"heroid": hero_id, "increase_win_rate": rate} for hero_id, rate in subs.items()],
+        }
+    }
+
+
+TABLES = {
+    "0": [_row(1, {2: 0.03, 3: 0.01, 4: 0.02}), _row(2, {3: 0.05, 4: -0.01}), _row(4, {}, 0.58)],
+    "1": [_row(1, {3: 0.02}), _row(4, {3: 0.01, 2: 0.04})],
+}
+
+
+def _respond(call) -> dict[str, object]:
+    if call.endpoint_id == "2756564":
+        return HERO_LIST
+    rows = TABLES[call.payload["filters"][0]["value"]]
+    return {"code": 0, "message": "OK", "data": {"records": rows, "total": len(rows)}}
+
+
+def _table_calls(calls) -> list:
+    return [call for call in calls if call.endpoint_id != "2756564"]
+
+
+def test_matrix_is_dense_and_indexed_by_hero_id() -> None:
+    matrix = MatchupMatrix.build({"code": 0, "data": {"records": TABLES["0"]}})
+
+    assert matrix.size == 5
+    assert len(matrix.values) == 25
+    assert matrix.heroes == (1, 2, 3, 4)
+    assert [round(value, 6) for value in matrix.column_sums([1, 2])] == [0.0, 0.0, 0.03, 0.06, 0.01]
+    assert MatchupMatrix.build({"code": 0, "data": {"records": []}}) is None
+
+
+def test_counters_rank_heroes_against_the_enemy_lineup(fake_upstream) -> None:
+    calls = fake_upstream(_respond)
+
+    response = client.get("/api/matchups/counters?enemies=Miya,2&days=3&rank=mythic")
+    repeat = client.get("/api/matchups/counters?enemies=1,Balmond&days=3&rank=mythic&exclude=alucard&limit=1")
+    records = [record["data"] for record in response.json()["data"]["records"]]
+
+    assert response.status_code == 200
+    assert [record["heroid"] for record in records] == [3, 4]
+    assert records[0] == {"heroid": 3, "score": 0.06, "breakdown": {"1": 0.01, "2": 0.05}}
+    assert [record["data"]["heroid"] for record in repeat.json()["data"]["records"]] == [3]
+    tables = _table_calls(calls)
+    assert len(tables) == 1
+    assert tables[0].endpoint_id == "2756568"
+    assert tables[0].payload["filters"] == [
+        {"field": "match_type", "operator": "eq", "value": COUNTERS},
+        {"field": "bigrank", "operator": "eq", "value": "7"},
+    ]
+
+
+def test_synergies_and_validation(fake_upstream) -> None:
+    fake_upstream(_respond)
+
+    response = client.get("/api/matchups/synergies?team=1,4")
+
+    assert [record["data"]["heroid"] for record in response.json()["data"]["records"]] == [2, 3]
+    assert client.get("/api/matchups/synergies?team=,").status_code == 422
+    assert client.get("/api/matchups/synergies?team=1,2,3,4,5,6").status_code == 422
+    assert client.get("/api/matchups/counters?enemies=nobody").status_code == 404
+
+
+def test_refresh_all_builds_every_window_and_rank(fake_upstream) -> None:
+    calls = fake_upstream(_respond)
+
+    built = asyncio.run(matchup_matrices.refresh_all())
+
+    assert built == 2 * 5 * 6
+    assert len(_table_calls(calls)) == built
+    assert matchup_matrices.stats() == {"matrices": built}
+
+
+def test_draft_recommend_scores_counters_synergies_and_win_rate(fake_upstream) -> None:
+    calls = fake_upstream(_respond)
+
+    response = client.get("/api/draft/recommend?allies=Alucard&enemies=Miya&days=1&rank=glory")
+    records = [record["data"] for record in response.json()["data"]["records"]]
+
+    assert response.status_code == 200
+    assert records == [
+        {"heroid": 2, "score": 0.07, "counter": 0.03, "synergy": 0.04, "win_rate": 0.5},
+        {"heroid": 3, "score": 0.02, "counter": 0.01, "synergy": 0.01, "win_rate": 0.0},
+    ]
+    tables = _table_calls(calls)
+    assert {call.endpoint_id for call in tables} == {"2756567"}
+    assert len(tables) == 2
+
+    banned = client.get("/api/draft/recommend?enemies=1&bans=Balmond,3")
+    assert [record["data"]["heroid"] for record in banned.json()["data"]["records"]] == [4]
+    assert client.get("/api/draft/recommend?allies=1,2,3,4,5").status_code == 422
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.main import app
+from app.utils import projection
+
+
+client = TestClient(app)
+
+RANK_RESPONSE = {
+    "code": 0,
+    "message": "OK",
+    "data": {
+        "records": [
+            {
+                "_id": "a",
+                "data": {
+                    "main_heroid": 131,
+                    "main_hero": {"data": {"name": "Sora", "head": "https://cdn/131.png"}},
+                    "main_hero_win_rate": 0.5,
+                    "main_hero_channel": {"id": 3245715},
+                    "sub_hero": [{"heroid": 99, "increase_win_rate": 0.06, "hero_channel": {"id": 1}}],
+                },
+            }
+        ],
+        "total": 1,
+    },
+}
+
+
+def test_parse_fields_rejects_malformed_paths() -> None:
+    assert projection.parse_fields(" main_heroid , main_hero.data.name ,") == ("main_heroid", "main_hero.data.name")
+    assert projection.parse_fields("") is None
+
+    with pytest.raises(HTTPException):
+        projection.parse_fields("main_hero..name")
+
+
+def test_project_response_keeps_only_requested_paths_without_mutating_input() -> None:
+    projected = projection.project_response(RANK_RESPONSE, ("main_heroid", "main_hero.data.name", "sub_hero.heroid"))
+
+    assert projected["data"]["records"][0] == {
+        "_id": "a",
+        "data": {"main_heroid": 131, "main_hero": {"data": {"name": "Sora"}}, "sub_hero": [{"heroid": 99}]},
+    }
+    assert projected["data"]["total"] == 1
+    assert "main_hero_channel" in RANK_RESPONSE["data"]["records"][0]["data"]
+
+
+def test_shorter_path_selects_whole_subtree() -> None:
+    projected = projection.project_response(RANK_RESPONSE, ("main_hero", "main_hero.data.name"))
+
+    assert projected["data"]["records"][0]["data"] == {"main_hero": {"data": {"name": "Sora", "head": "https://cdn/131.png"}}}
+
+
+def test_fields_are_pushed_into_upstream_payload_and_projected(monkeypatch, fake_upstream) -> None:
+    calls = fake_upstream(lambda call: RANK_RESPONSE)
+    # The local rank table loads every field; test the pushdown on the plain path.
+    monkeypatch.setattr("app.services.hero_table.RANK_TABLE_ENABLED", False)
+
+    response = client.get("/api/heroes/rank?fields=main_heroid,main_hero.data.name,main_hero_win_rate")
+
+    assert response.status_code == 200
+    assert calls[0].payload["fields"] == ["main_hero", "main_hero_win_rate", "main_heroid"]
+    assert response.json()["data"]["records"][0]["data"] == {
+        "main_heroid": 131,
+        "main_hero": {"data": {"name": "Sora"}},
+        "main_hero_win_rate": 0.5,
+    }
+
+
+def test_fields_param_is_documented_and_validated() -> None:
+    schema = client.get("/api/openapi.json").json()
+    names = [parameter["name"] for parameter in schema["paths"]["/api/heroes/rank"]["get"]["parameters"]]
+
+    assert "fields" in names
+    assert client.get("/api/heroes/rank?fields=bad path").status_code == 422
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import http as http_module
+from app.core import resilience as resilience_module
+from app.core.config import UPSTREAM_TIMEOUT_SECONDS
+from app.core.exceptions import AppError
+from app.core.resilience import Bulkhead, CircuitBreaker, CircuitState, HedgePolicy, RetryPolicy, upstream_guards
+from app.main import app
+from app.utils import deadline as deadline_module
+
+
+client = TestClient(app)
+
+
+def _breaker(**overrides: float) -> CircuitBreaker:
+    settings = {
+        "window_seconds": 60,
+        "window_size": 10,
+        "min_calls": 4,
+        "failure_ratio": 0.5,
+        "slow_call_seconds": 5.0,
+        "slow_call_ratio": 0.8,
+        "open_seconds": 30,
+    }
+    settings.update(overrides)
+    return CircuitBreaker("test", **settings)
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(resilience_module, "monotonic", lambda: clock["now"])
+    breaker = _breaker()
+
+    for ok in (True, False, True, False):
+        breaker.record(ok, 0.1)
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(AppError) as exc_info:
+        breaker.allow()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.code == "UPSTREAM_CIRCUIT_OPEN"
+
+
+def test_breaker_needs_min_calls_and_forgets_old_outcomes(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(resilience_module, "monotonic", lambda: clock["now"])
+    breaker = _breaker()
+
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state is CircuitState.CLOSED
+
+    clock["now"] = 61
+    breaker.record(False, 0.1)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_opens_on_slow_calls(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(resilience_module, "monotonic", lambda: clock["now"])
+    breaker = _breaker()
+
+    for _ in range(4):
+        breaker.record(True, 6.0)
+
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(resilience_module, "monotonic", lambda: clock["now"])
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+
+    clock["now"] = 31
+    breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(AppError):
+        breaker.allow()
+
+    breaker.record(True, 0.1)
+    assert breaker.state is CircuitState.CLOSED
+    breaker.allow()
+
+
+def test_failed_probe_reopens_circuit(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(resilience_module, "monotonic", lambda: clock["now"])
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+
+    clock["now"] = 31
+    breaker.allow()
+    breaker.record(False, 0.1)
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(AppError):
+        breaker.allow()
+
+
+def test_bulkhead_sheds_calls_beyond_its_slots() -> None:
+    bulkhead = Bulkhead("test", max_concurrency=2)
+    bulkhead.acquire()
+    bulkhead.acquire()
+
+    with pytest.raises(AppError) as exc_info:
+        bulkhead.acquire()
+    assert exc_info.value.code == "UPSTREAM_BUSY"
+
+    bulkhead.release()
+    bulkhead.acquire()
+    assert bulkhead.snapshot() == {"in_flight": 2, "max_concurrency": 2, "rejected": 1}
+
+
+def test_open_circuit_short_circuits_router_before_upstream(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> object:
+            calls.append(url)
+            raise AssertionError("upstream must not be called while the circuit is open")
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+    guard = upstream_guards["academy"]
+    for _ in range(guard.breaker.min_calls):
+        guard.breaker.record(False, 0.1)
+
+    response = client.get("/api/academy/spells")
+
+    assert response.status_code == 503
+    assert response.json()["code"] == "UPSTREAM_CIRCUIT_OPEN"
+    assert calls == []
+    assert client.get("/api/metrics").json()["upstreams"]["academy"]["state"] == "open"
+
+
+def _retry_policy(**overrides: float) -> RetryPolicy:
+    settings = {"max_retries": 2, "base_seconds": 0.0, "max_seconds": 0.0, "budget_ratio": 0.1, "budget_reserve": 1}
+    settings.update(overrides)
+    return RetryPolicy(**settings)
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, body: object = None) -> None:
+        self.status_code = status_code
+        self._body = body
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._body).encode()
+
+
+def test_retry_budget_caps_extra_load() -> None:
+    policy = _retry_policy(budget_reserve=2)
+
+    assert policy.try_acquire(0)
+    assert policy.try_acquire(0)
+    assert not policy.try_acquire(0)
+
+    for _ in range(10):
+        policy.record_request()
+    assert policy.try_acquire(0)
+    assert not policy.try_acquire(0)
+    assert policy.stats()["budget_exhausted"] == 2
+
+
+def test_retry_stops_after_max_retries() -> None:
+    policy = _retry_policy(budget_reserve=10)
+
+    assert policy.try_acquire(1)
+    assert not policy.try_acquire(2)
+
+
+def test_backoff_is_jittered_within_exponential_cap() -> None:
+    policy = _retry_policy(base_seconds=0.1, max_seconds=0.3)
+
+    assert all(0 <= policy.backoff(0) <= 0.1 for _ in range(50))
+    assert all(0 <= policy.backoff(5) <= 0.3 for _ in range(50))
+
+
+def test_idempotent_read_retries_transient_failures(monkeypatch) -> None:
+    responses = iter([_FakeResponse(503), _FakeResponse(200, {"code": 0, "data": {}})])
+    calls: list[str] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeResponse:
+            calls.append(url)
+            return next(responses)
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.core.http.upstream_retries", _retry_policy())
+
+    result = asyncio.run(http_module.request_json_async(method="POST", url="https://upstream/x", headers={}, payload={}, retry=True))
+
+    assert result == {"code": 0, "data": {}}
+    assert len(calls) == 2
+
+
+def test_mutating_calls_are_never_retried(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeResponse:
+            calls.append(url)
+            return _FakeResponse(503)
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.core.http.upstream_retries", _retry_policy(budget_reserve=10))
+
+    with pytest.raises(AppError):
+        asyncio.run(http_module.request_form_async(method="POST", url="https://upstream/base/login", headers={}, payload={}))
+    with pytest.raises(AppError):
+        asyncio.run(http_module.request_json_async(method="POST", url="https://upstream/privacy", headers={}, params={}))
+
+    assert len(calls) == 2
+
+
+def test_open_circuit_is_not_retried(monkeypatch) -> None:
+    policy = _retry_policy(budget_reserve=10)
+    monkeypatch.setattr("app.core.http.upstream_retries", policy)
+    guard = upstream_guards["mlbb"]
+    for _ in range(guard.breaker.min_calls):
+        guard.breaker.record(False, 0.1)
+
+    with pytest.raises(AppError) as exc_info:
+        asyncio.run(http_module.request_json_async(method="POST", url="https://upstream/x", headers={}, payload={}, upstream="mlbb", retry=True))
+
+    assert exc_info.value.code == "UPSTREAM_CIRCUIT_OPEN"
+    assert policy.retries == 0
+
+
+def _hedge_policy(**overrides: float) -> HedgePolicy:
+    settings = {"enabled": True, "percentile": 95.0, "min_delay_seconds": 0.01, "max_ratio": 1.0, "min_samples": 4}
+    settings.update(overrides)
+    return HedgePolicy(**settings)
+
+
+def _warm_latencies(name: str, latency: float) -> None:
+    for _ in range(4):
+        upstream_guards[name].breaker.record(True, latency)
+
+
+def test_hedge_delay_waits_for_enough_samples() -> None:
+    policy = _hedge_policy()
+    assert policy.delay_for("mlbb") is None
+
+    _warm_latencies("mlbb", 0.02)
+
+    assert policy.delay_for("mlbb") == pytest.approx(0.02)
+    assert policy.delay_for(None) is None
+
+
+def test_hedge_rate_is_capped() -> None:
+    policy = _hedge_policy(max_ratio=0.5)
+    for _ in range(4):
+        policy.record_request()
+
+    assert policy.try_fire()
+    assert policy.try_fire()
+    assert not policy.try_fire()
+    assert policy.stats()["capped"] == 1
+
+
+def test_slow_primary_is_hedged_and_hedge_wins(monkeypatch) -> None:
+    policy = _hedge_policy()
+    monkeypatch.setattr("app.core.http.upstream_hedges", policy)
+    _warm_latencies("mlbb", 0.01)
+    for _ in range(10):
+        policy.record_request()
+    delays = iter([0.5, 0.0])
+
+    async def send() -> _FakeResponse:
+        await asyncio.sleep(next(delays))
+        return _FakeResponse(200)
+
+    response = asyncio.run(http_module._send_hedged_async(send, "mlbb"))
+
+    assert response.status_code == 200
+    assert policy.stats()["fired"] == 1
+    assert policy.stats()["won"] == 1
+
+
+def test_fast_primary_is_not_hedged(monkeypatch) -> None:
+    policy = _hedge_policy()
+    monkeypatch.setattr("app.core.http.upstream_hedges", policy)
+    _warm_latencies("mlbb", 0.05)
+    calls: list[int] = []
+
+    async def send() -> _FakeResponse:
+        calls.append(1)
+        return _FakeResponse(200)
+
+    asyncio.run(http_module._send_hedged_async(send, "mlbb"))
+
+    assert calls == [1]
+    assert policy.stats()["fired"] == 0
+
+
+@pytest.mark.parametrize("cancel_after", [0.005, 0.05])
+def test_cancelled_caller_cancels_primary_and_hedge(monkeypatch, cancel_after: float) -> None:
+    policy = _hedge_policy()
+    monkeypatch.setattr("app.core.http.upstream_hedges", policy)
+    _warm_latencies("mlbb", 0.01)
+    for _ in range(10):
+        policy.record_request()
+    started: list[int] = []
+    cancelled: list[int] = []
+
+    async def send() -> _FakeResponse:
+        started.append(1)
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return _FakeResponse(200)
+
+    async def scenario() -> None:
+        # Cancel during the hedge delay, then after the hedge has fired.
+        caller = asyncio.ensure_future(http_module._send_hedged_async(send, "mlbb"))
+        await asyncio.sleep(cancel_after)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        # Checked before asyncio.run tears down whatever is still running.
+        assert len(started) == (1 if cancel_after < 0.01 else 2)
+        assert cancelled == started
+
+    asyncio.run(scenario())
+
+
+def test_upstream_timeout_follows_remaining_budget(monkeypatch) -> None:
+    clock = {"now": 100.0}
+    monkeypatch.setattr(deadline_module, "monotonic", lambda: clock["now"])
+    token = deadline_module._deadline_ctx.set(110.0)
+    try:
+        assert deadline_module.upstream_timeout() == pytest.approx(10.0)
+        with deadline_module.budget_share(0.5):
+            assert deadline_module.upstream_timeout() == pytest.approx(5.0)
+        assert deadline_module.upstream_timeout() == pytest.approx(10.0)
+
+        clock["now"] = 111.0
+        with pytest.raises(AppError) as exc_info:
+            deadline_module.upstream_timeout()
+        assert exc_info.value.status_code == 504
+    finally:
+        deadline_module._deadline_ctx.reset(token)
+
+
+def test_upstream_timeout_without_deadline_uses_default() -> None:
+    assert deadline_module.upstream_timeout() == UPSTREAM_TIMEOUT_SECONDS
+
+
+def test_request_header_shortens_upstream_timeout(monkeypatch) -> None:
+    timeouts: list[float] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeResponse:
+            timeouts.append(kwargs["timeout"])
+            return _FakeResponse(200, {"code": 0, "data": {"records": [], "total": 0}})
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+
+    response = client.get("/api/academy/spells", headers={"X-Request-Timeout": "3"})
+
+    assert response.status_code == 200
+    assert len(timeouts) == 1
+    assert 0 < timeouts[0] <= 3
+
+
+def test_request_header_bounds_the_wait_for_upstream(monkeypatch) -> None:
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeResponse:
+            await asyncio.sleep(0.3)
+            return _FakeResponse(200, {"code": 0, "data": {"records": [], "total": 0}})
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+
+    started = time.monotonic()
+    response = client.get("/api/academy/spells", headers={"X-Request-Timeout": "0.05"})
+
+    assert response.status_code == 504
+    assert response.json()["code"] == "UPSTREAM_DEADLINE_EXCEEDED"
+    assert time.monotonic() - started < 0.3
+
+
+def test_exhausted_budget_fails_fast_with_504(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class FakeClient:
+        async def post(self, url: str, **kwargs: object) -> _FakeResponse:
+            calls.append(url)
+            return _FakeResponse(200, {"code": 0, "data": {}})
+
+    monkeypatch.setattr("app.core.http.upstream_transport.async_client_for", lambda url: FakeClient())
+    monkeypatch.setattr("app.services.academy._academy_url", lambda endpoint_id: f"https://upstream/{endpoint_id}")
+    monkeypatch.setattr(deadline_module, "REQUEST_DEADLINE_SECONDS", -1.0)
+
+    response = client.get("/api/academy/spells")
+
+    assert response.status_code == 504
+    assert response.json()["code"] == "UPSTREAM_DEADLINE_EXCEEDED"
+    assert calls == []
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+from cryptography.fernet import InvalidToken
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import security
+from app.core.security import BasePathProvider, BaseUserPathProvider, CryptoManager, resolved_routes
+
+
+@pytest.fixture
+def test_routes(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    crypto = CryptoManager("test-secret")
+    plain = {
+        "RONE_DEV_KEY": "/mlbb",
+        "RONE_DEV_KEY_ACADEMY": "/academy",
+        "RONE_DEV_KEY_RATINGS": "/ratings",
+        "RONE_DEV_KEY_AUTH": "https://auth.example.com",
+        "RONE_DEV_KEY_DATA": "https://data.example.com",
+        "RONE_DEV_KEY_STATS": "https://stats.example.com",
+    }
+    for name, value in plain.items():
+        owner = BaseUserPathProvider if hasattr(BaseUserPathProvider, name) else BasePathProvider
+        monkeypatch.setattr(owner, name, crypto.encrypt(value))
+    monkeypatch.setattr(security, "SECRET_KEY", "test-secret")
+    resolved_routes.cache_clear()
+    yield plain
+    resolved_routes.cache_clear()
+
+
+def test_route_prefixes_are_decrypted_once(test_routes: dict[str, str], monkeypatch: pytest.MonkeyPatch) -> None:
+    constructed: list[str] = []
+    original_init = CryptoManager.__init__
+
+    def counting_init(self: CryptoManager, secret_key: str) -> None:
+        constructed.append(secret_key)
+        original_init(self, secret_key)
+
+    monkeypatch.setattr(CryptoManager, "__init__", counting_init)
+
+    for _ in range(3):
+        assert BasePathProvider.get_base_path() == "/mlbb"
+        assert BasePathProvider.get_base_path_academy() == "/academy"
+        assert BasePathProvider.get_base_path_ratings() == "/ratings"
+        assert BaseUserPathProvider.get_base_url_path_auth() == "https://auth.example.com"
+        assert BaseUserPathProvider.get_base_url_path_stats() == "https://stats.example.com"
+
+    assert constructed == ["test-secret"]
+
+
+def test_resolved_route_table_is_read_only(test_routes: dict[str, str]) -> None:
+    with pytest.raises(TypeError):
+        resolved_routes()[BasePathProvider.RONE_DEV_KEY] = "/other"  # type: ignore[index]
+
+
+def test_wrong_secret_key_keeps_failing_fast(test_routes: dict[str, str], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(security, "SECRET_KEY", "wrong-secret")
+
+    with pytest.raises(InvalidToken):
+        BasePathProvider.get_base_path()
+    with pytest.raises(InvalidToken):
+        BasePathProvider.get_base_path()
+
+    monkeypatch.setattr(security, "SECRET_KEY", "test-secret")
+    assert BasePathProvider.get_base_path() == "/mlbb"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core import http as http_module
+from app.core.exceptions import AppError
+from app.core.transport import UpstreamTransport, upstream_host
+
+
+def test_upstream_host_ignores_path_and_query() -> None:
+    assert upstream_host("https://API.example.com/a/b?offset=0") == "https://api.example.com"
+
+
+def test_async_client_is_reused_per_host_within_loop() -> None:
+    transport = UpstreamTransport(pool_size=4, keepalive_seconds=60)
+
+    async def scenario() -> None:
+        first = transport.async_client_for("https://a.example.com/x")
+        second = transport.async_client_for("https://a.example.com/y")
+        other = transport.async_client_for("https://b.example.com/x")
+        assert first is second
+        assert first is not other
+        await transport.aclose()
+
+    asyncio.run(scenario())
+    assert transport.async_hosts() == []
+
+
+def test_request_json_async_maps_upstream_failures(monkeypatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/ok":
+            return httpx.Response(200, json={"code": 0, "data": {}})
+        if request.url.path == "/bad-json":
+            return httpx.Response(200, content=b"not json")
+        return httpx.Response(500)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_module.upstream_transport, "async_client_for", lambda url: client)
+
+    async def call(path: str) -> object:
+        return await http_module.request_json_async(method="POST", url=f"https://a.example.com{path}", headers={}, payload={})
+
+    assert asyncio.run(call("/ok")) == {"code": 0, "data": {}}
+    with pytest.raises(AppError) as invalid:
+        asyncio.run(call("/bad-json"))
+    assert invalid.value.code == "UPSTREAM_INVALID_RESPONSE"
+    with pytest.raises(AppError) as failed:
+        asyncio.run(call("/boom"))
+    assert failed.value.status_code == 500
+    assert failed.value.code == "UPSTREAM_REQUEST_FAILED"
+
+
+def test_async_client_from_another_loop_is_replaced_and_closed() -> None:
+    transport = UpstreamTransport(pool_size=4, keepalive_seconds=60)
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def client_on_current_loop() -> httpx.AsyncClient:
+        return transport.async_client_for("https://a.example.com/x")
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(client_on_current_loop(), old_loop).result(timeout=5)
+
+        async def scenario() -> None:
+            new = transport.async_client_for("https://a.example.com/x")
+            assert new is not old
+            await transport.aclose()
+
+        asyncio.run(scenario())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), old_loop).result(timeout=5)
+        assert old.is_closed
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(timeout=5)
+        old_loop.close()
@@ -66,13 +66,13 @@ def test_openapi_user_read_endpoints_use_get_and_authorization_header() -> None:
 def test_user_info_endpoint_strips_bearer_before_forwarding_upstream(monkeypatch: pytest.MonkeyPatch) -> None:
     captured: dict[str, str] = {}
 
-    def fake_fetch_user_post(path: str, headers: dict[str, str], payload: dict[str, object]) -> dict[str, object]:
+    async def fake_fetch_user_post(path: str, headers: dict[str, str], payload: dict[str, object]) -> dict[str, object]:
         captured["path"] = path
         captured["authorization"] = headers["authorization"]
         captured["x-token"] = headers["x-token"]
         return {"code": 0, "data": "", "msg": "ok"}
 
-    monkeypatch.setattr("app.api.routers.user.fetch_user_post", fake_fetch_user_post)
+    monkeypatch.setattr("app.api.routers.user.fetch_user_post_async", fake_fetch_user_post)
 
     response = client.get(
         "/api/user/info?lang=en",
@@ -88,13 +88,13 @@ def test_user_info_endpoint_strips_bearer_before_forwarding_upstream(monkeypatch
 def test_user_logout_uses_authorization_header(monkeypatch: pytest.MonkeyPatch) -> None:
     captured: dict[str, str] = {}
 
-    def fake_fetch_user_post(path: str, headers: dict[str, str], payload: dict[str, object]) -> dict[str, object]:
+    async def fake_fetch_user_post(path: str, headers: dict[str, str], payload: dict[str, object]) -> dict[str, object]:
         captured["path"] = path
         captured["authorization"] = headers["authorization"]
         captured["x-token"] = headers["x-token"]
         return {"code": 0, "data": "", "msg": "ok"}
 
-    monkeypatch.setattr("app.api.routers.user.fetch_user_post", fake_fetch_user_post)
+    monkeypatch.setattr("app.api.routers.user.fetch_user_post_async", fake_fetch_user_post)
 
     response = client.post(
         "/api/user/auth/logout",
@@ -108,10 +108,10 @@ def test_user_logout_uses_authorization_header(monkeypatch: pytest.MonkeyPatch)
 
 
 def test_user_stats_invalid_upstream_shape_returns_standardized_error(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_fetch_user_actgateway(path: str, headers: dict[str, str], params: dict[str, object]) -> object:
+    async def fake_fetch_user_actgateway(path: str, headers: dict[str, str], params: dict[str, object]) -> object:
         return ["invalid-shape"]
 
-    monkeypatch.setattr("app.api.routers.user.fetch_user_actgateway", fake_fetch_user_actgateway)
+    monkeypatch.setattr("app.api.routers.user.fetch_user_actgateway_async", fake_fetch_user_actgateway)
 
     response = client.get(
         "/api/user/stats?lang=en",
@@ -136,7 +136,7 @@ def test_update_privacy_settings_requires_visibility_query() -> None:
 def test_update_privacy_settings_maps_visibility_to_upstream_privacy(monkeypatch: pytest.MonkeyPatch) -> None:
     captured: dict[str, object] = {}
 
-    def fake_fetch_user_actgateway_post(path: str, headers: dict[str, str], params: dict[str, object]) -> dict[str, object]:
+    async def fake_fetch_user_actgateway_post(path: str, headers: dict[str, str], params: dict[str, object]) -> dict[str, object]:
         captured["path"] = path
         captured["params"] = params
         captured["x-token"] = headers.get("x-token")
@@ -150,7 +150,7 @@ def test_update_privacy_settings_maps_visibility_to_upstream_privacy(monkeypatch
             },
         }
 
-    monkeypatch.setattr("app.api.routers.user.fetch_user_actgateway_post", fake_fetch_user_actgateway_post)
+    monkeypatch.setattr("app.api.routers.user.fetch_user_actgateway_post_async", fake_fetch_user_actgateway_post)
 
     response = client.post(
         "/api/user/privacy/settings?visibility=visible&lang=en",
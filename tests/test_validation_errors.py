@@ -59,13 +59,13 @@ def test_validation_error_payload_contains_details_list() -> None:
 
 
 def test_academy_dynamic_max_hero_id_rejects_above_live_total(monkeypatch) -> None:
-    def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str) -> object:
+    async def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str, raw: bool = False) -> object:
         if endpoint_id == "2766683":
             return {"code": 0, "message": "OK", "data": {"total": 132}}
         return {"code": 0, "message": "OK", "data": []}
 
     hero_limits.clear_hero_max_cache()
-    monkeypatch.setattr(hero_limits, "fetch_academy_post", fake_fetch)
+    monkeypatch.setattr(hero_limits, "fetch_academy_post_async", fake_fetch)
 
     response = client.get("/api/academy/heroes/133/stats")
 
@@ -76,13 +76,13 @@ def test_academy_dynamic_max_hero_id_rejects_above_live_total(monkeypatch) -> No
 
 
 def test_academy_dynamic_max_hero_id_accepts_current_live_total(monkeypatch) -> None:
-    def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str) -> object:
+    async def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str, raw: bool = False) -> object:
         if endpoint_id == "2766683":
             return {"code": 0, "message": "OK", "data": {"total": 132}}
         return {"code": 0, "message": "OK", "data": []}
 
     hero_limits.clear_hero_max_cache()
-    monkeypatch.setattr(hero_limits, "fetch_academy_post", fake_fetch)
+    monkeypatch.setattr(hero_limits, "fetch_academy_post_async", fake_fetch)
 
     response = client.get("/api/academy/heroes/132/stats")
 
@@ -90,7 +90,7 @@ def test_academy_dynamic_max_hero_id_accepts_current_live_total(monkeypatch) ->
 
 
 def test_mlbb_dynamic_max_hero_id_rejects_above_live_total(monkeypatch) -> None:
-    def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str) -> object:
+    async def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str, raw: bool = False) -> object:
         if endpoint_id == "2756564":
             return {
                 "code": 0,
@@ -108,7 +108,7 @@ def test_mlbb_dynamic_max_hero_id_rejects_above_live_total(monkeypatch) -> None:
         return {"code": 0, "message": "OK", "data": []}
 
     hero_limits.clear_hero_max_cache()
-    monkeypatch.setattr(hero_limits, "fetch_mlbb_post", fake_fetch)
+    monkeypatch.setattr(hero_limits, "fetch_mlbb_post_async", fake_fetch)
 
     response = client.get("/api/heroes/133")
 
@@ -202,7 +202,7 @@ def test_win_rate_negative_required_matches_returns_standardized_error() -> None
     assert "required_no_lose_matches" in payload
 
 def test_mlbb_dynamic_max_hero_id_accepts_current_live_total(monkeypatch) -> None:
-    def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str) -> object:
+    async def fake_fetch(endpoint_id: str, payload: dict[str, object], lang: str, raw: bool = False) -> object:
         if endpoint_id == "2756564":
             return {
                 "code": 0,
@@ -220,7 +220,7 @@ def test_mlbb_dynamic_max_hero_id_accepts_current_live_total(monkeypatch) -> Non
         return {"code": 0, "message": "OK", "data": []}
 
     hero_limits.clear_hero_max_cache()
-    monkeypatch.setattr(hero_limits, "fetch_mlbb_post", fake_fetch)
+    monkeypatch.setattr(hero_limits, "fetch_mlbb_post_async", fake_fetch)
 
     response = client.get("/api/heroes/132")
 
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.api.warmer import CacheWarmer, WarmJob, _selected, default_jobs
+from app.core.resilience import upstream_guards
+from app.main import app
+
+client = TestClient(app)
+
+
+def _slow_upstream(concurrency: dict[str, int]):
+    async def respond(call) -> dict[str, object]:
+        concurrency["in_flight"] += 1
+        concurrency["peak"] = max(concurrency["peak"], concurrency["in_flight"])
+        await asyncio.sleep(0.001)
+        concurrency["in_flight"] -= 1
+        return {"code": 0, "message": "OK", "data": {"records": [], "total": 0}}
+
+    return respond
+
+
+def test_warm_round_covers_every_job_with_bounded_concurrency(fake_upstream) -> None:
+    concurrency = {"in_flight": 0, "peak": 0}
+    calls = fake_upstream(_slow_upstream(concurrency))
+    warmer = CacheWarmer(default_jobs(["en", "km"], ["all", "glory"]), concurrency=2, jitter_seconds=0.001)
+
+    stats = asyncio.run(warmer.warm())
+
+    assert stats["jobs"] == 2 * (1 + 2 + 6 + 1)
+    assert stats["warmed"] == stats["jobs"]
+    assert stats["coverage"] == 1.0
+    assert stats["upstreams"]["ratings"] == {"warmed": 2, "failed": 0, "skipped": 0}
+    assert concurrency["peak"] <= 2
+
+    first_round = len(calls)
+    asyncio.run(warmer.warm())
+    assert len(calls) == first_round
+    assert warmer.stats()["rounds"] == 2
+
+
+def test_warm_skips_upstreams_with_open_circuit(fake_upstream) -> None:
+    calls = fake_upstream(_slow_upstream({"in_flight": 0, "peak": 0}))
+    guard = upstream_guards["academy"]
+    for _ in range(guard.breaker.min_calls):
+        guard.breaker.record(False, 0.1)
+    warmer = CacheWarmer(default_jobs(["en"], ["all"]), concurrency=4, jitter_seconds=0)
+
+    stats = asyncio.run(warmer.warm())
+
+    assert stats["skipped"] == 6
+    assert stats["upstreams"]["academy"] == {"warmed": 0, "failed": 0, "skipped": 6}
+    assert stats["warmed"] == 3
+    assert stats["coverage"] == round(3 / 9, 4)
+    academy_ids = {"2766683", "2740642", "2775075", "2718122", "2718121", "3210596"}
+    assert not {call.endpoint_id for call in calls} & academy_ids
+
+
+def test_unexpected_job_errors_count_as_failures() -> None:
+    async def broken() -> None:
+        raise KeyError("records")
+
+    async def ok() -> None:
+        return None
+
+    jobs = [WarmJob("mlbb", "broken", "en", broken), WarmJob("mlbb", "ok", "en", ok)]
+    warmer = CacheWarmer(jobs, concurrency=1, jitter_seconds=0)
+
+    stats = asyncio.run(warmer.warm())
+
+    assert stats["upstreams"]["mlbb"] == {"warmed": 1, "failed": 1, "skipped": 0}
+    assert stats["done"] == 2
+    assert stats["rounds"] == 1
+
+
+def test_selection_and_metrics() -> None:
+    assert _selected("", ["en", "id"]) == ["en", "id"]
+    assert _selected("ID, xx", ["en", "id"]) == ["id"]
+    assert client.get("/api/metrics").json()["warmer"]["rounds"] == 0